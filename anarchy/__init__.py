@@ -0,0 +1,76 @@
+import importlib
+from typing import Any, Dict, List
+
+# ---------- Lazy Package API ----------
+#
+# The Shadowrun Anarchy mechanics, split by topic. `import anarchy` loads none of them:
+# each submodule is imported the first time one of its names is used, so a short-lived
+# tool-call worker only pays for what it calls, and optional backends (NumPy, orjson,
+# sqlite) load on first use inside those submodules. Importing the package never
+# configures logging; entry points do that (see eventlog.configure_logging).
+#
+#     import anarchy
+#     hits, rolls = anarchy.roll_cue(8)       # loads anarchy.dice only
+#     from anarchy.persistence import load_campaign
+
+_SUBMODULES = ("dice", "character", "campaign", "persistence", "tables")
+
+_EXPORTS: Dict[str, str] = {
+    # dice
+    "PoolResult": "dice",
+    "seed_dice": "dice",
+    "roll_cue": "dice",
+    "roll_cue_many": "dice",
+    "detect_glitch": "dice",
+    "reroll_failures": "dice",
+    "calculate_initiative": "dice",
+    "resolve_opposed_test": "dice",
+    # character
+    "ensure_defaults": "character",
+    "character_create": "character",
+    "character_spend_karma": "character",
+    "spend_plot_point": "character",
+    "award_plot_point": "character",
+    "apply_damage_to_condition_monitor": "character",
+    "handle_condition_overflow": "character",
+    "heal_condition_monitor": "character",
+    "track_ammo": "character",
+    "apply_karma_advancement": "character",
+    # campaign
+    "session_log": "campaign",
+    "campaign_create": "campaign",
+    "get_random_npc": "campaign",
+    "get_contract_brief": "campaign",
+    "prompt_player": "campaign",
+    # persistence
+    "get_current_timestamp": "persistence",
+    "serialize_data": "persistence",
+    "deserialize_data": "persistence",
+    "save_campaign": "persistence",
+    "load_campaign": "persistence",
+    "iter_campaign_sessions": "persistence",
+    "save_character": "persistence",
+    "load_character": "persistence",
+    # tables
+    "roll_on_random_table": "tables",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Imports the submodule that defines name on first access and caches the result.
+    """
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    submodule = _EXPORTS.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{submodule}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_EXPORTS) | set(_SUBMODULES))
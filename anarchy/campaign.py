@@ -0,0 +1,225 @@
+import logging
+from typing import Any, Dict, List, Optional, Union
+
+from anarchy.character import ensure_defaults
+from anarchy.dice import _resolve_rng
+from eventlog import log_event
+from metrics import instrumented
+from rng import RNGProvider
+from validation import ListOf, _check_list_of, _check_type, validates
+
+logger = logging.getLogger(__name__)
+
+# ---------- Session Management Tools ----------
+
+@instrumented(size="npcs")
+@validates(session_number=int, summary=str, npcs=ListOf(str), loot=dict)
+def session_log(
+    session_number: int,
+    summary: str,
+    npcs: List[str],
+    loot: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Logs a session's summary, NPCs, and loot for campaign tracking.
+    Use this after each session to record what happened.
+    Args:
+        session_number: The session's number in the campaign.
+        summary: A brief summary of the session's events.
+        npcs: List of NPC names involved in the session.
+        loot: Dictionary of loot or rewards distributed.
+    Returns:
+        Dictionary representing the session log.
+    Notes:
+        Useful for campaign recaps and continuity.
+    """
+    session: Dict[str, Any] = {
+        "session": session_number,
+        "summary": summary,
+        "npcs": npcs,
+        "loot": loot
+    }
+    log_event(
+        logger, logging.INFO, "session.logged", "Logged session %(session)s: %(summary)s",
+        session=session_number, summary=summary,
+    )
+    return session
+
+# ---------- Campaign Management Tools ----------
+
+@instrumented
+def campaign_create(settings: Union[Dict[str, Any], "Campaign"]) -> Union[Dict[str, Any], "Campaign"]:
+    """
+    Creates a new campaign dictionary with default fields.
+    Use this when starting a new campaign or importing settings.
+    Args:
+        settings: Dictionary of campaign settings and custom fields, or a models.Campaign.
+    Returns:
+        Campaign dictionary with defaults merged in (a Campaign is returned as is).
+    Notes:
+        Ensures 'sessions', 'characters', and 'npcs' are always present and validated.
+        A Campaign was validated when it was built, so its lists are not scanned again.
+    """
+    if not isinstance(settings, dict):
+        from models import Campaign
+
+        _check_type("settings", settings, Campaign)
+        log_event(logger, logging.INFO, "campaign.created", "Created campaign with settings: %(settings)s", settings=settings.extra)
+        return settings
+    defaults: Dict[str, Any] = {
+        "sessions": [],
+        "characters": [],
+        "npcs": []
+    }
+    campaign = ensure_defaults(settings, defaults)
+    if "sessions" in campaign:
+        _check_list_of("sessions", campaign["sessions"], dict)
+    if "npcs" in campaign:
+        _check_list_of("npcs", campaign["npcs"], dict)
+    log_event(logger, logging.INFO, "campaign.created", "Created campaign with settings: %(settings)s", settings=settings)
+    return campaign
+
+# ---------- NPC & Contract Lookup Tools ----------
+
+@instrumented(size="npcs")
+def get_random_npc(
+    npcs: Union[List[Dict[str, Any]], List["NPC"], "NPCRegistry"],
+    tag: Optional[str] = None,
+    rng: Optional[RNGProvider] = None
+) -> Union[Dict[str, Any], "NPC"]:
+    """
+    Selects a random NPC from a list, optionally filtered by tag.
+    Use this to quickly pick an NPC for encounters or scenes.
+    Args:
+        npcs: List of NPC dictionaries or models.NPC objects, or an NPCRegistry built from
+            the campaign's NPCs.
+        tag: Optional tag to filter NPCs (e.g., 'fixer', 'enemy').
+        rng: Optional RNG provider (e.g., the session's); defaults to the module provider.
+    Returns:
+        Randomly selected NPC (dict or NPC, as given), or empty dict if none found.
+    Notes:
+        If tag is provided, only NPCs with that tag are considered.
+        Passing an NPCRegistry skips the per-call list scan and makes each pick O(1).
+        A list of NPC models is only type-checked; each NPC's fields were checked when it
+        was built.
+    """
+    if not isinstance(npcs, list):
+        from npc_registry import NPCRegistry
+
+        _check_type("npcs", npcs, NPCRegistry)
+        npc = npcs.pick(tag=tag, rng=rng)
+        if npc:
+            log_event(logger, logging.INFO, "npc.selected", "Selected random NPC: %(npc)s", tag=tag, npc=npc)
+        elif tag is not None:
+            log_event(logger, logging.WARNING, "npc.not_found", "No NPC found with tag '%(tag)s'", tag=tag)
+        else:
+            log_event(logger, logging.WARNING, "npc.not_found", "No NPCs available to select.")
+        return npc
+    models = bool(npcs) and not isinstance(npcs[0], dict)
+    if models:
+        from models import NPC
+
+        _check_list_of("npcs", npcs, NPC)
+    else:
+        _check_list_of("npcs", npcs, dict)
+    rng = _resolve_rng(rng)
+    if tag is not None:
+        _check_type("tag", tag, str)
+        if models:
+            filtered = [n for n in npcs if tag in n.tags]
+        else:
+            filtered = [n for n in npcs if tag in n.get("tags", [])]
+        if filtered:
+            npc = rng.choice(filtered)
+            log_event(
+                logger, logging.INFO, "npc.selected", "Selected random NPC with tag '%(tag)s': %(npc)s", tag=tag, npc=npc
+            )
+            return npc
+        log_event(logger, logging.WARNING, "npc.not_found", "No NPC found with tag '%(tag)s'", tag=tag)
+        return {}
+    if npcs:
+        npc = rng.choice(npcs)
+        log_event(logger, logging.INFO, "npc.selected", "Selected random NPC: %(npc)s", tag=None, npc=npc)
+        return npc
+    log_event(logger, logging.WARNING, "npc.not_found", "No NPCs available to select.")
+    return {}
+
+
+@instrumented(size="briefs")
+def get_contract_brief(
+    briefs: Union[List[Dict[str, Any]], List["ContractBrief"], "BriefIndex"],
+    name: str
+) -> Union[Dict[str, Any], "ContractBrief"]:
+    """
+    Looks up a contract brief by name from a list.
+    Use this to retrieve mission or job details by name.
+    Args:
+        briefs: List of contract brief dictionaries or models.ContractBrief objects, or a
+            BriefIndex built from them.
+        name: The name of the contract/job to look up.
+    Returns:
+        The contract brief (dict or ContractBrief, as given), or empty dict if not found.
+    Notes:
+        Useful for referencing jobs during play or prep.
+        Passing a BriefIndex makes the lookup O(1) and also matches case/whitespace variants;
+        use its complete() and fuzzy() methods for autocomplete and typo-tolerant search.
+    """
+    _check_type("name", name, str)
+    if not isinstance(briefs, list):
+        from brief_index import BriefIndex
+
+        _check_type("briefs", briefs, BriefIndex)
+        brief = briefs.get(name)
+        if brief:
+            log_event(logger, logging.INFO, "brief.found", "Found contract brief: %(brief)s", brief=brief)
+        else:
+            log_event(logger, logging.WARNING, "brief.not_found", "No contract brief found with name '%(name)s'", name=name)
+        return brief
+    if briefs and not isinstance(briefs[0], dict):
+        from models import ContractBrief
+
+        _check_list_of("briefs", briefs, ContractBrief)
+        for brief in briefs:
+            if brief.name == name:
+                log_event(logger, logging.INFO, "brief.found", "Found contract brief: %(brief)s", brief=brief)
+                return brief
+        log_event(logger, logging.WARNING, "brief.not_found", "No contract brief found with name '%(name)s'", name=name)
+        return {}
+    _check_list_of("briefs", briefs, dict)
+    for brief in briefs:
+        if brief.get("name") == name:
+            log_event(logger, logging.INFO, "brief.found", "Found contract brief: %(brief)s", brief=brief)
+            return brief
+    log_event(logger, logging.WARNING, "brief.not_found", "No contract brief found with name '%(name)s'", name=name)
+    return {}
+
+# ---------- Storytelling Prompt Tools ----------
+
+@instrumented
+def prompt_player(prompt_type: str = "Cue") -> str:
+    """
+    Provides a storytelling prompt for a player based on prompt type.
+    Use this to encourage roleplay or clarify character state.
+    Args:
+        prompt_type: The type of prompt (e.g., 'Cue', 'Disposition').
+    Returns:
+        The prompt string for the player.
+    Notes:
+        Prompts are data-driven and can be extended for more types.
+    """
+    _check_type("prompt_type", prompt_type, str)
+    prompts: Dict[str, str] = {
+        "Cue": "Describe how your character applies their Cue in this scene.",
+        "Disposition": "What is your character's current disposition?"
+    }
+    prompt = prompts.get(prompt_type, "")
+    if prompt:
+        log_event(
+            logger, logging.INFO, "prompt.sent", "Prompted player with type '%(prompt_type)s': %(prompt)s",
+            prompt_type=prompt_type, prompt=prompt,
+        )
+    else:
+        log_event(
+            logger, logging.WARNING, "prompt.not_found", "No prompt found for type '%(prompt_type)s'", prompt_type=prompt_type
+        )
+    return prompt
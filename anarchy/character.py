@@ -0,0 +1,325 @@
+import dataclasses
+import logging
+from typing import Any, Dict, Tuple, Union
+
+from eventlog import log_event
+from metrics import instrumented
+from validation import _check_type
+
+logger = logging.getLogger(__name__)
+
+# ---------- Character Management Tools ----------
+
+@instrumented
+def ensure_defaults(data: Dict[str, Any], defaults: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Ensures that a dictionary has all keys from defaults, filling in missing ones.
+    Use this to avoid repeated default structure logic in character/campaign/session creation.
+    Args:
+        data: The dictionary to check.
+        defaults: The dictionary of default key-value pairs.
+    Returns:
+        A new dictionary with all defaults applied.
+    Notes:
+        Does not mutate the original data.
+    """
+    result = defaults.copy()
+    result.update(data)
+    log_event(logger, logging.DEBUG, "defaults.ensured", "Ensured defaults: %(result)s", result=result)
+    return result
+
+
+@instrumented
+def character_create(data: Union[Dict[str, Any], "Character"]) -> Union[Dict[str, Any], "Character"]:
+    """
+    Creates a new character dictionary with default fields for Shadowrun Anarchy.
+    Use this when initializing a new character.
+    Args:
+        data: Dictionary of character attributes and custom fields, or a models.Character.
+    Returns:
+        Character dictionary with defaults merged in (a Character is returned as is).
+    Notes:
+        Ensures 'karma_spent' and 'cues_used' are always present.
+    """
+    if not isinstance(data, dict):
+        from models import Character
+
+        _check_type("data", data, Character)
+        log_event(logger, logging.INFO, "character.created", "Created character with data: %(character)s", character=data)
+        return data
+    defaults: Dict[str, Any] = {
+        "karma_spent": {},
+        "cues_used": []
+    }
+    character = ensure_defaults(data, defaults)
+    log_event(logger, logging.INFO, "character.created", "Created character with data: %(character)s", character=character)
+    return character
+
+
+@instrumented
+def character_spend_karma(
+    character: Union[Dict[str, Any], "Character", "PersistentState"], category: str, amount: int
+) -> Union[Dict[str, Any], "Character", "PersistentState"]:
+    """
+    Spends karma for a character in a specific category (e.g., attribute, skill).
+    Use this when a character spends karma for advancement.
+    Args:
+        character: The character dictionary, a models.Character, or a state.PersistentState.
+        category: The category of advancement (e.g., 'attribute', 'skill').
+        amount: The amount of karma to spend.
+    Returns:
+        Updated character (same form as given) with karma spent recorded.
+    Notes:
+        Tracks karma spending by category for campaign bookkeeping.
+        Never mutates the given character or its nested 'karma_spent' dict.
+        A PersistentState result links to the given version, so .undo() reverts the spend.
+    """
+    _check_type("category", category, str)
+    _check_type("amount", amount, int)
+    if not isinstance(character, dict):
+        from models import Character
+        from state import PersistentState
+
+        if isinstance(character, Character):
+            spent = {**character.karma_spent, category: character.karma_spent.get(category, 0) + amount}
+            log_event(
+                logger, logging.INFO, "character.karma_spent",
+                "Character spent %(amount)s karma on %(category)s. Total: %(total)s",
+                amount=amount, category=category, total=spent[category],
+            )
+            return dataclasses.replace(character, karma_spent=spent)
+        _check_type("character", character, PersistentState)
+        updated_state = character.update_in(
+            ("karma_spent", category), lambda spent: spent + amount, 0, label=f"karma_spent:{category}"
+        )
+        total = updated_state.get_in(("karma_spent", category))
+        log_event(
+            logger, logging.INFO, "character.karma_spent", "Character spent %(amount)s karma on %(category)s. Total: %(total)s",
+            amount=amount, category=category, total=total,
+        )
+        return updated_state
+    updated: Dict[str, Any] = character.copy()
+    # Copy the nested dict too, so the caller's character is never changed.
+    spent: Dict[str, Any] = dict(updated.get("karma_spent", {}))
+    spent[category] = spent.get(category, 0) + amount
+    updated["karma_spent"] = spent
+    log_event(
+        logger, logging.INFO, "character.karma_spent", "Character spent %(amount)s karma on %(category)s. Total: %(total)s",
+        amount=amount, category=category, total=spent[category],
+    )
+    return updated
+
+# ---------- Shadowrun Anarchy Core Mechanics Helpers ----------
+
+@instrumented
+def spend_plot_point(current_points: int) -> int:
+    """
+    Spends a plot point for a character or player.
+    Use this whenever a player spends a plot point for narrative control or special actions.
+    Args:
+        current_points: The current number of plot points the character/player has.
+    Returns:
+        The new plot point total (int).
+    Notes:
+        Will not go below zero. Always check before allowing plot point actions.
+    """
+    _check_type("current_points", current_points, int)
+    if current_points > 0:
+        log_event(
+            logger, logging.INFO, "plot_point.spent", "Spent plot point. Remaining: %(remaining)s", remaining=current_points - 1
+        )
+        return current_points - 1
+    log_event(logger, logging.WARNING, "plot_point.unavailable", "No plot points to spend.")
+    return 0
+
+
+@instrumented
+def award_plot_point(current_points: int) -> int:
+    """
+    Awards a plot point to a character or player.
+    Use this when a player earns a plot point for good roleplay, clever ideas, or GM fiat.
+    Args:
+        current_points: The current number of plot points the character/player has.
+    Returns:
+        The new plot point total (int).
+    Notes:
+        Plot points are a core narrative currency in Shadowrun Anarchy.
+    """
+    _check_type("current_points", current_points, int)
+    log_event(logger, logging.INFO, "plot_point.awarded", "Awarded plot point. Total: %(total)s", total=current_points + 1)
+    return current_points + 1
+
+
+# The condition monitor and ammo rules, shared with the batched combat.resolve_combat_round.
+
+def _damaged(condition_monitor: int, damage: int) -> int:
+    return max(0, condition_monitor - damage)
+
+
+def _overflow_status(condition_monitor: int, overflow: int) -> str:
+    if condition_monitor > 0:
+        return 'ok'
+    if overflow > 0:
+        return 'unconscious'
+    return 'overflow'
+
+
+def _ammo_after(current_ammo: int, shots_fired: int) -> Tuple[int, bool]:
+    # (ammo left, needs reload)
+    ammo_left = max(0, current_ammo - shots_fired)
+    return ammo_left, ammo_left <= 0
+
+
+@instrumented
+def apply_damage_to_condition_monitor(condition_monitor: int, damage: int) -> int:
+    """
+    Applies damage to a character's condition monitor (health track).
+    Use this after a character takes damage from any source.
+    Args:
+        condition_monitor: The character's current condition monitor value (remaining health).
+        damage: The amount of damage to apply.
+    Returns:
+        The new condition monitor value (int), not less than zero.
+    Notes:
+        If condition monitor reaches zero, the character is incapacitated or worse.
+    """
+    _check_type("condition_monitor", condition_monitor, int)
+    _check_type("damage", damage, int)
+    new_monitor = _damaged(condition_monitor, damage)
+    log_event(
+        logger, logging.INFO, "condition.damaged", "Applied %(damage)s damage. Condition monitor: %(before)s -> %(after)s",
+        damage=damage, before=condition_monitor, after=new_monitor,
+    )
+    return new_monitor
+
+
+@instrumented
+def handle_condition_overflow(condition_monitor: int, overflow: int) -> Dict[str, Any]:
+    """
+    Handles condition monitor overflow and determines status effects (e.g., unconscious).
+    Use this after applying damage that exceeds the condition monitor.
+    Args:
+        condition_monitor: The character's current condition monitor (after damage).
+        overflow: Amount by which damage exceeded the monitor (can be zero).
+    Returns:
+        Dict with keys: 'status' (e.g., 'ok', 'overflow', 'unconscious'), 'overflow' (int).
+    Notes:
+        Customize status logic as needed for campaign rules.
+    """
+    status = _overflow_status(condition_monitor, overflow)
+    log_event(
+        logger, logging.INFO, "condition.overflow",
+        "Condition monitor overflow: monitor=%(monitor)s, overflow=%(overflow)s, status=%(status)s",
+        monitor=condition_monitor, overflow=overflow, status=status,
+    )
+    return {'status': status, 'overflow': overflow}
+
+
+@instrumented
+def heal_condition_monitor(condition_monitor: int, healing: int, max_monitor: int) -> int:
+    """
+    Applies healing to a character's condition monitor (health track).
+    Use this after first aid, rest, or magical healing.
+    Args:
+        condition_monitor: The character's current condition monitor value.
+        healing: The amount of healing to apply.
+        max_monitor: The maximum value for the condition monitor.
+    Returns:
+        The new condition monitor value (int), not exceeding max_monitor.
+    Notes:
+        Does not allow healing above the maximum monitor value.
+    """
+    new_monitor = min(condition_monitor + healing, max_monitor)
+    log_event(
+        logger, logging.INFO, "condition.healed", "Healed %(healing)s. Condition monitor: %(before)s -> %(after)s",
+        healing=healing, before=condition_monitor, after=new_monitor,
+    )
+    return new_monitor
+
+
+@instrumented
+def track_ammo(current_ammo: int, shots_fired: int, magazine_size: int) -> Dict[str, Any]:
+    """
+    Tracks ammo usage, decrements ammo, and checks for reloads.
+    Use this after a character fires a weapon.
+    Args:
+        current_ammo: Current ammo in the magazine (>=0).
+        shots_fired: Number of shots fired (>=0).
+        magazine_size: Maximum ammo capacity of the magazine (>0).
+    Returns:
+        Dict with keys: 'ammo_left' (int, >=0), 'needs_reload' (bool).
+    Notes:
+        If ammo_left <= 0, needs_reload is True. Ammo cannot go below zero.
+    """
+    ammo_left, needs_reload = _ammo_after(current_ammo, shots_fired)
+    log_event(
+        logger, logging.INFO, "ammo.tracked",
+        "Ammo tracking: %(current)s - %(shots)s = %(ammo_left)s (needs_reload=%(needs_reload)s)",
+        current=current_ammo, shots=shots_fired, ammo_left=ammo_left, needs_reload=needs_reload,
+    )
+    return {'ammo_left': ammo_left, 'needs_reload': needs_reload}
+
+
+@instrumented
+def apply_karma_advancement(
+    character: Union[Dict[str, Any], "Character", "PersistentState"],
+    field: str,
+    amount: int,
+    cost: int,
+    karma_available: int
+) -> Union[Dict[str, Any], "Character", "PersistentState"]:
+    """
+    Applies karma to advance a character's attribute or skill, with validation.
+    Use this when a character spends karma to improve.
+    Args:
+        character: The character dictionary, a models.Character, or a state.PersistentState.
+        field: The attribute or skill to advance (e.g., 'Agility').
+        amount: The amount to increase.
+        cost: The karma cost for the advancement.
+        karma_available: The character's available karma.
+    Returns:
+        Updated character (same form as given) with advancement applied if possible.
+    Notes:
+        Will not apply advancement if not enough karma is available.
+        Never mutates the given character or its nested 'karma_spent' dict.
+    """
+    if karma_available < cost:
+        log_event(
+            logger, logging.WARNING, "karma.insufficient",
+            "Not enough karma to advance %(field)s. Required: %(cost)s, available: %(available)s",
+            field=field, cost=cost, available=karma_available,
+        )
+        return character
+    if not isinstance(character, dict):
+        from models import Character
+        from state import PersistentState
+
+        if isinstance(character, Character):
+            # Advanced fields (attributes, skills) live in Character.extra.
+            extra = {**character.extra, field: character.extra.get(field, 0) + amount}
+            spent = {**character.karma_spent, field: character.karma_spent.get(field, 0) + cost}
+            log_event(
+                logger, logging.INFO, "karma.advanced",
+                "Advanced %(field)s by %(amount)s for %(cost)s karma. New value: %(value)s",
+                field=field, amount=amount, cost=cost, value=extra[field],
+            )
+            return dataclasses.replace(character, karma_spent=spent, extra=extra)
+        _check_type("character", character, PersistentState)
+        data = character.data.update_in((field,), lambda value: value + amount, 0)
+        data = data.update_in(("karma_spent", field), lambda spent: spent + cost, 0)
+        updated_state = character.commit(data, label=f"advance:{field}")
+        log_event(
+            logger, logging.INFO, "karma.advanced", "Advanced %(field)s by %(amount)s for %(cost)s karma. New value: %(value)s",
+            field=field, amount=amount, cost=cost, value=updated_state[field],
+        )
+        return updated_state
+    updated = character.copy()
+    updated[field] = updated.get(field, 0) + amount
+    spent = dict(updated.get('karma_spent', {}))
+    spent[field] = spent.get(field, 0) + cost
+    updated['karma_spent'] = spent
+    log_event(
+        logger, logging.INFO, "karma.advanced", "Advanced %(field)s by %(amount)s for %(cost)s karma. New value: %(value)s",
+        field=field, amount=amount, cost=cost, value=updated[field],
+    )
+    return updated
@@ -0,0 +1,280 @@
+import logging
+import sys
+from itertools import accumulate
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from eventlog import log_event
+from metrics import instrumented
+from rng import RNGProvider, SeededRNG, get_default_rng, set_default_rng
+from validation import ListOf, _check_list_of, _check_type, validates
+
+logger = logging.getLogger(__name__)
+
+# ---------- Dice Roller ----------
+
+class PoolResult(NamedTuple):
+    """
+    Compact outcome of a single dice pool rolled by the dice engine.
+    Attributes:
+        hits: Number of dice at or above the hit threshold.
+        ones: Number of dice showing 1 (used for glitch checks).
+        rolls: The individual dice results (empty if rolls were not kept).
+    """
+    hits: int
+    ones: int
+    rolls: List[int]
+
+
+def _roll_pools(
+    pools: List[int], threshold: int, rng: RNGProvider, keep_rolls: bool = True
+) -> List[PoolResult]:
+    """
+    Core dice engine shared by roll_cue and roll_cue_many.
+    Args:
+        pools: Dice pool sizes; negative sizes roll no dice.
+        threshold: Minimum die value that counts as a hit.
+        rng: The RNG provider to draw dice from.
+        keep_rolls: If False, per-pool dice lists are left empty.
+    Returns:
+        One PoolResult per pool, in the same order.
+    Notes:
+        All dice for all pools are drawn in a single call, then hits and 1s are
+        counted per pool with cumulative sums over the flat draw. NumPy is never imported
+        here: an array can only come back if a provider already loaded it.
+    """
+    sizes = [p if p > 0 else 0 for p in pools]
+    ends = list(accumulate(sizes))
+    starts = [end - size for end, size in zip(ends, sizes)]
+    faces = rng.d6(ends[-1] if ends else 0)
+    np = sys.modules.get("numpy")
+    if np is not None and isinstance(faces, np.ndarray):
+        hit_cum = np.concatenate(([0], np.cumsum(faces >= threshold)))
+        one_cum = np.concatenate(([0], np.cumsum(faces == 1)))
+        hits = (hit_cum[ends] - hit_cum[starts]).tolist()
+        ones = (one_cum[ends] - one_cum[starts]).tolist()
+        flat = faces.tolist() if keep_rolls else []
+    else:
+        flat = list(faces)
+        chunks = [flat[start:end] for start, end in zip(starts, ends)]
+        hits = [sum(1 for r in chunk if r >= threshold) for chunk in chunks]
+        ones = [chunk.count(1) for chunk in chunks]
+    return [
+        PoolResult(h, o, flat[start:end] if keep_rolls else [])
+        for h, o, start, end in zip(hits, ones, starts, ends)
+    ]
+
+
+def _resolve_rng(rng: Optional[RNGProvider]) -> RNGProvider:
+    """
+    Returns rng, or the module default provider when rng is None.
+    """
+    if rng is None:
+        return get_default_rng()
+    _check_type("rng", rng, RNGProvider)
+    return rng
+
+
+@instrumented
+def seed_dice(seed: Optional[int] = None) -> None:
+    """
+    Replaces the default RNG provider with a freshly seeded SeededRNG.
+    Use this to make a sequence of rolls reproducible (debugging, quick replays).
+    Args:
+        seed: Seed value; None reseeds from system entropy.
+    Returns:
+        None
+    Notes:
+        Affects every mechanic called without an explicit rng. Parallel sessions should
+        each pass their own provider instead of sharing the default.
+    """
+    set_default_rng(SeededRNG(seed))
+    log_event(logger, logging.INFO, "dice.seed", "Reseeded dice engine (seed=%(seed)s)", seed=seed)
+
+
+@instrumented(size="dice_pool")
+def roll_cue(
+    dice_pool: int, edge: bool = False, rng: Optional[RNGProvider] = None
+) -> Tuple[int, List[int]]:
+    """
+    Rolls a pool of d6 dice for Shadowrun Anarchy actions.
+    Use this for any action that requires a dice pool roll.
+    Args:
+        dice_pool: Number of d6 dice to roll.
+        edge: If True, lowers the hit threshold to 4+ (Edge rules). Otherwise, hits are 5+.
+        rng: Optional RNG provider (e.g., the session's); defaults to the module provider.
+    Returns:
+        Tuple of (number of hits, list of dice results).
+    Notes:
+        Call detect_glitch after this to check for glitches. Use reroll_failures if Edge is spent to reroll failures.
+        Uses the same dice engine as roll_cue_many, so single and batch rolls behave identically.
+    """
+    _check_type("dice_pool", dice_pool, int)
+    _check_type("edge", edge, bool)
+    threshold = 4 if edge else 5
+    hits, _, rolls = _roll_pools([dice_pool], threshold, _resolve_rng(rng))[0]
+    log_event(
+        logger, logging.INFO, "dice.roll", "Rolled %(dice_pool)s dice (edge=%(edge)s): %(rolls)s → Hits: %(hits)s",
+        dice_pool=dice_pool, edge=edge, rolls=rolls, hits=hits,
+    )
+    return hits, rolls
+
+
+@instrumented(size="pools")
+def roll_cue_many(
+    pools: List[int],
+    edge: bool = False,
+    keep_rolls: bool = True,
+    rng: Optional[RNGProvider] = None,
+) -> List[PoolResult]:
+    """
+    Rolls many d6 dice pools at once for mob fights and odds previews.
+    Use this instead of calling roll_cue in a loop when resolving many pools per request.
+    Args:
+        pools: List of dice pool sizes to roll.
+        edge: If True, lowers the hit threshold to 4+ (Edge rules). Otherwise, hits are 5+.
+        keep_rolls: If False, skips building per-pool dice lists (hits and ones are still counted).
+        rng: Optional RNG provider (e.g., the session's); defaults to the module provider.
+    Returns:
+        List of PoolResult (hits, ones, rolls), one per pool in the same order.
+    Notes:
+        All dice are drawn in one NumPy array draw when NumPy is installed.
+        Pass result.rolls and result.hits to detect_glitch, or use result.ones directly.
+    """
+    _check_list_of("pools", pools, int)
+    _check_type("edge", edge, bool)
+    threshold = 4 if edge else 5
+    results = _roll_pools(pools, threshold, _resolve_rng(rng), keep_rolls)
+    if logger.isEnabledFor(logging.INFO):
+        log_event(
+            logger, logging.INFO, "dice.roll_many", "Rolled %(pools)s pools (edge=%(edge)s): %(hits)s total hits",
+            pools=len(pools), edge=edge, hits=sum(r.hits for r in results),
+        )
+    return results
+
+# ---------- Shadowrun Anarchy Core Mechanics Helpers ----------
+#
+# The rules themselves live in small uninstrumented helpers, shared by the single-call
+# functions below and the batched paths (combat.resolve_combat_round).
+
+def _glitch_flags(ones: int, dice: int, hits: int) -> Tuple[bool, bool]:
+    """
+    Returns (glitch, critical_glitch) for a pool of `dice` dice with `ones` 1s and `hits` hits.
+    """
+    glitch = dice > 0 and ones >= dice // 2
+    return glitch, glitch and hits == 0
+
+
+def _reroll_misses(rolls: List[int], hit_threshold: int, faces: Iterator[int]) -> Tuple[int, List[int]]:
+    """
+    Replaces every die below hit_threshold with the next face and returns (hits, new rolls).
+    """
+    new_rolls = [r if r >= hit_threshold else int(next(faces)) for r in rolls]
+    return sum(1 for r in new_rolls if r >= hit_threshold), new_rolls
+
+
+@instrumented(size="rolls")
+@validates(rolls=ListOf(int), hits=int)
+def detect_glitch(rolls: List[int], hits: int) -> Dict[str, bool]:
+    """
+    Determines if a dice roll results in a glitch or critical glitch according to Shadowrun Anarchy rules.
+    Use this after any dice pool roll to check for glitches.
+    - Glitch: Half or more dice are 1s (and at least one die rolled).
+    - Critical Glitch: Glitch occurs and there are zero hits.
+    Args:
+        rolls: List of integers representing dice results (1-6).
+        hits: Number of hits (dice that rolled 5 or 6).
+    Returns:
+        Dict with keys 'glitch' (bool) and 'critical_glitch' (bool).
+    Notes:
+        Always call this after rolling dice for actions, especially when the outcome is important.
+    """
+    num_ones = rolls.count(1)
+    glitch, critical = _glitch_flags(num_ones, len(rolls), hits)
+    log_event(
+        logger, logging.INFO, "dice.glitch_check",
+        "Glitch check: %(ones)s ones in %(rolls)s (glitch=%(glitch)s, critical=%(critical)s)",
+        ones=num_ones, rolls=rolls, glitch=glitch, critical=critical,
+    )
+    return {"glitch": glitch, "critical_glitch": critical}
+
+
+@instrumented(size="rolls")
+def reroll_failures(
+    rolls: List[int], hit_threshold: int = 5, rng: Optional[RNGProvider] = None
+) -> Tuple[int, List[int]]:
+    """
+    Rerolls all dice that did not score a hit (>= hit_threshold) in a dice pool.
+    Use this when a player spends Edge to reroll failures.
+    Args:
+        rolls: List of integers representing the original dice results.
+        hit_threshold: The minimum die value that counts as a hit (default 5; use 4 for Edge).
+        rng: Optional RNG provider (e.g., the session's); defaults to the module provider.
+    Returns:
+        Tuple of (new hit count, new list of dice results after rerolling failures).
+    Notes:
+        Only reroll dice that are less than hit_threshold. Do not reroll dice that already scored a hit.
+        Call detect_glitch on the new rolls if needed.
+    """
+    _check_list_of("rolls", rolls, int)
+    rerolls = iter(_resolve_rng(rng).d6(sum(1 for r in rolls if r < hit_threshold)))
+    hits, new_rolls = _reroll_misses(rolls, hit_threshold, rerolls)
+    log_event(
+        logger, logging.INFO, "dice.reroll", "Rerolled failures (threshold=%(threshold)s): %(rolls)s -> %(new_rolls)s (hits=%(hits)s)",
+        threshold=hit_threshold, rolls=rolls, new_rolls=new_rolls, hits=hits,
+    )
+    return hits, new_rolls
+
+
+@instrumented
+def calculate_initiative(
+    attribute: int, skill: int, bonus: int = 0, rng: Optional[RNGProvider] = None
+) -> int:
+    """
+    Calculates a character's initiative for combat order in Shadowrun Anarchy.
+    Use this at the start of combat or any time initiative order is needed.
+    Args:
+        attribute: The character's relevant attribute (e.g., Agility).
+        skill: The character's relevant skill (e.g., Firearms).
+        bonus: Any situational or gear bonuses (default 0).
+        rng: Optional RNG provider (e.g., the session's); defaults to the module provider.
+    Returns:
+        The total initiative score (int).
+    Notes:
+        Initiative = attribute + skill + bonus + 1d6 (random die roll).
+    """
+    _check_type("attribute", attribute, int)
+    _check_type("skill", skill, int)
+    _check_type("bonus", bonus, int)
+    roll = _resolve_rng(rng).d6(1)[0]
+    initiative = attribute + skill + bonus + roll
+    log_event(
+        logger, logging.INFO, "combat.initiative",
+        "Initiative: %(attribute)s + %(skill)s + %(bonus)s + %(roll)s = %(initiative)s",
+        attribute=attribute, skill=skill, bonus=bonus, roll=roll, initiative=initiative,
+    )
+    return initiative
+
+
+@instrumented
+def resolve_opposed_test(attacker_hits: int, defender_hits: int) -> str:
+    """
+    Resolves an opposed test between two parties (e.g., attacker vs. defender).
+    Use this after both sides have rolled and counted hits.
+    Args:
+        attacker_hits: Number of hits for the attacker.
+        defender_hits: Number of hits for the defender.
+    Returns:
+        'attacker' if attacker wins, 'defender' if defender wins, 'tie' if equal.
+    Notes:
+        Useful for combat, stealth, hacking, and any opposed action.
+    """
+    log_event(
+        logger, logging.INFO, "combat.opposed_test", "Opposed test: attacker=%(attacker)s, defender=%(defender)s",
+        attacker=attacker_hits, defender=defender_hits,
+    )
+    if attacker_hits > defender_hits:
+        return 'attacker'
+    elif defender_hits > attacker_hits:
+        return 'defender'
+    else:
+        return 'tie'
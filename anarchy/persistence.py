@@ -0,0 +1,212 @@
+import datetime
+import logging
+from typing import Any, Dict, Iterator, Optional, Union
+
+import persistence
+from eventlog import log_event
+from metrics import instrumented
+from validation import _check_type
+
+logger = logging.getLogger(__name__)
+
+# ---------- Serialization ----------
+
+@instrumented
+def get_current_timestamp() -> str:
+    """
+    Returns the current date and time in ISO 8601 format (UTC).
+    Use this to timestamp logs, session records, or any time-sensitive data.
+    Returns:
+        ISO 8601 formatted timestamp string.
+    Notes:
+        Uses UTC for consistency across systems.
+    """
+    timestamp = datetime.datetime.now(datetime.timezone.utc).isoformat().replace('+00:00', 'Z')
+    log_event(logger, logging.DEBUG, "time.timestamp", "Retrieved current timestamp: %(timestamp)s", timestamp=timestamp)
+    return timestamp
+
+
+@instrumented
+def serialize_data(
+    data: Any, filepath: str, pretty: bool = True, compression: Optional[str] = "auto"
+) -> None:
+    """
+    Serializes (saves) campaign, character, or session data to a JSON file.
+    Use this to persist campaign state between sessions.
+    Args:
+        data: The data to serialize (dict, list, etc.).
+        filepath: The file path to save the data to.
+        pretty: If True (default), indents the JSON; set False for compact files.
+        compression: None, 'gzip', 'zstd', or 'auto' (default; infers from a .gz/.zst suffix).
+    Returns:
+        None
+    Notes:
+        Overwrites the file if it exists. The write is atomic: data goes to a temporary file
+        that is fsynced and renamed over the target, so a crash never leaves a partial file.
+        Uses orjson when installed.
+    """
+    persistence.write_json(data, filepath, pretty=pretty, compression=compression)
+    log_event(logger, logging.INFO, "persistence.saved", "Serialized data to %(filepath)s", filepath=filepath)
+
+
+@instrumented
+def deserialize_data(filepath: str) -> Any:
+    """
+    Deserializes (loads) campaign, character, or session data from a JSON file.
+    Use this to load campaign state at the start of a session.
+    Args:
+        filepath: The file path to load the data from.
+    Returns:
+        The loaded data (dict, list, etc.).
+    Notes:
+        Raises FileNotFoundError if the file does not exist.
+        gzip and zstd files are detected and decompressed automatically.
+    """
+    data = persistence.read_json(filepath)
+    log_event(logger, logging.INFO, "persistence.loaded", "Deserialized data from %(filepath)s", filepath=filepath)
+    return data
+
+# ---------- High-Level Save/Load Helpers ----------
+
+@instrumented
+def save_campaign(
+    campaign: Union[Dict[str, Any], "Campaign"],
+    filepath: str,
+    pretty: bool = True,
+    compression: Optional[str] = "auto",
+    store: Optional["CampaignStore"] = None,
+    cache: Optional["CampaignCache"] = None,
+    manager: Optional["CampaignManager"] = None,
+) -> None:
+    """
+    Saves the campaign dictionary to a JSON file.
+    Args:
+        campaign: The campaign dictionary (or models.Campaign) to save.
+        filepath: The file path to save to (the campaign name when store is given).
+        pretty: If True (default), indents the JSON; set False for compact files.
+        compression: None, 'gzip', 'zstd', or 'auto' (default; infers from a .gz/.zst suffix).
+        store: Optional campaign_store.CampaignStore to save into instead of a file.
+        cache: Optional campaign_cache.CampaignCache; the campaign is cached and written
+            in the background (pretty/compression are then the cache's settings).
+        manager: Optional campaign_manager.CampaignManager; filepath is then the campaign id
+            and the write runs on the campaign's shard under its file lock (pretty/compression
+            are then the manager's settings).
+    Returns:
+        None
+    Notes:
+        Overwrites the file (or stored campaign) if it exists, atomically (see serialize_data).
+    """
+    if not isinstance(campaign, dict):
+        from models import Campaign
+
+        _check_type("campaign", campaign, Campaign)
+        campaign = campaign.to_dict()
+    if store is not None:
+        store.import_campaign(filepath, campaign)
+        return
+    if cache is not None:
+        cache.put(filepath, campaign)
+        return
+    if manager is not None:
+        manager.save(filepath, campaign)
+        return
+    serialize_data(campaign, filepath, pretty=pretty, compression=compression)
+
+
+@instrumented
+def load_campaign(
+    filepath: str,
+    store: Optional["CampaignStore"] = None,
+    cache: Optional["CampaignCache"] = None,
+    manager: Optional["CampaignManager"] = None,
+) -> Dict[str, Any]:
+    """
+    Loads a campaign dictionary from a JSON file.
+    Args:
+        filepath: The file path to load from (the campaign name when store is given).
+        store: Optional campaign_store.CampaignStore to load from instead of a file.
+        cache: Optional campaign_cache.CampaignCache; reparses the file only if it changed.
+            The cached dict is shared, so save changes back with save_campaign(cache=...).
+        manager: Optional campaign_manager.CampaignManager; filepath is then the campaign id
+            (use manager.update for read-modify-write changes).
+    Returns:
+        The loaded campaign dictionary.
+    Notes:
+        Raises FileNotFoundError if the file does not exist (KeyError for a missing stored campaign).
+    """
+    if store is not None:
+        return store.export_campaign(filepath)
+    if cache is not None:
+        return cache.get(filepath)
+    if manager is not None:
+        return manager.load(filepath)
+    return deserialize_data(filepath)
+
+
+@instrumented
+def iter_campaign_sessions(
+    filepath: str, store: Optional["CampaignStore"] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Streams a saved campaign's session logs one at a time.
+    Use this for recaps or reports on large campaigns without loading the whole file.
+    Args:
+        filepath: The campaign file path (plain, gzip, or zstd), or campaign name when store is given.
+        store: Optional campaign_store.CampaignStore to read from instead of a file.
+    Returns:
+        An iterator over the session dictionaries, in order.
+    Notes:
+        Raises FileNotFoundError if the file does not exist.
+    """
+    if store is not None:
+        return store.iter_sessions(filepath)
+    return persistence.iter_sessions(filepath)
+
+
+@instrumented
+def save_character(
+    character: Union[Dict[str, Any], "Character"],
+    filepath: str,
+    pretty: bool = True,
+    compression: Optional[str] = "auto",
+    store: Optional["CampaignStore"] = None,
+) -> None:
+    """
+    Saves a character dictionary to a JSON file.
+    Args:
+        character: The character dictionary (or models.Character) to save.
+        filepath: The file path to save to (the character key when store is given).
+        pretty: If True (default), indents the JSON; set False for compact files.
+        compression: None, 'gzip', 'zstd', or 'auto' (default; infers from a .gz/.zst suffix).
+        store: Optional campaign_store.CampaignStore to save into instead of a file.
+    Returns:
+        None
+    Notes:
+        Overwrites the file (or stored character) if it exists, atomically (see serialize_data).
+    """
+    if not isinstance(character, dict):
+        from models import Character
+
+        _check_type("character", character, Character)
+        character = character.to_dict()
+    if store is not None:
+        store.save_character(filepath, character)
+        return
+    serialize_data(character, filepath, pretty=pretty, compression=compression)
+
+
+@instrumented
+def load_character(filepath: str, store: Optional["CampaignStore"] = None) -> Dict[str, Any]:
+    """
+    Loads a character dictionary from a JSON file.
+    Args:
+        filepath: The file path to load from (the character key when store is given).
+        store: Optional campaign_store.CampaignStore to load from instead of a file.
+    Returns:
+        The loaded character dictionary.
+    Notes:
+        Raises FileNotFoundError if the file does not exist (KeyError for a missing stored character).
+    """
+    if store is not None:
+        return store.load_character(filepath)
+    return deserialize_data(filepath)
@@ -0,0 +1,45 @@
+import logging
+from typing import Any, List, Optional, Union
+
+from anarchy.dice import _resolve_rng
+from eventlog import log_event
+from metrics import instrumented
+from rng import RNGProvider
+from validation import _check_type
+
+logger = logging.getLogger(__name__)
+
+# ---------- Random Tables ----------
+
+@instrumented(size="table")
+def roll_on_random_table(
+    table: Union[List[Any], "RandomTable"], rng: Optional[RNGProvider] = None
+) -> Any:
+    """
+    Selects a random result from a data-driven table (list).
+    Use this for random encounters, loot, oracles, or inspiration.
+    Args:
+        table: List of possible results (strings, dicts, etc.), or a compiled RandomTable
+            (weighted, dice-range, or nested tables; see tables.compile_table).
+        rng: Optional RNG provider (e.g., the session's); defaults to the module provider.
+    Returns:
+        A randomly selected entry from the table.
+    Notes:
+        Table may contain mixed types. If empty, returns None and logs a warning.
+    """
+    if not isinstance(table, list):
+        from tables import RandomTable
+
+        _check_type("table", table, RandomTable)
+        if not len(table):
+            log_event(logger, logging.WARNING, "table.empty", "Random table is empty.")
+            return None
+        result = table.roll(rng)
+        log_event(logger, logging.INFO, "table.rolled", "Rolled on random table: %(result)s", result=result)
+        return result
+    if not table:
+        log_event(logger, logging.WARNING, "table.empty", "Random table is empty.")
+        return None
+    result = _resolve_rng(rng).choice(table)
+    log_event(logger, logging.INFO, "table.rolled", "Rolled on random table: %(result)s", result=result)
+    return result
@@ -0,0 +1,96 @@
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional, Tuple
+
+# ---------- Import-Time Budget ----------
+#
+# Checks the cold-start cost of the modules a tool-call worker imports, using
+# `python -X importtime` in a fresh interpreter per run:
+#
+#     python benchmarks/import_time.py                  # exit code 1 if over budget
+#     python benchmarks/import_time.py --budget-ms 60 -m anarchy.dice
+#
+# A module passes when its best cumulative import time over --repeat runs is within the
+# budget and none of the optional heavy backends were imported along the way (they must
+# load on first use). Interpreter start-up (site, encodings) is not counted.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MODULES = [
+    "anarchy", "anarchy.dice", "anarchy.character", "anarchy.campaign",
+    "anarchy.persistence", "anarchy.tables", "main",
+]
+# Backends that must never load at import time.
+HEAVY_MODULES = ["numpy", "orjson", "zstandard", "sqlite3", "http.server"]
+DEFAULT_BUDGET_MS = 100.0
+
+
+def measure(module: str) -> Tuple[float, List[str]]:
+    """
+    Imports module in a fresh interpreter under -X importtime.
+    Returns:
+        (cumulative import time in milliseconds, names of every module imported with it)
+    Raises:
+        RuntimeError: If the import fails.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=ROOT,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr.strip()}")
+    cumulative = None
+    imported = []
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package", nesting shown by indentation
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, total, name = line.split("|", 2)
+        if not total.strip().isdigit():
+            continue  # the header line
+        imported.append(name.strip())
+        if name == f" {module}":
+            cumulative = int(total) / 1000.0
+    if cumulative is None:
+        raise RuntimeError(f"import {module} did not appear in the -X importtime output (already imported?)")
+    return cumulative, imported
+
+
+def check(modules: List[str], budget_ms: float, repeat: int) -> List[Dict[str, object]]:
+    """
+    Measures each module repeat times and returns one row per module with its best time
+    (ms), the heavy backends it pulled in and whether it passed.
+    """
+    rows = []
+    for module in modules:
+        times = []
+        heavy: List[str] = []
+        for _ in range(repeat):
+            elapsed, imported = measure(module)
+            times.append(elapsed)
+            heavy = sorted(set(HEAVY_MODULES) & set(imported))
+        best = min(times)
+        rows.append({"module": module, "best_ms": best, "heavy": heavy, "ok": best <= budget_ms and not heavy})
+    return rows
+
+
+def _main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check that worker imports stay within a cold-start budget.")
+    parser.add_argument("-m", "--module", action="append", help="Module to check (repeatable; default: the anarchy package and main).")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help=f"Per-module budget in milliseconds (default {DEFAULT_BUDGET_MS:g}).")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per module; the best time counts (default 5).")
+    options = parser.parse_args(argv)
+
+    rows = check(options.module or DEFAULT_MODULES, options.budget_ms, max(1, options.repeat))
+    for row in rows:
+        status = "ok" if row["ok"] else "OVER BUDGET" if not row["heavy"] else f"LOADED {', '.join(row['heavy'])}"
+        print(f"{row['module']:<24} {row['best_ms']:8.1f} ms  {status}")
+    failures = sum(1 for row in rows if not row["ok"])
+    print(f"{failures} of {len(rows)} module(s) failed the {options.budget_ms:g} ms import budget.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main())
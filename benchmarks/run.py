@@ -0,0 +1,311 @@
+import argparse
+import datetime
+import json
+import logging
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import timeit
+from functools import partial
+from statistics import median
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import anarchy  # noqa: E402
+from brief_index import BriefIndex  # noqa: E402
+from npc_registry import NPCRegistry  # noqa: E402
+from rng import SeededRNG  # noqa: E402
+from synthetic import make_briefs, make_campaign, make_npcs  # noqa: E402
+
+# ---------- Benchmark Runner ----------
+#
+# Times the hot paths of the anarchy package on synthetic inputs and writes a JSON report
+# with stable keys, so reports from two commits can be diffed or compared with --compare:
+#
+#     python benchmarks/run.py --output before.json
+#     python benchmarks/run.py --output after.json --compare before.json
+#
+# Each case is timed as in timeit: the call count is raised until one batch takes at least
+# --min-time seconds, then --repeat batches are timed and the best and median per-call
+# times are reported. This is a measurement tool, not a test suite.
+
+REPORT_VERSION = 1
+
+POOL_SIZES = [1, 10, 100, 1000, 10000]
+ENTRY_COUNTS = [10, 100, 1000, 10000, 100000]
+SESSION_COUNTS = [1, 10, 100, 1000, 10000]
+
+# A case is (params, setup); setup() builds the inputs and returns the callable to time, so
+# cases filtered out with --filter cost nothing.
+Case = Tuple[Dict[str, Any], Callable[[], Callable[[], Any]]]
+Generator = Callable[[bool, str], Iterator[Case]]
+_BENCHMARKS: List[Tuple[str, Generator]] = []
+
+
+def benchmark(group: str) -> Callable[[Generator], Generator]:
+    """
+    Registers a case generator under a group name. The generator is called with quick
+    (True to skip the largest sizes) and a scratch directory for files, and yields
+    (params, setup) pairs.
+    """
+
+    def register(fn: Generator) -> Generator:
+        _BENCHMARKS.append((group, fn))
+        return fn
+
+    return register
+
+
+def _sizes(sizes: List[int], quick: bool) -> List[int]:
+    return sizes[:-1] if quick else sizes
+
+
+def _case_name(group: str, params: Dict[str, Any]) -> str:
+    if not params:
+        return group
+    return f"{group}[{','.join(f'{key}={value}' for key, value in params.items())}]"
+
+
+# ---------- Dice ----------
+
+
+@benchmark("roll_cue")
+def bench_roll_cue(quick: bool, workdir: str) -> Iterator[Case]:
+    def setup(pool: int, edge: bool) -> Callable[[], Any]:
+        rng = SeededRNG(1)
+        return lambda: anarchy.roll_cue(pool, edge=edge, rng=rng)
+
+    for pool in _sizes(POOL_SIZES, quick):
+        yield {"pool": pool}, partial(setup, pool, False)
+    for pool in _sizes(POOL_SIZES, quick):
+        yield {"pool": pool, "edge": True}, partial(setup, pool, True)
+
+
+@benchmark("detect_glitch")
+def bench_detect_glitch(quick: bool, workdir: str) -> Iterator[Case]:
+    def setup(pool: int) -> Callable[[], Any]:
+        hits, rolls = anarchy.roll_cue(pool, rng=SeededRNG(2))
+        return lambda: anarchy.detect_glitch(rolls, hits)
+
+    for pool in _sizes(POOL_SIZES, quick):
+        yield {"pool": pool}, partial(setup, pool)
+
+
+@benchmark("reroll_failures")
+def bench_reroll_failures(quick: bool, workdir: str) -> Iterator[Case]:
+    def setup(pool: int) -> Callable[[], Any]:
+        _, rolls = anarchy.roll_cue(pool, rng=SeededRNG(3))
+        rng = SeededRNG(4)
+        return lambda: anarchy.reroll_failures(rolls, rng=rng)
+
+    for pool in _sizes(POOL_SIZES, quick):
+        yield {"pool": pool}, partial(setup, pool)
+
+
+# ---------- Lookups ----------
+
+
+@benchmark("get_random_npc")
+def bench_get_random_npc(quick: bool, workdir: str) -> Iterator[Case]:
+    def setup(count: int, tag: Optional[str], registry: bool) -> Callable[[], Any]:
+        npcs: Any = make_npcs(count)
+        if registry:
+            npcs = NPCRegistry(npcs)
+        rng = SeededRNG(5)
+        return lambda: anarchy.get_random_npc(npcs, tag, rng=rng)
+
+    for count in _sizes(ENTRY_COUNTS, quick):
+        yield {"npcs": count, "tag": None}, partial(setup, count, None, False)
+        yield {"npcs": count, "tag": "fixer"}, partial(setup, count, "fixer", False)
+        yield {"npcs": count, "tag": "fixer", "registry": True}, partial(setup, count, "fixer", True)
+
+
+@benchmark("get_contract_brief")
+def bench_get_contract_brief(quick: bool, workdir: str) -> Iterator[Case]:
+    # Looks up the last brief, the worst case for the list scan.
+    def setup(count: int, index: bool) -> Callable[[], Any]:
+        briefs: Any = make_briefs(count)
+        name = briefs[-1]["name"]
+        if index:
+            briefs = BriefIndex(briefs)
+        return lambda: anarchy.get_contract_brief(briefs, name)
+
+    for count in _sizes(ENTRY_COUNTS, quick):
+        yield {"briefs": count}, partial(setup, count, False)
+        yield {"briefs": count, "index": True}, partial(setup, count, True)
+
+
+# ---------- Persistence ----------
+
+
+@benchmark("save_campaign")
+def bench_save_campaign(quick: bool, workdir: str) -> Iterator[Case]:
+    def setup(count: int, pretty: bool) -> Callable[[], Any]:
+        campaign = make_campaign(count)
+        path = os.path.join(workdir, f"save-{count}.json")
+        return lambda: anarchy.save_campaign(campaign, path, pretty=pretty)
+
+    for count in _sizes(SESSION_COUNTS, quick):
+        yield {"sessions": count}, partial(setup, count, True)
+        yield {"sessions": count, "pretty": False}, partial(setup, count, False)
+
+
+@benchmark("load_campaign")
+def bench_load_campaign(quick: bool, workdir: str) -> Iterator[Case]:
+    def setup(count: int) -> Callable[[], Any]:
+        path = os.path.join(workdir, f"load-{count}.json")
+        anarchy.save_campaign(make_campaign(count), path)
+        return lambda: anarchy.load_campaign(path)
+
+    for count in _sizes(SESSION_COUNTS, quick):
+        yield {"sessions": count}, partial(setup, count)
+
+
+# ---------- Timing and Reports ----------
+
+
+def time_case(fn: Callable[[], Any], min_time: float, repeat: int) -> Dict[str, Any]:
+    """
+    Times fn and returns its call count per batch and best/median seconds per call.
+    """
+    timer = timeit.Timer(fn)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        # Aim a little past min_time so the next batch usually qualifies.
+        number = max(number * 2, int(number * min_time * 1.2 / elapsed) if elapsed > 0 else number * 10)
+    times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {"number": number, "best": min(times), "median": median(times)}
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def _environment() -> Dict[str, Any]:
+    versions = {}
+    for module in ("numpy", "orjson", "zstandard"):
+        try:
+            versions[module] = getattr(__import__(module), "__version__", "unknown")
+        except ImportError:
+            versions[module] = None
+    return {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count(), **versions}
+
+
+def run(
+    pattern: Optional[str] = None, quick: bool = False, min_time: float = 0.1, repeat: int = 5,
+    progress: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Runs the registered benchmarks and returns the report dictionary.
+    Args:
+        pattern: Optional regular expression; only case names matching it are run.
+        quick: Skip the largest size of each group.
+        min_time: Minimum seconds per timed batch.
+        repeat: Number of timed batches per case.
+        progress: Optional callback(name, result) called after each case.
+    """
+    selector = re.compile(pattern) if pattern else None
+    results: Dict[str, Dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for group, generate in _BENCHMARKS:
+            for params, setup in generate(quick, workdir):
+                name = _case_name(group, params)
+                if selector is not None and not selector.search(name):
+                    continue
+                result = {"group": group, "params": params, **time_case(setup(), min_time, repeat)}
+                results[name] = result
+                if progress is not None:
+                    progress(name, result)
+    return {
+        "version": REPORT_VERSION,
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "environment": _environment(),
+        "settings": {"min_time": min_time, "repeat": repeat, "quick": quick, "log_level": logging.getLevelName(logging.getLogger().level)},
+        "results": results,
+    }
+
+
+def compare(baseline: Dict[str, Any], report: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """
+    Compares best times case by case (the least noisy figure on a busy machine).
+    Returns:
+        One row per case present in both reports: name, old, new, ratio (new/old) and
+        regression (ratio above 1 + threshold).
+    """
+    rows = []
+    for name, result in report["results"].items():
+        old = baseline.get("results", {}).get(name)
+        if old is None or old["best"] <= 0:
+            continue
+        ratio = result["best"] / old["best"]
+        rows.append({"name": name, "old": old["best"], "new": result["best"], "ratio": ratio, "regression": ratio > 1 + threshold})
+    return rows
+
+
+def _format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit}"
+    return f"{seconds / 1e-9:8.2f} ns"
+
+
+def _main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the Shadowrun Anarchy mechanics and persistence paths.")
+    parser.add_argument("-k", "--filter", help="Only run cases whose name matches this regular expression.")
+    parser.add_argument("--quick", action="store_true", help="Skip the largest size of each group.")
+    parser.add_argument("--min-time", type=float, default=0.1, help="Minimum seconds per timed batch (default 0.1).")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed batches per case (default 5).")
+    parser.add_argument("--output", help="Write the JSON report here.")
+    parser.add_argument("--compare", help="Baseline JSON report to compare best times against.")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Slowdown ratio flagged as a regression (default 0.2).")
+    parser.add_argument("--log-level", default="WARNING", help="Logging level while timing (default WARNING).")
+    parser.add_argument("--list", action="store_true", help="List the case names and exit.")
+    options = parser.parse_args(argv)
+
+    logging.getLogger().setLevel(options.log_level.upper())
+    if options.list:
+        for group, generate in _BENCHMARKS:
+            for params, _ in generate(options.quick, ""):
+                print(_case_name(group, params))
+        return 0
+
+    def progress(name: str, result: Dict[str, Any]) -> None:
+        print(f"{name:<60} {_format_time(result['median'])}  (best {_format_time(result['best']).strip()})", flush=True)
+
+    report = run(options.filter, options.quick, options.min_time, options.repeat, progress)
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    if not options.compare:
+        return 0
+    with open(options.compare, encoding="utf-8") as f:
+        baseline = json.load(f)
+    rows = compare(baseline, report, options.threshold)
+    print(f"\nCompared with {options.compare} (commit {baseline.get('commit')}):")
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(f"{row['name']:<60} {_format_time(row['old'])} -> {_format_time(row['new'])}  x{row['ratio']:.2f}{flag}")
+    regressions = sum(1 for row in rows if row["regression"])
+    print(f"{regressions} regression(s) over {options.threshold:.0%} in {len(rows)} compared case(s).")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main())
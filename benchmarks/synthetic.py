@@ -0,0 +1,106 @@
+import random
+from typing import Any, Dict, List, Optional
+
+# ---------- Synthetic Campaign Generator ----------
+#
+# Deterministic, realistic-looking campaign data for benchmarks: the same arguments always
+# produce the same campaign, so reports from different commits measure the same input.
+
+_TAGS = ["fixer", "enemy", "contact", "corp", "gang", "decker", "mage", "street", "law", "fence"]
+_WORDS = [
+    "run", "extraction", "datasteal", "ambush", "Renraku", "Ares", "Aztechnology", "Seattle",
+    "Redmond", "Barrens", "drone", "spirit", "matrix", "host", "ice", "chase", "betrayal",
+    "payday", "safehouse", "ghoul", "Lone Star", "Knight Errant", "smuggler", "rigger", "fixer",
+]
+_CUES = ["Never again", "Keep moving", "Trust no one", "Get paid", "Protect the kid", "Burn it down"]
+_LOOT = ["nuyen", "karma", "commlink", "cyberdeck", "credstick", "ammo", "medkit", "grenade", "drone"]
+
+
+def make_npcs(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Returns count NPC dictionaries with one to three tags each.
+    """
+    rng = random.Random(seed)
+    return [
+        {"name": f"NPC {i}", "tags": rng.sample(_TAGS, rng.randint(1, 3)), "notes": " ".join(rng.choices(_WORDS, k=8))}
+        for i in range(count)
+    ]
+
+
+def make_briefs(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Returns count contract brief dictionaries with unique names.
+    """
+    rng = random.Random(seed)
+    return [
+        {
+            "name": f"Contract {i}",
+            "fixer": f"NPC {rng.randrange(max(count, 1))}",
+            "payout": rng.randrange(1000, 50000, 500),
+            "details": " ".join(rng.choices(_WORDS, k=20)),
+        }
+        for i in range(count)
+    ]
+
+
+def make_sessions(count: int, npc_count: int = 100, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Returns count session logs in the session_log format.
+    """
+    rng = random.Random(seed)
+    return [
+        {
+            "session": i + 1,
+            "summary": " ".join(rng.choices(_WORDS, k=rng.randint(20, 60))),
+            "npcs": [f"NPC {rng.randrange(max(npc_count, 1))}" for _ in range(rng.randint(1, 5))],
+            "loot": {item: rng.randint(1, 5000) for item in rng.sample(_LOOT, rng.randint(1, 4))},
+        }
+        for i in range(count)
+    ]
+
+
+def make_characters(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Returns count characters in the character_create format.
+    """
+    rng = random.Random(seed)
+    return [
+        {
+            "name": f"Runner {i}",
+            "karma": rng.randint(0, 60),
+            "karma_spent": {"skill": rng.randint(0, 40), "attribute": rng.randint(0, 30)},
+            "cues_used": rng.sample(_CUES, rng.randint(0, 3)),
+            "plot_points": rng.randint(0, 3),
+            "condition_monitor": 10,
+        }
+        for i in range(count)
+    ]
+
+
+def make_campaign(
+    sessions: int,
+    npcs: int = 100,
+    briefs: int = 20,
+    characters: int = 5,
+    seed: int = 0,
+    extra: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Builds a synthetic campaign dictionary in the campaign_create format.
+    Args:
+        sessions: Number of logged sessions.
+        npcs, briefs, characters: Sizes of the other campaign lists.
+        seed: Generator seed; the same arguments always give the same campaign.
+        extra: Optional top-level fields merged in.
+    Returns:
+        The campaign dictionary.
+    """
+    campaign: Dict[str, Any] = {
+        "name": f"Synthetic campaign ({sessions} sessions)",
+        "sessions": make_sessions(sessions, npc_count=npcs, seed=seed),
+        "characters": make_characters(characters, seed=seed + 1),
+        "npcs": make_npcs(npcs, seed=seed + 2),
+        "briefs": make_briefs(briefs, seed=seed + 3),
+    }
+    campaign.update(extra or {})
+    return campaign
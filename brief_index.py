@@ -0,0 +1,155 @@
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from validation import _check_list_of, _check_type
+
+# ---------- Contract Brief Index ----------
+
+
+def normalize_brief_name(name: str) -> str:
+    """
+    Normalizes a contract name for lookups: case-folded with whitespace collapsed.
+    """
+    return " ".join(name.casefold().split())
+
+
+def _trigrams(normalized: str) -> Set[str]:
+    """
+    Returns the set of character trigrams of a normalized name, padded so short names
+    and word boundaries still produce trigrams.
+    """
+    padded = f"  {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class _TrieNode:
+    """
+    Prefix trie node; names lists the normalized names that end exactly at this node.
+    """
+
+    __slots__ = ("children", "names")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.names: List[str] = []
+
+
+class BriefIndex:
+    """
+    Contract brief store with O(1) exact lookup, prefix autocomplete, and typo-tolerant search.
+    Use this instead of passing the raw 'briefs' list when briefs are looked up every turn.
+    Args:
+        briefs: Optional initial list of contract brief dictionaries (each with a 'name').
+    Notes:
+        Exact lookups match the raw name first (like the list scan) and then the normalized
+        name, so 'Aztechnology Extraction' also finds 'aztechnology  extraction'.
+        When two briefs share a name, the first one added wins, as in the list scan.
+        Briefs without a string 'name' are kept out of the index.
+    """
+
+    def __init__(self, briefs: Optional[List[Dict[str, Any]]] = None) -> None:
+        self._by_name: Dict[str, Dict[str, Any]] = {}
+        self._by_normalized: Dict[str, Dict[str, Any]] = {}
+        self._trie = _TrieNode()
+        self._by_trigram: Dict[str, Set[str]] = {}
+        self._trigram_counts: Dict[str, int] = {}
+        if briefs is not None:
+            self.add_many(briefs)
+
+    @classmethod
+    def from_campaign(cls, campaign: Dict[str, Any]) -> "BriefIndex":
+        """
+        Builds an index from a campaign dictionary's 'briefs' list.
+        """
+        _check_type("campaign", campaign, dict)
+        return cls(campaign.get("briefs", []))
+
+    def __len__(self) -> int:
+        return len(self._by_normalized)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._by_name or normalize_brief_name(name) in self._by_normalized
+
+    def _insert(self, brief: Dict[str, Any]) -> None:
+        name = brief.get("name")
+        if not isinstance(name, str):
+            return
+        self._by_name.setdefault(name, brief)
+        normalized = normalize_brief_name(name)
+        if normalized in self._by_normalized:
+            return
+        self._by_normalized[normalized] = brief
+        node = self._trie
+        for char in normalized:
+            node = node.children.setdefault(char, _TrieNode())
+        node.names.append(normalized)
+        trigrams = _trigrams(normalized)
+        self._trigram_counts[normalized] = len(trigrams)
+        for trigram in trigrams:
+            self._by_trigram.setdefault(trigram, set()).add(normalized)
+
+    def add(self, brief: Dict[str, Any]) -> None:
+        """
+        Inserts one contract brief into every index.
+        """
+        _check_type("brief", brief, dict)
+        self._insert(brief)
+
+    def add_many(self, briefs: Iterable[Dict[str, Any]]) -> None:
+        """
+        Inserts several contract briefs, validated once up front.
+        """
+        briefs = list(briefs)
+        _check_list_of("briefs", briefs, dict)
+        for brief in briefs:
+            self._insert(brief)
+
+    def get(self, name: str) -> Dict[str, Any]:
+        """
+        Returns the brief with this exact (or normalized-equal) name, or an empty dict.
+        """
+        brief = self._by_name.get(name)
+        if brief is None:
+            brief = self._by_normalized.get(normalize_brief_name(name), {})
+        return brief
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Returns up to limit briefs whose normalized name starts with prefix, alphabetically.
+        """
+        node: Optional[_TrieNode] = self._trie
+        for char in normalize_brief_name(prefix):
+            node = node.children.get(char)
+            if node is None:
+                return []
+        found: List[Dict[str, Any]] = []
+        stack = [node]
+        while stack and len(found) < limit:
+            current = stack.pop()
+            found.extend(self._by_normalized[n] for n in current.names[:limit - len(found)])
+            stack.extend(current.children[c] for c in sorted(current.children, reverse=True))
+        return found
+
+    def fuzzy(self, name: str, limit: int = 5, min_similarity: float = 0.3) -> List[Dict[str, Any]]:
+        """
+        Returns up to limit briefs whose names look like name, best match first.
+        Args:
+            name: Possibly misspelled contract name.
+            limit: Maximum number of briefs to return.
+            min_similarity: Minimum trigram Jaccard similarity (0-1) to count as a match.
+        Returns:
+            Matching brief dictionaries, most similar first.
+        Notes:
+            Only names sharing at least one trigram with the query are scored.
+        """
+        query = _trigrams(normalize_brief_name(name))
+        shared: Counter = Counter()
+        for trigram in query:
+            shared.update(self._by_trigram.get(trigram, ()))
+        scored = []
+        for candidate, overlap in shared.items():
+            similarity = overlap / (len(query) + self._trigram_counts[candidate] - overlap)
+            if similarity >= min_similarity:
+                scored.append((-similarity, candidate))
+        scored.sort()
+        return [self._by_normalized[candidate] for _, candidate in scored[:limit]]
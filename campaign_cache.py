@@ -0,0 +1,294 @@
+import atexit
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import persistence
+from eventlog import log_event
+from validation import _check_type
+
+logger = logging.getLogger(__name__)
+
+# ---------- Campaign Cache with Write-Behind ----------
+
+# Rough in-memory size of decoded campaign data per byte of compact JSON.
+_MEMORY_PER_JSON_BYTE = 6
+
+Stamp = Tuple[int, int]  # (st_mtime_ns, st_size) of the file when last read or written
+
+
+def _stat_stamp(filepath: str) -> Optional[Stamp]:
+    try:
+        stat = os.stat(filepath)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class _Entry:
+    __slots__ = ("data", "stamp", "weight", "dirty")
+
+    def __init__(self, data: Any, stamp: Optional[Stamp], weight: int) -> None:
+        self.data = data
+        self.stamp = stamp
+        self.weight = weight
+        self.dirty = False
+
+
+class CampaignCache:
+    """
+    Keeps loaded campaigns in memory and writes changes back in the background.
+    Use this when many tool calls read and change the same campaigns: pass cache= to
+    load_campaign/save_campaign, or call get/put/update directly.
+    Args:
+        max_bytes: Approximate memory budget; least recently used campaigns are evicted past it.
+        flush_interval: Seconds between background flushes (0 disables the flusher thread;
+            call flush() yourself).
+        pretty: Whether flushed files are indented (see save_campaign).
+    Notes:
+        A clean entry is revalidated against the file's mtime and size on every get, so edits
+        made outside the cache are picked up. Dirty entries are newer than the file and are
+        served as is. Any number of changes between flushes costs one write.
+        Dirty campaigns are flushed before eviction and by close(), which also runs at exit.
+        Memory use is estimated from the campaign's JSON size when it is read or written.
+        Prefer update() for changes while the flusher runs: it holds the cache lock, so a
+        flush never encodes a half-made change. Call mark_dirty() after other in-place edits.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, flush_interval: float = 1.0, pretty: bool = True) -> None:
+        _check_type("max_bytes", max_bytes, int)
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        self.pretty = pretty
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._weight = 0
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        # Payloads are numbered when encoded; path -> number of the last payload written,
+        # so a flush that loses the race for _write_lock never overwrites a newer one.
+        self._encoded = 0
+        self._written: Dict[str, int] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        if flush_interval > 0:
+            self._thread = threading.Thread(target=self._flush_loop, name="campaign-cache-flusher", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def __enter__(self) -> "CampaignCache":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, filepath: str) -> bool:
+        return os.path.abspath(filepath) in self._entries
+
+    @property
+    def weight(self) -> int:
+        """
+        Approximate memory used by cached campaigns, in bytes.
+        """
+        return self._weight
+
+    # --- reading ---
+
+    def get(self, filepath: str) -> Dict[str, Any]:
+        """
+        Returns the cached campaign for a path, loading or reloading it if needed.
+        Raises:
+            FileNotFoundError: If the campaign is neither cached nor on disk.
+        """
+        _check_type("filepath", filepath, str)
+        key = os.path.abspath(filepath)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry.dirty or _stat_stamp(key) == entry.stamp):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.data
+            self.misses += 1
+            stamp = _stat_stamp(key)
+            raw = persistence.read_bytes(key)
+            data = persistence.decode_json(raw)
+            self._store(key, data, stamp, len(raw) * _MEMORY_PER_JSON_BYTE)
+            log_event(
+                logger, logging.DEBUG, "cache.loaded", "Loaded %(filepath)s into campaign cache (%(reason)s)",
+                filepath=key, reason="stale" if entry is not None else "miss",
+            )
+            return data
+
+    def etag(self, filepath: str) -> Optional[str]:
+        """
+        Returns a validator for the campaign as last read or written ('<mtime_ns>-<size>'),
+        or None if it is not cached or has unwritten changes.
+        """
+        entry = self._entries.get(os.path.abspath(filepath))
+        if entry is None or entry.dirty or entry.stamp is None:
+            return None
+        return f"{entry.stamp[0]:x}-{entry.stamp[1]:x}"
+
+    # --- writing ---
+
+    def put(self, filepath: str, data: Dict[str, Any]) -> None:
+        """
+        Replaces the cached campaign for a path and schedules it to be written.
+        """
+        _check_type("filepath", filepath, str)
+        _check_type("data", data, dict)
+        key = os.path.abspath(filepath)
+        with self._lock:
+            entry = self._entries.get(key)
+            stamp = entry.stamp if entry is not None else _stat_stamp(key)
+            weight = entry.weight if entry is not None else 0
+            self._store(key, data, stamp, weight)
+            self._entries[key].dirty = True
+
+    def update(self, filepath: str, fn: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Applies fn to the cached campaign under the cache lock and marks it dirty.
+        Args:
+            filepath: The campaign file path.
+            fn: Changes the campaign in place (returning None) or returns a replacement.
+        Returns:
+            The campaign after the change.
+        """
+        with self._lock:
+            data = self.get(filepath)
+            result = fn(data)
+            if result is not None and result is not data:
+                self.put(filepath, result)
+                return result
+            self.mark_dirty(filepath)
+            return data
+
+    def mark_dirty(self, filepath: str) -> None:
+        """
+        Records that the cached campaign was changed in place and must be written.
+        Raises:
+            KeyError: If the campaign is not cached.
+        """
+        key = os.path.abspath(filepath)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                raise KeyError(f"Campaign '{filepath}' is not cached")
+            entry.dirty = True
+
+    def dirty(self) -> List[str]:
+        """
+        Returns the paths with changes not yet written.
+        """
+        with self._lock:
+            return [key for key, entry in self._entries.items() if entry.dirty]
+
+    def _store(self, key: str, data: Any, stamp: Optional[Stamp], weight: int) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._weight -= entry.weight
+        self._entries[key] = _Entry(data, stamp, weight)
+        self._weight += weight
+        self._evict()
+
+    def _evict(self) -> None:
+        # Never evicts the most recently used entry, even if it alone is over budget.
+        while self._weight > self.max_bytes and len(self._entries) > 1:
+            key, entry = next(iter(self._entries.items()))
+            if entry.dirty:
+                self._flush_entry(key, entry)
+            self._entries.pop(key, None)
+            self._weight -= entry.weight
+            log_event(logger, logging.DEBUG, "cache.evicted", "Evicted %(filepath)s from campaign cache", filepath=key)
+
+    # --- flushing ---
+
+    def _flush_entry(self, key: str, entry: _Entry) -> None:
+        with self._lock:
+            if not entry.dirty:
+                return
+            if entry.stamp != _stat_stamp(key):
+                log_event(
+                    logger, logging.WARNING, "cache.conflict",
+                    "%(filepath)s changed on disk since it was cached; overwriting with cached changes",
+                    filepath=key,
+                )
+            payload = persistence.encode_json(entry.data, self.pretty)
+            entry.dirty = False  # changes made while writing set it again
+            self._encoded += 1
+            generation = self._encoded
+        try:
+            with self._write_lock:
+                if generation < self._written.get(key, 0):
+                    return  # a newer payload (with these changes in it) is already on disk
+                persistence.write_encoded(payload, key)
+                self._written[key] = generation
+        except BaseException:
+            with self._lock:
+                entry.dirty = True
+            raise
+        with self._lock:
+            entry.stamp = _stat_stamp(key)
+            current = self._entries.get(key)
+            if current is not None and current is not entry:
+                current.stamp = entry.stamp  # replaced by put() mid-write; the file is ours
+            elif current is entry:
+                weight = len(payload) * _MEMORY_PER_JSON_BYTE
+                self._weight += weight - entry.weight
+                entry.weight = weight
+            self.writes += 1
+        log_event(logger, logging.DEBUG, "cache.flushed", "Wrote cached campaign to %(filepath)s", filepath=key)
+
+    def flush(self, filepath: Optional[str] = None) -> int:
+        """
+        Writes dirty campaigns now (one path, or all when filepath is None).
+        Returns:
+            The number of campaigns written.
+        """
+        with self._lock:
+            if filepath is None:
+                targets = [(key, entry) for key, entry in self._entries.items() if entry.dirty]
+            else:
+                key = os.path.abspath(filepath)
+                entry = self._entries.get(key)
+                targets = [(key, entry)] if entry is not None and entry.dirty else []
+        for key, entry in targets:
+            self._flush_entry(key, entry)
+        return len(targets)
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as exc:  # keep flushing other campaigns; retried next interval
+                log_event(logger, logging.ERROR, "cache.flush_failed", "Background flush failed: %(error)s", error=repr(exc))
+
+    def close(self) -> None:
+        """
+        Stops the background flusher and writes every dirty campaign.
+        """
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+        self.flush()
+
+    def evict(self, filepath: str) -> None:
+        """
+        Drops a campaign from the cache, writing it first if it has changes.
+        """
+        key = os.path.abspath(filepath)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            self._flush_entry(key, entry)
+            self._entries.pop(key, None)
+            self._weight -= entry.weight
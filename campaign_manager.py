@@ -0,0 +1,293 @@
+import logging
+import os
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import persistence
+from eventlog import log_event
+from validation import _check_type
+
+try:
+    import fcntl
+except ImportError:  # fcntl is POSIX-only; elsewhere only the shard queues serialize access.
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# ---------- Advisory Campaign Locks ----------
+
+
+def lock_path_for(filepath: str) -> str:
+    """
+    Returns the lock file used for a campaign file (e.g., seattle.json -> seattle.json.lock).
+    Notes:
+        Saves replace the campaign file by renaming a new one over it, so the lock lives in
+        a separate file that is never replaced.
+    """
+    return filepath + ".lock"
+
+
+@contextmanager
+def campaign_lock(filepath: str, exclusive: bool = True) -> Iterator[None]:
+    """
+    Holds an fcntl advisory lock on a campaign file for the duration of the block.
+    Use this in scripts that read or change campaign files a CampaignManager also serves.
+    Args:
+        filepath: The campaign file path.
+        exclusive: True for a writer lock; False for a shared (reader) lock.
+    Notes:
+        Blocks until the lock is granted. The lock is per open file, so it also separates
+        threads of one process. Processes that do not take the lock are not stopped.
+        Without fcntl (Windows) the block runs unlocked.
+    """
+    if fcntl is None:
+        yield
+        return
+    with open(lock_path_for(filepath), "a+b") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+# ---------- Shard Workers ----------
+#
+# These run inside the shard's worker (a process, or a thread with processes=False). Each
+# shard runs one call at a time, so a campaign's calls never overlap. Decoded campaigns are
+# cached per worker and reused while the file's (mtime, size, inode) stamp is unchanged;
+# another writer always changes the inode, since saves rename a new file into place.
+# Shard threads share this module, so the caches are keyed by worker thread: each one is
+# only ever touched by its own shard.
+
+_WORKER_CACHE_SIZE = 64
+
+Stamp = Tuple[int, int, int]  # (st_mtime_ns, st_size, st_ino)
+
+_worker_caches: "Dict[int, OrderedDict[str, Tuple[Stamp, Dict[str, Any]]]]" = {}
+
+
+def _worker_cache() -> "OrderedDict[str, Tuple[Stamp, Dict[str, Any]]]":
+    return _worker_caches.setdefault(threading.get_ident(), OrderedDict())
+
+
+def _file_stamp(filepath: str) -> Optional[Stamp]:
+    try:
+        stat = os.stat(filepath)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+def _remember(filepath: str, campaign: Dict[str, Any]) -> None:
+    stamp = _file_stamp(filepath)
+    if stamp is None:
+        return
+    cache = _worker_cache()
+    cache[filepath] = (stamp, campaign)
+    cache.move_to_end(filepath)
+    while len(cache) > _WORKER_CACHE_SIZE:
+        cache.popitem(last=False)
+
+
+def _forget(filepath: str) -> None:
+    _worker_cache().pop(filepath, None)
+
+
+def _worker_clear() -> None:
+    _worker_caches.pop(threading.get_ident(), None)
+
+
+def _read(filepath: str) -> Dict[str, Any]:
+    cache = _worker_cache()
+    cached = cache.pop(filepath, None)
+    if cached is not None and cached[0] == _file_stamp(filepath):
+        cache[filepath] = cached  # back in as most recently used
+        return cached[1]
+    campaign = persistence.read_json(filepath)
+    _remember(filepath, campaign)
+    return campaign
+
+
+def _worker_load(filepath: str) -> Dict[str, Any]:
+    with campaign_lock(filepath, exclusive=False):
+        return _read(filepath)
+
+
+def _worker_save(filepath: str, campaign: Dict[str, Any], pretty: bool, compression: Optional[str]) -> None:
+    with campaign_lock(filepath):
+        persistence.write_json(campaign, filepath, pretty=pretty, compression=compression)
+        _remember(filepath, campaign)
+
+
+def _worker_update(
+    filepath: str,
+    fn: Callable[..., Optional[Dict[str, Any]]],
+    args: Tuple[Any, ...],
+    kwargs: Dict[str, Any],
+    pretty: bool,
+    compression: Optional[str],
+) -> Dict[str, Any]:
+    with campaign_lock(filepath):
+        campaign = _read(filepath)
+        try:
+            result = fn(campaign, *args, **kwargs)
+        except BaseException:
+            _forget(filepath)  # fn may have half-changed the cached copy
+            raise
+        if result is not None:
+            _check_type("result", result, dict)
+            campaign = result
+        try:
+            persistence.write_json(campaign, filepath, pretty=pretty, compression=compression)
+        except BaseException:
+            _forget(filepath)
+            raise
+        _remember(filepath, campaign)
+    log_event(logger, logging.DEBUG, "manager.updated", "Updated campaign %(filepath)s", filepath=filepath)
+    return campaign
+
+
+# ---------- Sharded Campaign Manager ----------
+
+_CAMPAIGN_ID = re.compile(r"[A-Za-z0-9][A-Za-z0-9_.-]*\Z")
+
+
+class CampaignManager:
+    """
+    Serves many campaigns from one directory, sharded across worker processes by campaign id.
+    Use this when several tables' tool calls load and change campaigns concurrently.
+    Args:
+        root: Directory holding the campaign files ('<campaign_id><suffix>'); created if missing.
+        workers: Number of shards (default: CPU count). Each shard is one worker.
+        processes: If True (default) each shard is a process; if False a thread (no
+            pickling, but no parallel CPU work either).
+        suffix: File suffix; '.json.gz' or '.json.zst' compress (see save_campaign).
+        pretty: Whether saved files are indented.
+    Notes:
+        A campaign always maps to the same shard (crc32 of its id), and a shard runs one call
+        at a time in submission order, so calls for a campaign never overlap and none of its
+        updates are lost. Campaigns on different shards run in parallel. Campaigns that share
+        a shard queue behind each other; use more workers than cores if calls mostly wait
+        on disk.
+        Every call also holds campaign_lock on the file (shared for loads, exclusive for
+        saves and updates), which keeps other managers and scripts that take the lock from
+        interleaving with it.
+        update functions and their arguments are sent to the worker, so with processes=True
+        they must be picklable (module-level functions, not lambdas). With processes=False
+        the shard caches the very dicts passed to save and returned by load; change them
+        only through update.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        workers: Optional[int] = None,
+        processes: bool = True,
+        suffix: str = ".json",
+        pretty: bool = True,
+    ) -> None:
+        _check_type("root", root, str)
+        if workers is None:
+            workers = os.cpu_count() or 1
+        _check_type("workers", workers, int)
+        if workers < 1:
+            raise ValueError("'workers' must be at least 1")
+        _check_type("suffix", suffix, str)
+        os.makedirs(root, exist_ok=True)
+        self.root = os.path.abspath(root)
+        self.workers = workers
+        self.processes = processes
+        self.suffix = suffix
+        self.pretty = pretty
+        executor = ProcessPoolExecutor if processes else ThreadPoolExecutor
+        # One single-worker executor per shard: its FIFO queue is the shard's actor mailbox.
+        self._shards: List[Executor] = [executor(max_workers=1) for _ in range(workers)]
+
+    def __enter__(self) -> "CampaignManager":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def path_for(self, campaign_id: str) -> str:
+        """
+        Returns the file path of a campaign.
+        Raises:
+            ValueError: If the id is empty or has characters other than letters, digits,
+                '_', '.' and '-' (or starts with one of the last three).
+        """
+        _check_type("campaign_id", campaign_id, str)
+        if not _CAMPAIGN_ID.match(campaign_id):
+            raise ValueError(f"Invalid campaign id '{campaign_id}'")
+        return os.path.join(self.root, campaign_id + self.suffix)
+
+    def shard_for(self, campaign_id: str) -> int:
+        """
+        Returns the index of the shard that serves a campaign.
+        """
+        _check_type("campaign_id", campaign_id, str)
+        return zlib.crc32(campaign_id.encode("utf-8")) % self.workers
+
+    def _submit(self, campaign_id: str, fn: Callable[..., Any], *args: Any) -> Future:
+        return self._shards[self.shard_for(campaign_id)].submit(fn, self.path_for(campaign_id), *args)
+
+    def load(self, campaign_id: str) -> Dict[str, Any]:
+        """
+        Returns a campaign, reading the file only if it changed since the shard last saw it.
+        Raises:
+            FileNotFoundError: If the campaign does not exist.
+        """
+        return self._submit(campaign_id, _worker_load).result()
+
+    def save(self, campaign_id: str, campaign: Dict[str, Any]) -> None:
+        """
+        Writes a campaign (creating or replacing it) atomically.
+        """
+        _check_type("campaign", campaign, dict)
+        self._submit(campaign_id, _worker_save, campaign, self.pretty, persistence.AUTO).result()
+        log_event(logger, logging.INFO, "manager.saved", "Saved campaign %(campaign_id)s", campaign_id=campaign_id)
+
+    def submit_update(
+        self, campaign_id: str, fn: Callable[..., Optional[Dict[str, Any]]], *args: Any, **kwargs: Any
+    ) -> "Future[Dict[str, Any]]":
+        """
+        Queues fn(campaign, *args, **kwargs) on the campaign's shard and returns a Future of
+        the updated campaign. Use this to update several campaigns in parallel.
+        Notes:
+            fn changes the campaign in place (returning None) or returns a replacement, as in
+            CampaignCache.update. The result is saved before the next call for the campaign
+            runs; if fn raises, nothing is saved and the Future holds the exception.
+        """
+        if not callable(fn):
+            raise TypeError(f"'fn' must be callable, got {type(fn).__name__}")
+        return self._submit(campaign_id, _worker_update, fn, args, kwargs, self.pretty, persistence.AUTO)
+
+    def update(
+        self, campaign_id: str, fn: Callable[..., Optional[Dict[str, Any]]], *args: Any, **kwargs: Any
+    ) -> Dict[str, Any]:
+        """
+        Applies fn(campaign, *args, **kwargs) to a campaign and saves it, with no other call
+        for the campaign in between (see submit_update).
+        Returns:
+            The campaign after the change.
+        Raises:
+            FileNotFoundError: If the campaign does not exist.
+        """
+        return self.submit_update(campaign_id, fn, *args, **kwargs).result()
+
+    def close(self, wait: bool = True) -> None:
+        """
+        Shuts the shards down after their queued calls finish (wait=False returns at once).
+        """
+        for shard in self._shards:
+            try:
+                shard.submit(_worker_clear)  # frees a thread shard's cache; a process's dies with it
+            except RuntimeError:  # already shut down
+                pass
+            shard.shutdown(wait=wait)
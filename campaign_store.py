@@ -0,0 +1,454 @@
+import logging
+import sqlite3
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+import persistence
+from eventlog import log_event
+from validation import _check_list_of, _check_type
+
+logger = logging.getLogger(__name__)
+
+# ---------- SQLite Campaign Store ----------
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS campaigns (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS characters (
+    id INTEGER PRIMARY KEY,
+    campaign_id INTEGER REFERENCES campaigns(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS characters_by_campaign ON characters(campaign_id, position);
+CREATE INDEX IF NOT EXISTS characters_by_name ON characters(name);
+CREATE TABLE IF NOT EXISTS karma_spent (
+    character_id INTEGER NOT NULL REFERENCES characters(id) ON DELETE CASCADE,
+    category TEXT NOT NULL,
+    amount INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS karma_by_category ON karma_spent(category);
+CREATE INDEX IF NOT EXISTS karma_by_character ON karma_spent(character_id);
+CREATE TABLE IF NOT EXISTS npcs (
+    id INTEGER PRIMARY KEY,
+    campaign_id INTEGER NOT NULL REFERENCES campaigns(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS npcs_by_campaign ON npcs(campaign_id, position);
+CREATE INDEX IF NOT EXISTS npcs_by_name ON npcs(campaign_id, name);
+CREATE TABLE IF NOT EXISTS npc_tags (
+    npc_id INTEGER NOT NULL REFERENCES npcs(id) ON DELETE CASCADE,
+    tag TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS npc_tags_by_tag ON npc_tags(tag, npc_id);
+CREATE INDEX IF NOT EXISTS npc_tags_by_npc ON npc_tags(npc_id);
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    campaign_id INTEGER NOT NULL REFERENCES campaigns(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    number INTEGER,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_by_campaign ON sessions(campaign_id, position);
+CREATE INDEX IF NOT EXISTS sessions_by_number ON sessions(campaign_id, number);
+CREATE TABLE IF NOT EXISTS session_npcs (
+    session_id INTEGER NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+    npc_name TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS session_npcs_by_name ON session_npcs(npc_name, session_id);
+CREATE INDEX IF NOT EXISTS session_npcs_by_session ON session_npcs(session_id);
+CREATE TABLE IF NOT EXISTS briefs (
+    id INTEGER PRIMARY KEY,
+    campaign_id INTEGER NOT NULL REFERENCES campaigns(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS briefs_by_campaign ON briefs(campaign_id, position);
+CREATE INDEX IF NOT EXISTS briefs_by_name ON briefs(campaign_id, name);
+"""
+
+# Campaign keys stored in their own tables; everything else lives in campaigns.data.
+_LIST_KEYS = ("characters", "npcs", "sessions", "briefs")
+# Reserved campaigns.data key recording the campaign's top-level keys in their original order.
+_KEY_ORDER = "__keys__"
+
+
+def _encode(value: Any) -> bytes:
+    return persistence.encode_json(value, pretty=False)
+
+
+def _name(item: Dict[str, Any]) -> Optional[str]:
+    name = item.get("name")
+    return name if isinstance(name, str) else None
+
+
+class CampaignStore:
+    """
+    SQLite-backed store for campaigns, characters, NPCs, sessions, and contract briefs.
+    Use this when campaigns grow too large to load and scan as one JSON blob.
+    Args:
+        path: Database file path (':memory:' for a throwaway store).
+        check_same_thread: Passed to sqlite3.connect; set False to share across threads
+            (callers must then serialize access themselves).
+    Notes:
+        Uses WAL journaling, so readers never block the writer. Each list item is stored as
+        JSON alongside indexed columns (session number, NPC name and tags, brief name, karma
+        categories), and export_campaign rebuilds the imported dictionary with the same keys
+        in the same order (plus any list a later update added).
+        Wrap bulk updates in transaction() so they commit once.
+    """
+
+    def __init__(self, path: str, check_same_thread: bool = True) -> None:
+        _check_type("path", path, str)
+        self.path = path
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=check_same_thread)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(_SCHEMA)
+        self._depth = 0
+
+    def close(self) -> None:
+        """
+        Closes the database connection.
+        """
+        self._conn.close()
+
+    def __enter__(self) -> "CampaignStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Groups writes into one transaction; nested uses join the outermost one.
+        Rolls everything back if the block raises.
+        """
+        if self._depth:
+            self._depth += 1
+            try:
+                yield self._conn
+            finally:
+                self._depth -= 1
+            return
+        self._conn.execute("BEGIN IMMEDIATE")
+        self._depth = 1
+        try:
+            yield self._conn
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        else:
+            self._conn.execute("COMMIT")
+        finally:
+            self._depth = 0
+
+    @contextmanager
+    def _snapshot(self) -> Iterator[sqlite3.Connection]:
+        # Runs several SELECTs against one consistent view of the database. A deferred BEGIN
+        # takes no write lock, so writers are not held up; inside transaction() it is a no-op.
+        if self._conn.in_transaction:
+            yield self._conn
+            return
+        self._conn.execute("BEGIN")
+        try:
+            yield self._conn
+        finally:
+            self._conn.execute("COMMIT")
+
+    # --- campaigns ---
+
+    def _campaign_id(self, name: str) -> Optional[int]:
+        row = self._conn.execute("SELECT id FROM campaigns WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def _require_campaign(self, name: str) -> int:
+        campaign_id = self._campaign_id(name)
+        if campaign_id is None:
+            raise KeyError(f"No campaign named '{name}' in store")
+        return campaign_id
+
+    def campaigns(self) -> List[str]:
+        """
+        Returns the names of every stored campaign.
+        """
+        return [row[0] for row in self._conn.execute("SELECT name FROM campaigns ORDER BY name")]
+
+    def import_campaign(self, name: str, campaign: Dict[str, Any]) -> None:
+        """
+        Stores a campaign dictionary (current JSON format) under name, replacing any existing one.
+        """
+        _check_type("name", name, str)
+        _check_type("campaign", campaign, dict)
+        for key in _LIST_KEYS:
+            _check_list_of(key, campaign.get(key, []), dict)
+        settings = {key: value for key, value in campaign.items() if key not in _LIST_KEYS}
+        settings[_KEY_ORDER] = list(campaign)
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM campaigns WHERE name = ?", (name,))
+            campaign_id = conn.execute(
+                "INSERT INTO campaigns (name, data) VALUES (?, ?)", (name, _encode(settings))
+            ).lastrowid
+            for position, character in enumerate(campaign.get("characters", [])):
+                self._insert_character(campaign_id, position, character)
+            for position, npc in enumerate(campaign.get("npcs", [])):
+                self._insert_npc(campaign_id, position, npc)
+            self._insert_sessions(campaign_id, 0, campaign.get("sessions", []))
+            conn.executemany(
+                "INSERT INTO briefs (campaign_id, position, name, data) VALUES (?, ?, ?, ?)",
+                [(campaign_id, p, _name(b), _encode(b)) for p, b in enumerate(campaign.get("briefs", []))],
+            )
+        log_event(logger, logging.INFO, "store.imported", "Imported campaign '%(name)s' into store", name=name)
+
+    def export_campaign(self, name: str) -> Dict[str, Any]:
+        """
+        Rebuilds a stored campaign as a dictionary in the current JSON format.
+        Returns:
+            The campaign with the keys it was imported with, in the same order. A list key
+            it lacked is added only if a later update stored items under it.
+        Raises:
+            KeyError: If there is no campaign with this name.
+        """
+        with self._snapshot() as conn:
+            row = conn.execute("SELECT id, data FROM campaigns WHERE name = ?", (name,)).fetchone()
+            if row is None:
+                raise KeyError(f"No campaign named '{name}' in store")
+            campaign_id, settings = row
+            lists = {
+                key: [
+                    persistence.decode_json(data)
+                    for (data,) in conn.execute(
+                        f"SELECT data FROM {key} WHERE campaign_id = ? ORDER BY position", (campaign_id,)
+                    )
+                ]
+                for key in _LIST_KEYS
+            }
+        settings = persistence.decode_json(settings)
+        order = settings.pop(_KEY_ORDER, None)
+        if order is None:  # stored before key order was recorded
+            order = list(settings) + [key for key in _LIST_KEYS if key != "briefs" or lists[key]]
+        order += [key for key in _LIST_KEYS if lists[key] and key not in order]
+        return {key: lists[key] if key in lists else settings[key] for key in order}
+
+    def delete_campaign(self, name: str) -> None:
+        """
+        Removes a campaign and everything stored under it.
+        """
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM campaigns WHERE name = ?", (name,))
+
+    # --- characters ---
+
+    def _insert_character(self, campaign_id: Optional[int], position: int, character: Dict[str, Any]) -> None:
+        character_id = self._conn.execute(
+            "INSERT INTO characters (campaign_id, position, name, data) VALUES (?, ?, ?, ?)",
+            (campaign_id, position, _name(character), _encode(character)),
+        ).lastrowid
+        spent = character.get("karma_spent", {})
+        if isinstance(spent, dict):
+            self._conn.executemany(
+                "INSERT INTO karma_spent (character_id, category, amount) VALUES (?, ?, ?)",
+                [(character_id, str(c), a) for c, a in spent.items() if isinstance(a, int)],
+            )
+
+    def upsert_characters(self, campaign: str, characters: List[Dict[str, Any]]) -> None:
+        """
+        Inserts or replaces campaign characters (matched by name) in one transaction.
+        Characters without a name are appended.
+        """
+        _check_list_of("characters", characters, dict)
+        with self.transaction() as conn:
+            campaign_id = self._require_campaign(campaign)
+            next_position = conn.execute(
+                "SELECT COALESCE(MAX(position) + 1, 0) FROM characters WHERE campaign_id = ?", (campaign_id,)
+            ).fetchone()[0]
+            for character in characters:
+                name = _name(character)
+                row = None
+                if name is not None:
+                    row = conn.execute(
+                        "SELECT id, position FROM characters WHERE campaign_id = ? AND name = ?", (campaign_id, name)
+                    ).fetchone()
+                if row is not None:
+                    conn.execute("DELETE FROM characters WHERE id = ?", (row[0],))
+                    self._insert_character(campaign_id, row[1], character)
+                else:
+                    self._insert_character(campaign_id, next_position, character)
+                    next_position += 1
+
+    def save_character(self, key: str, character: Dict[str, Any]) -> None:
+        """
+        Stores a standalone character (not tied to a campaign) under key.
+        """
+        _check_type("key", key, str)
+        _check_type("character", character, dict)
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM characters WHERE campaign_id IS NULL AND position = 0 AND name = ?", (key,))
+            character_id = conn.execute(
+                "INSERT INTO characters (campaign_id, position, name, data) VALUES (NULL, 0, ?, ?)",
+                (key, _encode(character)),
+            ).lastrowid
+            spent = character.get("karma_spent", {})
+            if isinstance(spent, dict):
+                conn.executemany(
+                    "INSERT INTO karma_spent (character_id, category, amount) VALUES (?, ?, ?)",
+                    [(character_id, str(c), a) for c, a in spent.items() if isinstance(a, int)],
+                )
+
+    def load_character(self, key: str) -> Dict[str, Any]:
+        """
+        Loads a standalone character saved with save_character.
+        Raises:
+            KeyError: If there is no such character.
+        """
+        row = self._conn.execute(
+            "SELECT data FROM characters WHERE campaign_id IS NULL AND name = ?", (key,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(f"No character stored under '{key}'")
+        return persistence.decode_json(row[0])
+
+    def total_karma_spent(self, category: str, campaign: Optional[str] = None) -> int:
+        """
+        Sums karma spent on a category across characters (of one campaign, or all).
+        """
+        if campaign is None:
+            row = self._conn.execute("SELECT COALESCE(SUM(amount), 0) FROM karma_spent WHERE category = ?", (category,))
+        else:
+            row = self._conn.execute(
+                "SELECT COALESCE(SUM(k.amount), 0) FROM karma_spent k JOIN characters c ON c.id = k.character_id "
+                "WHERE k.category = ? AND c.campaign_id = ?",
+                (category, self._require_campaign(campaign)),
+            )
+        return row.fetchone()[0]
+
+    # --- NPCs ---
+
+    def _insert_npc(self, campaign_id: int, position: int, npc: Dict[str, Any]) -> None:
+        npc_id = self._conn.execute(
+            "INSERT INTO npcs (campaign_id, position, name, data) VALUES (?, ?, ?, ?)",
+            (campaign_id, position, _name(npc), _encode(npc)),
+        ).lastrowid
+        tags = npc.get("tags", [])
+        if isinstance(tags, list):
+            self._conn.executemany(
+                "INSERT INTO npc_tags (npc_id, tag) VALUES (?, ?)",
+                [(npc_id, tag) for tag in dict.fromkeys(tags) if isinstance(tag, str)],
+            )
+
+    def add_npcs(self, campaign: str, npcs: List[Dict[str, Any]]) -> None:
+        """
+        Appends NPCs to a campaign in one transaction.
+        """
+        _check_list_of("npcs", npcs, dict)
+        with self.transaction() as conn:
+            campaign_id = self._require_campaign(campaign)
+            position = conn.execute(
+                "SELECT COALESCE(MAX(position) + 1, 0) FROM npcs WHERE campaign_id = ?", (campaign_id,)
+            ).fetchone()[0]
+            for offset, npc in enumerate(npcs):
+                self._insert_npc(campaign_id, position + offset, npc)
+
+    def get_npc(self, campaign: str, name: str) -> Dict[str, Any]:
+        """
+        Returns the first NPC with this name, or an empty dict.
+        """
+        row = self._conn.execute(
+            "SELECT data FROM npcs WHERE campaign_id = ? AND name = ? ORDER BY position LIMIT 1",
+            (self._require_campaign(campaign), name),
+        ).fetchone()
+        return persistence.decode_json(row[0]) if row else {}
+
+    def npcs_with_tag(self, campaign: str, tag: str) -> List[Dict[str, Any]]:
+        """
+        Returns the campaign's NPCs carrying a tag, in campaign order.
+        """
+        return [
+            persistence.decode_json(data)
+            for (data,) in self._conn.execute(
+                "SELECT n.data FROM npc_tags t JOIN npcs n ON n.id = t.npc_id "
+                "WHERE t.tag = ? AND n.campaign_id = ? ORDER BY n.position",
+                (tag, self._require_campaign(campaign)),
+            )
+        ]
+
+    # --- sessions ---
+
+    def _insert_sessions(self, campaign_id: int, first_position: int, sessions: List[Dict[str, Any]]) -> None:
+        for offset, session in enumerate(sessions):
+            number = session.get("session")
+            session_id = self._conn.execute(
+                "INSERT INTO sessions (campaign_id, position, number, data) VALUES (?, ?, ?, ?)",
+                (campaign_id, first_position + offset, number if isinstance(number, int) else None, _encode(session)),
+            ).lastrowid
+            names = session.get("npcs", [])
+            if isinstance(names, list):
+                self._conn.executemany(
+                    "INSERT INTO session_npcs (session_id, npc_name) VALUES (?, ?)",
+                    [(session_id, n) for n in dict.fromkeys(names) if isinstance(n, str)],
+                )
+
+    def append_sessions(self, campaign: str, sessions: List[Dict[str, Any]]) -> None:
+        """
+        Appends session logs (as built by session_log) to a campaign in one transaction.
+        """
+        _check_list_of("sessions", sessions, dict)
+        with self.transaction() as conn:
+            campaign_id = self._require_campaign(campaign)
+            position = conn.execute(
+                "SELECT COALESCE(MAX(position) + 1, 0) FROM sessions WHERE campaign_id = ?", (campaign_id,)
+            ).fetchone()[0]
+            self._insert_sessions(campaign_id, position, sessions)
+
+    def get_session(self, campaign: str, number: int) -> Dict[str, Any]:
+        """
+        Returns the session log with this session number, or an empty dict.
+        """
+        row = self._conn.execute(
+            "SELECT data FROM sessions WHERE campaign_id = ? AND number = ? ORDER BY position LIMIT 1",
+            (self._require_campaign(campaign), number),
+        ).fetchone()
+        return persistence.decode_json(row[0]) if row else {}
+
+    def iter_sessions(self, campaign: str) -> Iterator[Dict[str, Any]]:
+        """
+        Streams a campaign's session logs in order, decoding one row at a time.
+        """
+        cursor = self._conn.execute(
+            "SELECT data FROM sessions WHERE campaign_id = ? ORDER BY position", (self._require_campaign(campaign),)
+        )
+        return (persistence.decode_json(data) for (data,) in cursor)
+
+    def sessions_with_npc(self, campaign: str, npc_name: str) -> List[Dict[str, Any]]:
+        """
+        Returns every session log that lists an NPC, in campaign order.
+        """
+        return [
+            persistence.decode_json(data)
+            for (data,) in self._conn.execute(
+                "SELECT s.data FROM session_npcs sn JOIN sessions s ON s.id = sn.session_id "
+                "WHERE sn.npc_name = ? AND s.campaign_id = ? ORDER BY s.position",
+                (npc_name, self._require_campaign(campaign)),
+            )
+        ]
+
+    # --- briefs ---
+
+    def get_brief(self, campaign: str, name: str) -> Dict[str, Any]:
+        """
+        Returns the contract brief with this name, or an empty dict.
+        """
+        row = self._conn.execute(
+            "SELECT data FROM briefs WHERE campaign_id = ? AND name = ? ORDER BY position LIMIT 1",
+            (self._require_campaign(campaign), name),
+        ).fetchone()
+        return persistence.decode_json(row[0]) if row else {}
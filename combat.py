@@ -0,0 +1,178 @@
+import logging
+from typing import Any, Dict, List, Optional
+
+from anarchy.character import _ammo_after, _damaged, _overflow_status
+from anarchy.dice import _glitch_flags, _reroll_misses, _resolve_rng, roll_cue_many
+from eventlog import log_event
+from rng import RNGProvider
+from validation import _check_list_of, _check_type
+
+logger = logging.getLogger(__name__)
+
+# ---------- Batched Combat Round Resolver ----------
+
+_COMBATANT_DEFAULTS: Dict[str, Any] = {
+    "condition_monitor": 10,
+    "defense_pool": 6,
+    "magazine_size": 0,
+    "edge": 0,
+}
+_ATTACK_DEFAULTS: Dict[str, Any] = {
+    "shots": 1,
+    "edge": False,
+    "reroll": False,
+}
+_ATTACK_REQUIRED = ("attacker", "defender", "attack_pool", "damage")
+
+
+def _normalize_combatants(combatants: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    _check_type("combatants", combatants, dict)
+    normalized = {}
+    for name, combatant in combatants.items():
+        _check_type(f"combatants[{name!r}]", combatant, dict)
+        merged = {**_COMBATANT_DEFAULTS, **combatant}
+        merged.setdefault("ammo", merged["magazine_size"])
+        for key in ("condition_monitor", "defense_pool", "magazine_size", "edge", "ammo"):
+            _check_type(f"{name}.{key}", merged[key], int)
+        normalized[name] = merged
+    return normalized
+
+
+def _normalize_attacks(attacks: List[Dict[str, Any]], combatants: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    _check_list_of("attacks", attacks, dict)
+    normalized = []
+    for index, attack in enumerate(attacks):
+        missing = [key for key in _ATTACK_REQUIRED if key not in attack]
+        if missing:
+            raise ValueError(f"Attack {index} is missing {', '.join(repr(k) for k in missing)}")
+        merged = {**_ATTACK_DEFAULTS, **attack}
+        for role in ("attacker", "defender"):
+            if merged[role] not in combatants:
+                raise KeyError(f"Attack {index} names unknown {role} '{merged[role]}'")
+        for key in ("attack_pool", "damage", "shots"):
+            _check_type(f"attacks[{index}].{key}", merged[key], int)
+        for key in ("edge", "reroll"):
+            _check_type(f"attacks[{index}].{key}", merged[key], bool)
+        normalized.append(merged)
+    return normalized
+
+
+def resolve_combat_round(
+    combatants: Dict[str, Dict[str, Any]],
+    attacks: List[Dict[str, Any]],
+    rng: Optional[RNGProvider] = None,
+) -> Dict[str, Any]:
+    """
+    Resolves every attack of a combat round in one pass.
+    Use this for squad-vs-squad fights instead of roll_cue/resolve_opposed_test per attack.
+    Args:
+        combatants: Name -> combatant state, with optional 'condition_monitor' (10),
+            'defense_pool' (6), 'magazine_size' (0 for melee), 'ammo' (full magazine),
+            and 'edge' (points left for rerolls, 0).
+        attacks: The round's attacks, in order, each with 'attacker', 'defender',
+            'attack_pool', 'damage', and optional 'shots' (1), 'edge' (True for 4+ hits)
+            and 'reroll' (spend an Edge point to reroll failures, as reroll_failures does).
+        rng: Optional RNG provider (e.g., the session's); defaults to the module provider.
+    Returns:
+        Dict with:
+        - 'exchanges': one row per attack with attack_hits, defense_hits, net_hits,
+          glitch, critical_glitch, rerolled, damage, and skipped ('reload' or None).
+        - 'combatants': name -> condition_monitor, damage_taken, overflow, status,
+          ammo_left, needs_reload, edge_left.
+    Raises:
+        KeyError: If an attack names a combatant that is not listed.
+        ValueError: If an attack is missing a required key.
+    Notes:
+        Attacks resolve simultaneously: all attack pools are drawn in one roll_cue_many call
+        per hit threshold, all defense pools in one more, and all Edge rerolls in one draw.
+        The rules are the single-call mechanics' own (uninstrumented) helpers: glitches as in
+        detect_glitch, rerolls as in reroll_failures, damage and status as in
+        apply_damage_to_condition_monitor and handle_condition_overflow, and ammo as in
+        track_ammo. The attacker must beat the defender's hits (resolve_opposed_test), and
+        damage is damage + net hits. A firearm with an empty
+        magazine reloads instead of attacking.
+    """
+    combatants = _normalize_combatants(combatants)
+    attacks = _normalize_attacks(attacks, combatants)
+    rng = _resolve_rng(rng)
+
+    # Ammo is spent in attack order, so an attacker firing twice can run dry mid-round.
+    ammo = {name: c["ammo"] for name, c in combatants.items()}
+    edge_left = {name: c["edge"] for name, c in combatants.items()}
+    skipped: List[Optional[str]] = []
+    for attack in attacks:
+        attacker = attack["attacker"]
+        magazine = combatants[attacker]["magazine_size"]
+        if magazine > 0:
+            if ammo[attacker] <= 0:
+                ammo[attacker] = magazine
+                skipped.append("reload")
+                continue
+            ammo[attacker] = _ammo_after(ammo[attacker], attack["shots"])[0]
+        skipped.append(None)
+    active = [i for i, reason in enumerate(skipped) if reason is None]
+
+    # One draw per hit threshold for attacks, one for defenses.
+    attack_results: Dict[int, Any] = {}
+    for edge in (False, True):
+        group = [i for i in active if attacks[i]["edge"] is edge]
+        if group:
+            rolled = roll_cue_many([attacks[i]["attack_pool"] for i in group], edge=edge, rng=rng)
+            attack_results.update(zip(group, rolled))
+    defense_pools = [combatants[attacks[i]["defender"]]["defense_pool"] for i in active]
+    defense_hits = dict(zip(active, (r.hits for r in roll_cue_many(defense_pools, keep_rolls=False, rng=rng))))
+
+    # Edge rerolls: every failed die of every rerolling attack comes from one draw.
+    rerolled = set()
+    for i in active:
+        attacker = attacks[i]["attacker"]
+        if attacks[i]["reroll"] and edge_left[attacker] > 0:
+            edge_left[attacker] -= 1
+            rerolled.add(i)
+    if rerolled:
+        thresholds = {i: 4 if attacks[i]["edge"] else 5 for i in rerolled}
+        failures = sum(1 for i in rerolled for r in attack_results[i].rolls if r < thresholds[i])
+        faces = iter(rng.d6(failures))
+        for i in sorted(rerolled):
+            hits, rolls = _reroll_misses(attack_results[i].rolls, thresholds[i], faces)
+            attack_results[i] = attack_results[i]._replace(hits=hits, ones=rolls.count(1), rolls=rolls)
+
+    exchanges = []
+    damage_taken = {name: 0 for name in combatants}
+    for i, attack in enumerate(attacks):
+        row = {
+            "attacker": attack["attacker"], "defender": attack["defender"],
+            "attack_hits": 0, "defense_hits": 0, "net_hits": 0,
+            "glitch": False, "critical_glitch": False,
+            "rerolled": i in rerolled, "damage": 0, "skipped": skipped[i],
+        }
+        if skipped[i] is None:
+            result = attack_results[i]
+            glitch, critical = _glitch_flags(result.ones, max(0, attack["attack_pool"]), result.hits)
+            net = result.hits - defense_hits[i]
+            damage = attack["damage"] + net if net > 0 else 0
+            row.update(
+                attack_hits=result.hits, defense_hits=defense_hits[i], net_hits=net,
+                glitch=glitch, critical_glitch=critical, damage=damage,
+            )
+            damage_taken[attack["defender"]] += damage
+        exchanges.append(row)
+
+    table = {}
+    for name, combatant in combatants.items():
+        before = combatant["condition_monitor"]
+        taken = damage_taken[name]
+        monitor = _damaged(before, taken)
+        overflow = max(0, taken - before)
+        table[name] = {
+            "condition_monitor": monitor, "damage_taken": taken, "overflow": overflow,
+            "status": _overflow_status(monitor, overflow), "ammo_left": ammo[name],
+            "needs_reload": combatant["magazine_size"] > 0 and _ammo_after(ammo[name], 0)[1],
+            "edge_left": edge_left[name],
+        }
+    log_event(
+        logger, logging.INFO, "combat.round", "Resolved %(attacks)s attacks (%(hits)s hit, %(down)s down)",
+        attacks=len(attacks), hits=sum(1 for row in exchanges if row["damage"] > 0),
+        down=sum(1 for row in table.values() if row["status"] != "ok"),
+    )
+    return {"exchanges": exchanges, "combatants": table}
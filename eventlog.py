@@ -0,0 +1,142 @@
+import atexit
+import copy
+import datetime
+import json
+import logging
+import sys
+from typing import Any, Dict, Optional, TextIO
+
+# ---------- Structured Event Logging ----------
+
+_active_listener: Optional["QueueListener"] = None
+
+
+def log_event(logger: logging.Logger, level: int, event: str, message: str = "", **fields: Any) -> None:
+    """
+    Logs a structured event without building any string unless the level is enabled.
+    Use this instead of f-string logging in mechanics and other hot paths.
+    Args:
+        logger: The logger to emit on.
+        level: The logging level (e.g., logging.INFO).
+        event: Stable, dotted event name (e.g., 'dice.roll').
+        message: %-style template formatted lazily from fields, e.g. 'Rolled %(dice_pool)s dice'.
+        **fields: Structured values attached to the record (as record.event_fields).
+    Returns:
+        None
+    Notes:
+        The level check happens before any formatting, so disabled events cost one method call.
+        Fields are passed by reference; only enabled handlers ever format them.
+    """
+    if not logger.isEnabledFor(level):
+        return
+    extra = {"event": event, "event_fields": fields}
+    if fields:
+        logger.log(level, message or event, fields, extra=extra, stacklevel=2)
+    else:
+        logger.log(level, message or event, extra=extra, stacklevel=2)
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    Formats each record as one JSON object per line.
+    Keys: 'ts' (ISO 8601 UTC), 'level', 'logger', 'event', 'message', plus any event fields.
+    Values that are not JSON-serializable are written with repr().
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {
+            "ts": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc)
+            .isoformat()
+            .replace("+00:00", "Z"),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": getattr(record, "event", None),
+            "message": record.getMessage(),
+        }
+        payload.update(getattr(record, "event_fields", None) or {})
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=repr)
+
+
+def configure_logging(
+    level: int = logging.INFO,
+    json_lines: bool = False,
+    stream: Optional[TextIO] = None,
+    filename: Optional[str] = None,
+    use_queue: bool = True,
+    logger_name: Optional[str] = None,
+) -> Optional["QueueListener"]:
+    """
+    Installs the logging sink for mechanics events.
+    Use this once at process start-up (server, worker, or script entry point).
+    Args:
+        level: Minimum level to emit.
+        json_lines: If True, writes JSON lines via JsonLinesFormatter; otherwise plain text.
+        stream: Output stream (default sys.stderr). Ignored when filename is given.
+        filename: Optional file to append to instead of a stream.
+        use_queue: If True, callers only snapshot and enqueue records and a background
+            QueueListener thread does the formatting and I/O.
+        logger_name: Logger to configure (default: the root logger).
+    Returns:
+        The started QueueListener when use_queue is True, otherwise None.
+    Notes:
+        Replaces the existing handlers on the target logger and stops any listener started
+        by a previous call. The listener is stopped (and flushed) automatically at exit.
+        The stock QueueHandler.prepare formats the message on the calling thread; the queue
+        handler installed here only copies the record and its fields dict (a shallow copy:
+        values changed in place after the call still show up in the output).
+    """
+    global _active_listener
+    shutdown_logging()
+    if filename is not None:
+        handler: logging.Handler = logging.FileHandler(filename, encoding="utf-8")
+    else:
+        handler = logging.StreamHandler(stream or sys.stderr)
+    if json_lines:
+        handler.setFormatter(JsonLinesFormatter())
+    else:
+        handler.setFormatter(logging.Formatter("%(levelname)s:%(name)s:%(message)s"))
+
+    target = logging.getLogger(logger_name)
+    for existing in list(target.handlers):
+        target.removeHandler(existing)
+    target.setLevel(level)
+    if not use_queue:
+        target.addHandler(handler)
+        return None
+    # Imported here so that importing eventlog (which every module does) stays cheap.
+    import queue
+    from logging.handlers import QueueHandler, QueueListener
+
+    class _SnapshotQueueHandler(QueueHandler):
+        def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+            # Leaves msg/args unformatted for the listener thread.
+            record = copy.copy(record)
+            if isinstance(record.args, dict):
+                record.args = dict(record.args)
+            fields = getattr(record, "event_fields", None)
+            if isinstance(fields, dict):
+                record.event_fields = dict(fields)
+            return record
+
+    records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    target.addHandler(_SnapshotQueueHandler(records))
+    _active_listener = QueueListener(records, handler, respect_handler_level=True)
+    _active_listener.start()
+    return _active_listener
+
+
+def shutdown_logging() -> None:
+    """
+    Stops the background listener started by configure_logging, flushing queued records.
+    """
+    global _active_listener
+    if _active_listener is not None:
+        _active_listener.stop()
+        for handler in _active_listener.handlers:
+            handler.close()
+        _active_listener = None
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,258 @@
+import heapq
+import itertools
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from anarchy.dice import _resolve_rng
+from eventlog import log_event
+from rng import RNGProvider
+from validation import _check_list_of, _check_type
+
+logger = logging.getLogger(__name__)
+
+# ---------- Initiative Tracker ----------
+
+# Heap entry: (pass, -score, -attribute, order added, version, name). Entries are never
+# removed in place; a changed or removed combatant gets a new version and stale entries are
+# skipped when they reach the top (lazy deletion), which keeps every update O(log n).
+# Versions come from one counter per tracker, so a combatant removed and re-added under the
+# same name can never match an entry left over from before.
+_Entry = Tuple[int, int, int, int, int, str]
+
+
+class _Combatant:
+    __slots__ = ("name", "attribute", "skill", "bonus", "score", "order", "version", "queued_pass")
+
+    def __init__(self, name: str, attribute: int, skill: int, bonus: int, order: int) -> None:
+        self.name = name
+        self.attribute = attribute
+        self.skill = skill
+        self.bonus = bonus
+        self.score = 0
+        self.order = order
+        self.version = 0
+        self.queued_pass: Optional[int] = None
+
+
+class InitiativeTracker:
+    """
+    Turn scheduler for combat: who acts next, across initiative passes, in O(log n).
+    Use this instead of sorting calculate_initiative results by hand every turn.
+    Args:
+        pass_cost: Initiative spent per pass; a combatant acts again in pass k+1 while
+            score - pass_cost * k > 0 (default 10).
+        rng: Optional RNG provider for initiative rolls; defaults to the module provider.
+    Notes:
+        Scores use the calculate_initiative formula (attribute + skill + bonus + 1d6).
+        Within a pass, higher scores act first; ties go to the higher attribute, then to
+        whoever was added first. start_round() rolls everyone with one batched draw.
+    """
+
+    def __init__(self, pass_cost: int = 10, rng: Optional[RNGProvider] = None) -> None:
+        _check_type("pass_cost", pass_cost, int)
+        if pass_cost <= 0:
+            raise ValueError("pass_cost must be positive")
+        self.pass_cost = pass_cost
+        self.rng = rng
+        self.round = 0
+        self.current_pass = 1
+        self._combatants: Dict[str, _Combatant] = {}
+        self._heap: List[_Entry] = []
+        self._added = 0
+        self._versions = itertools.count(1)
+
+    def __len__(self) -> int:
+        return len(self._combatants)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._combatants
+
+    def score(self, name: str) -> int:
+        """
+        Returns a combatant's current initiative score.
+        """
+        return self._combatants[name].score
+
+    def _acts_in(self, combatant: _Combatant, pass_number: int) -> bool:
+        return combatant.score - self.pass_cost * (pass_number - 1) > 0
+
+    def _queue(self, combatant: _Combatant, pass_number: int) -> None:
+        combatant.version = next(self._versions)
+        if self.round and self._acts_in(combatant, pass_number):
+            combatant.queued_pass = pass_number
+            heapq.heappush(self._heap, (
+                pass_number, -combatant.score, -combatant.attribute, combatant.order, combatant.version, combatant.name,
+            ))
+        else:
+            combatant.queued_pass = None
+
+    def _roll(self, combatants: List[_Combatant]) -> None:
+        dice = _resolve_rng(self.rng).d6(len(combatants))
+        for combatant, die in zip(combatants, dice):
+            combatant.score = combatant.attribute + combatant.skill + combatant.bonus + int(die)
+
+    # --- roster ---
+
+    def add(
+        self, name: str, attribute: int, skill: int, bonus: int = 0, initiative: Optional[int] = None
+    ) -> int:
+        """
+        Adds a combatant and returns their initiative score.
+        Args:
+            name: Unique combatant name.
+            attribute, skill, bonus: As for calculate_initiative; attribute also breaks ties.
+            initiative: A fixed score instead of rolling.
+        Notes:
+            Added mid-round, the combatant joins the current pass if their score allows.
+        Raises:
+            ValueError: If a combatant with this name is already tracked.
+        """
+        return self.add_many([
+            {"name": name, "attribute": attribute, "skill": skill, "bonus": bonus, "initiative": initiative}
+        ])[name]
+
+    def add_many(self, combatants: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Adds several combatants, rolling all their initiatives in one batched draw.
+        Args:
+            combatants: Dicts with 'name', 'attribute', 'skill', and optional 'bonus' and
+                'initiative' (fixed score).
+        Returns:
+            Name -> initiative score for the added combatants.
+        Raises:
+            TypeError / ValueError: If any spec is malformed or names a tracked combatant;
+                nothing is added and no dice are rolled.
+        """
+        _check_list_of("combatants", combatants, dict)
+        # Every spec is checked before the tracker, its order counter or the RNG is touched.
+        names = set()
+        for spec in combatants:
+            name = spec.get("name")
+            _check_type("name", name, str)
+            if name in self._combatants or name in names:
+                raise ValueError(f"Combatant '{name}' is already in initiative")
+            names.add(name)
+            for key in ("attribute", "skill"):
+                _check_type(f"{name}.{key}", spec.get(key), int)
+            _check_type(f"{name}.bonus", spec.get("bonus", 0) or 0, int)
+            if spec.get("initiative") is not None:
+                _check_type(f"{name}.initiative", spec["initiative"], int)
+        added = []
+        for spec in combatants:
+            self._added += 1
+            bonus = spec.get("bonus", 0) or 0
+            added.append(_Combatant(spec["name"], spec["attribute"], spec["skill"], bonus, self._added))
+        self._roll([c for c, spec in zip(added, combatants) if spec.get("initiative") is None])
+        for combatant, spec in zip(added, combatants):
+            if spec.get("initiative") is not None:
+                combatant.score = spec["initiative"]
+            self._combatants[combatant.name] = combatant
+            self._queue(combatant, self.current_pass)
+        return {c.name: c.score for c in added}
+
+    def remove(self, name: str) -> None:
+        """
+        Removes a combatant (e.g., taken out or fled). Unknown names are ignored.
+        """
+        combatant = self._combatants.pop(name, None)
+        if combatant is not None:
+            combatant.version = next(self._versions)
+
+    # --- changes ---
+
+    def adjust(self, name: str, delta: int) -> int:
+        """
+        Changes a combatant's initiative by delta (negative for damage, positive for Edge)
+        and returns the new score. Their place in the current pass updates immediately.
+        Raises:
+            KeyError: If the combatant is not tracked.
+        """
+        _check_type("delta", delta, int)
+        return self.set_initiative(name, self._combatants[name].score + delta)
+
+    def set_initiative(self, name: str, score: int) -> int:
+        """
+        Sets a combatant's initiative score and returns it.
+        Raises:
+            KeyError: If the combatant is not tracked.
+        """
+        _check_type("score", score, int)
+        combatant = self._combatants[name]
+        combatant.score = score
+        if combatant.queued_pass is not None:
+            self._queue(combatant, combatant.queued_pass)
+        log_event(
+            logger, logging.DEBUG, "initiative.changed", "Initiative of %(name)s is now %(score)s", name=name, score=score,
+        )
+        return score
+
+    # --- turn order ---
+
+    def start_round(self, reroll: bool = True) -> Dict[str, int]:
+        """
+        Starts a new combat round at pass 1.
+        Args:
+            reroll: If True (default), rolls every combatant's initiative in one batched draw;
+                otherwise keeps the current scores.
+        Returns:
+            Name -> initiative score for the round.
+        """
+        combatants = list(self._combatants.values())
+        if reroll:
+            self._roll(combatants)
+        self.round += 1
+        self.current_pass = 1
+        self._heap = []
+        for combatant in combatants:
+            combatant.version = next(self._versions)
+            combatant.queued_pass = 1 if self._acts_in(combatant, 1) else None
+            if combatant.queued_pass is not None:
+                self._heap.append((1, -combatant.score, -combatant.attribute, combatant.order, combatant.version, combatant.name))
+        heapq.heapify(self._heap)
+        log_event(
+            logger, logging.INFO, "initiative.round", "Round %(round)s initiative: %(scores)s",
+            round=self.round, scores={c.name: c.score for c in combatants},
+        )
+        return {c.name: c.score for c in combatants}
+
+    def _top(self) -> Optional[_Entry]:
+        heap = self._heap
+        while heap:
+            entry = heap[0]
+            combatant = self._combatants.get(entry[5])
+            if combatant is not None and combatant.version == entry[4]:
+                return entry
+            heapq.heappop(heap)
+        return None
+
+    def next_actor(self) -> Optional[str]:
+        """
+        Returns the combatant who acts next and queues their next pass, or None when the
+        round is over (call start_round for the next one).
+        """
+        entry = self._top()
+        if entry is None:
+            return None
+        heapq.heappop(self._heap)
+        pass_number, name = entry[0], entry[5]
+        self.current_pass = pass_number
+        self._queue(self._combatants[name], pass_number + 1)
+        return name
+
+    def peek(self) -> Optional[str]:
+        """
+        Returns who acts next without advancing, or None when the round is over.
+        """
+        entry = self._top()
+        return entry[5] if entry is not None else None
+
+    def order(self) -> List[Tuple[str, int, int]]:
+        """
+        Returns the remaining turns of this round's queued passes as (name, score, pass),
+        in acting order. O(n log n); meant for display.
+        """
+        live = sorted(
+            entry for entry in self._heap
+            if entry[5] in self._combatants and self._combatants[entry[5]].version == entry[4]
+        )
+        return [(entry[5], -entry[1], entry[0]) for entry in live]
@@ -0,0 +1,266 @@
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+import persistence
+from anarchy.campaign import campaign_create
+from anarchy.character import award_plot_point, character_spend_karma, spend_plot_point
+from anarchy.persistence import get_current_timestamp
+from eventlog import log_event
+from validation import _check_type
+
+logger = logging.getLogger(__name__)
+
+# ---------- Append-Only Campaign Journal ----------
+
+SESSION_LOGGED = "session_logged"
+KARMA_SPENT = "karma_spent"
+PLOT_POINTS_SET = "plot_points_set"
+PARTY_UPDATED = "party_updated"
+
+# Key in the snapshot recording the last journal event it already includes.
+_SNAPSHOT_SEQ_KEY = "_journal_seq"
+
+
+def _find_character(campaign: Dict[str, Any], name: str) -> int:
+    """
+    Returns the index of the character with this name in campaign['characters'].
+    Raises:
+        KeyError: If there is no such character.
+    """
+    for index, character in enumerate(campaign.get("characters", [])):
+        if character.get("name") == name:
+            return index
+    raise KeyError(f"No character named '{name}' in campaign")
+
+
+def _apply_event(campaign: Dict[str, Any], event: Dict[str, Any]) -> None:
+    """
+    Applies one journal event to a campaign dictionary in place.
+    """
+    kind, data = event["type"], event["data"]
+    if kind == SESSION_LOGGED:
+        campaign.setdefault("sessions", []).append(data)
+    elif kind == KARMA_SPENT:
+        index = _find_character(campaign, data["character"])
+        campaign["characters"][index] = character_spend_karma(
+            campaign["characters"][index], data["category"], data["amount"]
+        )
+    elif kind == PLOT_POINTS_SET:
+        index = _find_character(campaign, data["character"])
+        campaign["characters"][index] = {**campaign["characters"][index], "plot_points": data["points"]}
+    elif kind == PARTY_UPDATED:
+        from party import apply_changes
+
+        campaign["characters"] = apply_changes(campaign.get("characters", []), data["changes"])
+    else:
+        raise ValueError(f"Unknown journal event type '{kind}'")
+
+
+class CampaignJournal:
+    """
+    Campaign state kept as a snapshot file plus an append-only JSON-lines journal.
+    Use this instead of save_campaign after every change: each change appends one line,
+    so save cost is proportional to the change, not to the size of the campaign.
+    Args:
+        filepath: Path of the campaign snapshot (a normal campaign JSON file).
+        journal_path: Path of the journal (default: filepath + '.journal').
+        compact_every: Fold the journal into a new snapshot after this many appends (0 disables).
+        fsync: If True, fsyncs the journal after every append for durability.
+    Notes:
+        Loading reads the snapshot and replays journal events newer than it. The snapshot
+        records the last event it includes, so a crash during compaction never applies an
+        event twice, and a torn final journal line (crash mid-append) is truncated away.
+        While a journal is in use, write the campaign through it (or compact()) rather
+        than with save_campaign.
+    """
+
+    def __init__(
+        self,
+        filepath: str,
+        journal_path: Optional[str] = None,
+        compact_every: int = 1000,
+        fsync: bool = True,
+    ) -> None:
+        _check_type("filepath", filepath, str)
+        _check_type("compact_every", compact_every, int)
+        self.filepath = filepath
+        self.journal_path = journal_path or f"{filepath}.journal"
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self._campaign: Optional[Dict[str, Any]] = None
+        self._seq = 0
+        self._pending = 0
+
+    @property
+    def campaign(self) -> Dict[str, Any]:
+        """
+        The current campaign state (snapshot plus journal), loaded on first access.
+        """
+        if self._campaign is None:
+            self._campaign = self._load()
+        return self._campaign
+
+    def _read_journal(self) -> List[Dict[str, Any]]:
+        try:
+            with open(self.journal_path, "rb") as f:
+                raw = f.read()
+        except FileNotFoundError:
+            return []
+        events = []
+        start = 0
+        while start < len(raw):
+            newline = raw.find(b"\n", start)
+            end = len(raw) if newline < 0 else newline + 1
+            line = raw[start:end]
+            if line.strip():
+                try:
+                    events.append(json.loads(line))
+                except json.JSONDecodeError:
+                    if end < len(raw):
+                        raise
+                    # Torn last line (crash mid-append): cut it off so the next append starts
+                    # on a fresh line instead of being glued onto it.
+                    log_event(
+                        logger, logging.WARNING, "journal.torn_line",
+                        "Truncating incomplete last line of %(journal)s", journal=self.journal_path,
+                    )
+                    self._repair(start, b"")
+                    break
+                if newline < 0:
+                    self._repair(end, b"\n")  # complete event, but its newline was never written
+            start = end
+        return events
+
+    def _repair(self, size: int, suffix: bytes) -> None:
+        # Truncates the journal to size bytes, then writes suffix.
+        with open(self.journal_path, "r+b") as f:
+            f.truncate(size)
+            f.seek(size)
+            f.write(suffix)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            campaign = persistence.read_json(self.filepath)
+        except FileNotFoundError:
+            campaign = campaign_create({})
+        snapshot_seq = campaign.pop(_SNAPSHOT_SEQ_KEY, 0)
+        self._seq = snapshot_seq
+        replayed = 0
+        for event in self._read_journal():
+            if event["seq"] <= snapshot_seq:
+                continue
+            _apply_event(campaign, event)
+            self._seq = event["seq"]
+            replayed += 1
+        self._pending = replayed
+        log_event(
+            logger, logging.INFO, "journal.loaded",
+            "Loaded %(filepath)s and replayed %(replayed)s journal events", filepath=self.filepath, replayed=replayed,
+        )
+        return campaign
+
+    def append(self, event_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Applies an event to the in-memory campaign and appends it to the journal.
+        Args:
+            event_type: One of SESSION_LOGGED, KARMA_SPENT, PLOT_POINTS_SET, or PARTY_UPDATED.
+            data: The event payload.
+        Returns:
+            The journal entry that was written (a compact diff of the change).
+        Raises:
+            KeyError: If the event names a character that is not in the campaign.
+            ValueError: If event_type is unknown.
+        """
+        campaign = self.campaign
+        event = {"seq": self._seq + 1, "ts": get_current_timestamp(), "type": event_type, "data": data}
+        _apply_event(campaign, event)
+        line = json.dumps(event, ensure_ascii=False, separators=(",", ":")) + "\n"
+        try:
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write(line)
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+        except OSError:
+            self._campaign = None  # memory is ahead of disk; reload on next access
+            raise
+        self._seq = event["seq"]
+        self._pending += 1
+        if self.compact_every and self._pending >= self.compact_every:
+            self.compact()
+        return event
+
+    def log_session(self, session: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Appends a session log (as built by session_log) to the campaign.
+        """
+        _check_type("session", session, dict)
+        return self.append(SESSION_LOGGED, session)
+
+    def record_karma_spend(self, character_name: str, category: str, amount: int) -> Dict[str, Any]:
+        """
+        Records karma spent by a campaign character (see character_spend_karma).
+        """
+        _check_type("character_name", character_name, str)
+        _check_type("category", category, str)
+        _check_type("amount", amount, int)
+        return self.append(KARMA_SPENT, {"character": character_name, "category": category, "amount": amount})
+
+    def set_plot_points(self, character_name: str, points: int) -> Dict[str, Any]:
+        """
+        Records a character's new plot point total.
+        """
+        _check_type("character_name", character_name, str)
+        _check_type("points", points, int)
+        return self.append(PLOT_POINTS_SET, {"character": character_name, "points": points})
+
+    def award_plot_point(self, character_name: str) -> Dict[str, Any]:
+        """
+        Awards a plot point to a character (see award_plot_point) and journals the new total.
+        """
+        current = self.campaign["characters"][_find_character(self.campaign, character_name)].get("plot_points", 0)
+        return self.set_plot_points(character_name, award_plot_point(current))
+
+    def spend_plot_point(self, character_name: str) -> Dict[str, Any]:
+        """
+        Spends a character's plot point (see spend_plot_point) and journals the new total.
+        """
+        current = self.campaign["characters"][_find_character(self.campaign, character_name)].get("plot_points", 0)
+        return self.set_plot_points(character_name, spend_plot_point(current))
+
+    def apply_party_operations(self, operations: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Applies a batch of party operations (see party.apply_party_operations) and journals
+        only the resulting diff, as one event.
+        Returns:
+            The journal entry; its data['changes'] is the diff. A batch that changes nothing
+            is not journaled and returns an entry with empty changes and no 'seq'.
+        Raises:
+            ValueError: If karma runs short (nothing is applied or journaled).
+        """
+        from party import apply_party_operations
+
+        result = apply_party_operations(self.campaign.get("characters", []), operations)
+        if not result["changes"]:
+            return {"type": PARTY_UPDATED, "data": {"changes": {}}}
+        return self.append(PARTY_UPDATED, {"changes": result["changes"]})
+
+    def compact(self) -> None:
+        """
+        Writes the current state as a new snapshot and empties the journal.
+        Notes:
+            The snapshot is written atomically before the journal is cleared; if the process
+            dies in between, the next load skips the events the snapshot already contains.
+        """
+        campaign = self.campaign
+        persistence.write_json({**campaign, _SNAPSHOT_SEQ_KEY: self._seq}, self.filepath)
+        persistence.atomic_write_bytes(b"", self.journal_path)
+        log_event(
+            logger, logging.INFO, "journal.compacted",
+            "Compacted %(pending)s journal events into %(filepath)s", pending=self._pending, filepath=self.filepath,
+        )
+        self._pending = 0
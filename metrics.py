@@ -0,0 +1,438 @@
+import functools
+import inspect
+import io
+import logging
+import operator
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from eventlog import log_event
+
+logger = logging.getLogger(__name__)
+
+# ---------- Hot-Path Instrumentation ----------
+#
+# @instrumented wraps every public anarchy function. While metrics are disabled (the
+# default) the wrapper does one global flag check and calls through. Enabled, it records
+# call and error counts, a latency histogram and, where the function has one, an argument
+# size histogram (pool size, list length). Export with export_prometheus(),
+# write_prometheus() or start_http_server(); capture profiles with start_profile() and
+# start_memory_trace().
+
+_enabled = False
+
+_SUB_BUCKET_BITS = 4  # 16 linear sub-buckets per power of two: values within ~6%
+_SUB_BUCKETS = 1 << _SUB_BUCKET_BITS
+
+# Prometheus bucket bounds used on export (the HDR buckets are finer).
+LATENCY_BOUNDS = [float(f"{scale}e{exponent}") for exponent in range(-6, 1) for scale in (1, 2.5, 5)] + [10.0]
+SIZE_BOUNDS = [1, 10, 100, 1000, 10000, 100000, 1000000]
+
+
+def enable(enabled: bool = True) -> None:
+    """
+    Turns metric recording on or off for the whole process.
+    """
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+# ---------- HDR-Style Histogram ----------
+
+
+def _bucket_range(index: int) -> Tuple[int, int]:
+    """
+    Returns the [low, high) values counted by a bucket.
+    """
+    if index < _SUB_BUCKETS:
+        return index, index + 1
+    shift = (index >> _SUB_BUCKET_BITS) - 1
+    mantissa = (index & (_SUB_BUCKETS - 1)) + _SUB_BUCKETS
+    return mantissa << shift, (mantissa + 1) << shift
+
+
+class Histogram:
+    """
+    Log-linear histogram of non-negative integers, in the style of HdrHistogram.
+    Use this for latencies (in nanoseconds) and sizes: recording is O(1), memory grows with
+    the number of distinct magnitudes seen, and every bucket is within ~6% of its values.
+    """
+
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self) -> None:
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+
+    def record(self, value: int) -> None:
+        # Bucket index inlined (the inverse of _bucket_range): small values count exactly,
+        # larger ones by their top _SUB_BUCKET_BITS + 1 bits.
+        if value < _SUB_BUCKETS:
+            if value < 0:
+                value = 0
+            index = value
+        else:
+            shift = value.bit_length() - _SUB_BUCKET_BITS - 1
+            index = ((shift + 1) << _SUB_BUCKET_BITS) + (value >> shift) - _SUB_BUCKETS
+        counts = self.counts
+        counts[index] = counts.get(index, 0) + 1
+        if not self.count:
+            self.min = self.max = value
+        elif value < self.min:
+            self.min = value
+        elif value > self.max:
+            self.max = value
+        self.count += 1
+        self.total += value
+
+    def percentile(self, q: float) -> Optional[int]:
+        """
+        Returns the value at percentile q (0-100): the highest value of the bucket that
+        contains it, capped at the largest recorded value. None if nothing was recorded.
+        """
+        if not self.count:
+            return None
+        rank = max(1, -(-self.count * q // 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(_bucket_range(index)[1] - 1, self.max)
+        return self.max
+
+    def cumulative(self, bounds: List[float]) -> List[int]:
+        """
+        Returns, for each bound, how many values are known to be <= it (Prometheus 'le'
+        buckets). A bucket straddling a bound is counted at the next bound.
+        """
+        result = []
+        ordered = sorted(self.counts.items())
+        position = seen = 0
+        for bound in bounds:
+            while position < len(ordered) and _bucket_range(ordered[position][0])[1] - 1 <= bound:
+                seen += ordered[position][1]
+                position += 1
+            result.append(seen)
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count, "sum": self.total, "min": self.min, "max": self.max,
+            "p50": self.percentile(50), "p90": self.percentile(90), "p99": self.percentile(99),
+        }
+
+
+# ---------- Per-Function Stats ----------
+
+
+class FunctionStats:
+    """
+    Counters and histograms for one instrumented function.
+    """
+
+    __slots__ = ("name", "calls", "errors", "latency", "sizes", "lock")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.calls = 0
+        self.errors = 0
+        self.latency = Histogram()
+        self.sizes: Optional[Histogram] = None
+        self.lock = threading.Lock()
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "calls": self.calls, "errors": self.errors,
+                "latency_ns": self.latency.to_dict(),
+                "argument_size": self.sizes.to_dict() if self.sizes is not None else None,
+            }
+
+
+_registry: Dict[str, FunctionStats] = {}
+
+
+def _argument_size(value: Any) -> Optional[int]:
+    # An integer parameter already is a size (e.g., dice_pool counts dice), so its value is
+    # recorded; a container is measured with len(). Anything else is not recorded.
+    if isinstance(value, bool):
+        return None
+    try:
+        return operator.index(value)
+    except TypeError:
+        pass
+    try:
+        return len(value)
+    except TypeError:
+        return None
+
+
+def instrumented(fn: Optional[Callable[..., Any]] = None, *, size: Optional[str] = None) -> Any:
+    """
+    Decorator that records metrics for a function while metrics are enabled.
+    Use it bare (@instrumented) or with the parameter whose size to track,
+    e.g. @instrumented(size="dice_pool").
+    Args:
+        fn: The function (when used bare).
+        size: Optional parameter name. An integer argument is itself the size (e.g., a
+            dice pool) and is recorded by value; anything else by len() (lists, dicts,
+            NPCRegistry, ...).
+    Raises:
+        ValueError: At decoration time, if size names a parameter the function lacks.
+    Notes:
+        Latency is wall time around the call, including nested instrumented calls.
+        Generator functions are timed until the generator is created, not consumed.
+    """
+
+    def decorate(fn: Callable[..., Any]) -> Callable[..., Any]:
+        stats = _registry.setdefault(fn.__name__, FunctionStats(fn.__name__))
+        position = -1
+        if size is not None:
+            parameters = list(inspect.signature(fn).parameters)
+            if size not in parameters:
+                raise ValueError(f"instrumented() got unknown parameter for {fn.__name__}: {size!r}")
+            position = parameters.index(size)
+            stats.sizes = Histogram()
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter_ns()
+            failed = False
+            try:
+                return fn(*args, **kwargs)
+            except BaseException:
+                failed = True
+                raise
+            finally:
+                elapsed = time.perf_counter_ns() - start
+                measured = None
+                if position >= 0:
+                    value = args[position] if position < len(args) else kwargs.get(size)
+                    measured = _argument_size(value) if value is not None else None
+                with stats.lock:
+                    stats.calls += 1
+                    stats.errors += 1 if failed else 0
+                    stats.latency.record(elapsed)
+                    if measured is not None:
+                        stats.sizes.record(measured)
+
+        return wrapper
+
+    return decorate(fn) if fn is not None else decorate
+
+
+def snapshot() -> Dict[str, Dict[str, Any]]:
+    """
+    Returns function name -> calls, errors, latency_ns and argument_size summaries
+    (count, sum, min, max, p50, p90, p99) for every function called at least once.
+    """
+    return {name: stats.to_dict() for name, stats in sorted(_registry.items()) if stats.calls}
+
+
+def reset() -> None:
+    """
+    Clears every recorded metric (the functions stay instrumented).
+    """
+    for stats in _registry.values():
+        with stats.lock:
+            stats.calls = stats.errors = 0
+            stats.latency = Histogram()
+            if stats.sizes is not None:
+                stats.sizes = Histogram()
+
+
+# ---------- Prometheus Export ----------
+
+
+def export_prometheus(prefix: str = "anarchy") -> str:
+    """
+    Returns every recorded metric in the Prometheus text exposition format.
+    Families: <prefix>_calls_total, <prefix>_errors_total,
+    <prefix>_call_duration_seconds (histogram) and <prefix>_argument_size (histogram),
+    each labelled by function.
+    """
+    calls: List[str] = []
+    errors: List[str] = []
+    durations: List[str] = []
+    sizes: List[str] = []
+    for name, stats in sorted(_registry.items()):
+        with stats.lock:
+            if not stats.calls:
+                continue
+            label = f'function="{name}"'
+            calls.append(f"{prefix}_calls_total{{{label}}} {stats.calls}")
+            errors.append(f"{prefix}_errors_total{{{label}}} {stats.errors}")
+            bounds_ns = [bound * 1e9 for bound in LATENCY_BOUNDS]
+            for bound, count in zip(LATENCY_BOUNDS, stats.latency.cumulative(bounds_ns)):
+                durations.append(f'{prefix}_call_duration_seconds_bucket{{{label},le="{float(bound)!r}"}} {count}')
+            durations.append(f'{prefix}_call_duration_seconds_bucket{{{label},le="+Inf"}} {stats.latency.count}')
+            durations.append(f"{prefix}_call_duration_seconds_sum{{{label}}} {stats.latency.total / 1e9!r}")
+            durations.append(f"{prefix}_call_duration_seconds_count{{{label}}} {stats.latency.count}")
+            if stats.sizes is not None and stats.sizes.count:
+                for bound, count in zip(SIZE_BOUNDS, stats.sizes.cumulative(SIZE_BOUNDS)):
+                    sizes.append(f'{prefix}_argument_size_bucket{{{label},le="{float(bound)!r}"}} {count}')
+                sizes.append(f'{prefix}_argument_size_bucket{{{label},le="+Inf"}} {stats.sizes.count}')
+                sizes.append(f"{prefix}_argument_size_sum{{{label}}} {stats.sizes.total}")
+                sizes.append(f"{prefix}_argument_size_count{{{label}}} {stats.sizes.count}")
+    lines = []
+    for family, kind, help_text, samples in (
+        ("calls_total", "counter", "Calls of each instrumented function.", calls),
+        ("errors_total", "counter", "Calls that raised an exception.", errors),
+        ("call_duration_seconds", "histogram", "Wall time per call.", durations),
+        ("argument_size", "histogram", "Size of the tracked argument (dice pool, list length).", sizes),
+    ):
+        if samples:
+            lines += [f"# HELP {prefix}_{family} {help_text}", f"# TYPE {prefix}_{family} {kind}", *samples]
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def write_prometheus(filepath: str, prefix: str = "anarchy") -> None:
+    """
+    Writes export_prometheus() to a file atomically, e.g. for node_exporter's textfile
+    collector.
+    """
+    import persistence
+
+    persistence.write_encoded(export_prometheus(prefix).encode("utf-8"), filepath, compression=None)
+
+
+def start_http_server(port: int = 9108, host: str = "127.0.0.1") -> Any:
+    """
+    Serves GET /metrics in a background thread and returns the server (an
+    http.server.ThreadingHTTPServer; call shutdown() to stop it). Pass port=0 to pick a
+    free port.
+    """
+    # Imported here: http.server is the slowest import in this module and most processes
+    # never serve metrics.
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802 (http.server naming)
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = export_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True)
+    thread.start()
+    log_event(
+        logger, logging.INFO, "metrics.serving", "Serving metrics on %(address)s", address=server.server_address,
+    )
+    return server
+
+
+# ---------- On-Demand Profiling ----------
+
+_profiler: Any = None  # the running cProfile.Profile
+
+
+def start_profile() -> None:
+    """
+    Starts a cProfile capture of the calling thread.
+    Raises:
+        RuntimeError: If a capture is already running.
+    """
+    global _profiler
+    if _profiler is not None:
+        raise RuntimeError("A profile capture is already running")
+    import cProfile
+
+    _profiler = cProfile.Profile()
+    _profiler.enable()
+
+
+def stop_profile(filepath: Optional[str] = None, sort: str = "cumulative", limit: int = 30) -> str:
+    """
+    Stops the cProfile capture and returns the top entries as text.
+    Args:
+        filepath: Optional path to dump the raw stats to (readable with pstats/snakeviz).
+        sort: pstats sort key.
+        limit: Number of entries in the returned text.
+    Raises:
+        RuntimeError: If no capture is running.
+    """
+    global _profiler
+    if _profiler is None:
+        raise RuntimeError("No profile capture is running")
+    profiler, _profiler = _profiler, None
+    profiler.disable()
+    if filepath is not None:
+        profiler.dump_stats(filepath)
+    import pstats
+
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats(sort).print_stats(limit)
+    return out.getvalue()
+
+
+def start_memory_trace(frames: int = 1) -> None:
+    """
+    Starts a tracemalloc capture (frames = traceback depth per allocation).
+    Raises:
+        RuntimeError: If tracemalloc is already tracing.
+    """
+    if tracemalloc.is_tracing():
+        raise RuntimeError("tracemalloc is already tracing")
+    tracemalloc.start(frames)
+
+
+def stop_memory_trace(limit: int = 20) -> str:
+    """
+    Stops the tracemalloc capture and returns the top allocation sites as text.
+    Raises:
+        RuntimeError: If tracemalloc is not tracing.
+    """
+    if not tracemalloc.is_tracing():
+        raise RuntimeError("tracemalloc is not tracing")
+    allocations = tracemalloc.take_snapshot()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    lines = [f"Current {current} bytes, peak {peak} bytes"]
+    lines += [str(stat) for stat in allocations.statistics("lineno")[:limit]]
+    return "\n".join(lines)
+
+
+@contextmanager
+def capture(profile: bool = True, memory: bool = False, report: Optional[Dict[str, str]] = None) -> Iterator[None]:
+    """
+    Profiles the block with cProfile and/or tracemalloc.
+    Args:
+        profile: Capture a cProfile profile.
+        memory: Capture tracemalloc allocation sites.
+        report: Optional dict that receives 'profile' and/or 'memory' text on exit.
+    """
+    if profile:
+        start_profile()
+    if memory:
+        start_memory_trace()
+    try:
+        yield
+    finally:
+        texts = {}
+        if memory:
+            texts["memory"] = stop_memory_trace()
+        if profile:
+            texts["profile"] = stop_profile()
+        if report is not None:
+            report.update(texts)
@@ -0,0 +1,269 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from validation import _check_list_of, _check_type
+
+# ---------- Typed Campaign Models ----------
+#
+# Slotted dataclasses for the campaign JSON format. Each model is validated once, when it
+# is constructed, so functions given a model (or a list of models) skip the per-call checks
+# they run on plain dicts. Keys the model does not know are kept in 'extra' and written
+# back by to_dict, so converting never loses data. from_dict also records the dictionary's
+# key order (key_order), so a round trip writes the keys back where they were.
+
+
+def _split(data: Dict[str, Any], known: tuple) -> Dict[str, Any]:
+    return {key: value for key, value in data.items() if key not in known}
+
+
+def _join(
+    head: Dict[str, Any], extra: Dict[str, Any], tail: Dict[str, Any], key_order: Optional[Tuple[str, ...]]
+) -> Dict[str, Any]:
+    """
+    Builds a model's dictionary from its known fields (head before extra, tail after).
+    Keys listed in key_order come first, in that order; keys added since follow.
+    """
+    if key_order is None:
+        return {**head, **extra, **tail}
+    known = {**head, **tail}
+    data = {}
+    for key in key_order:
+        if key in known:
+            data[key] = known[key]
+        elif key in extra:
+            data[key] = extra[key]
+    for source in (head, extra, tail):
+        for key, value in source.items():
+            if key not in data:
+                data[key] = value
+    return data
+
+
+@dataclass(slots=True)
+class Character:
+    """
+    A player character or runner, as created by character_create.
+    Attributes:
+        name: The character's name (None if the character has none).
+        karma_spent: Karma spent per category (see character_spend_karma).
+        cues_used: Cues the character has used.
+        extra: Every other field (attributes, skills, plot_points, ...).
+        key_order: The dictionary's key order, as read by from_dict (None: name first,
+            then extra, then karma_spent and cues_used).
+    """
+    name: Optional[str] = None
+    karma_spent: Dict[str, int] = field(default_factory=dict)
+    cues_used: List[str] = field(default_factory=list)
+    extra: Dict[str, Any] = field(default_factory=dict)
+    key_order: Optional[Tuple[str, ...]] = field(default=None, repr=False, compare=False)
+
+    _KEYS = ("name", "karma_spent", "cues_used")
+
+    def __post_init__(self) -> None:
+        if self.name is not None:
+            _check_type("name", self.name, str)
+        _check_type("karma_spent", self.karma_spent, dict)
+        _check_type("cues_used", self.cues_used, list)
+        _check_type("extra", self.extra, dict)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Character":
+        """
+        Builds a Character from a character dictionary.
+        """
+        _check_type("character", data, dict)
+        return cls(
+            data.get("name"), dict(data.get("karma_spent", {})), list(data.get("cues_used", [])),
+            _split(data, cls._KEYS), tuple(data),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns the character as a new dictionary in the JSON format.
+        """
+        head = {} if self.name is None else {"name": self.name}
+        tail = {"karma_spent": dict(self.karma_spent), "cues_used": list(self.cues_used)}
+        return _join(head, self.extra, tail, self.key_order)
+
+
+@dataclass(slots=True)
+class Session:
+    """
+    One session log, as built by session_log.
+    Attributes:
+        session: The session's number in the campaign.
+        summary: A brief summary of the session's events.
+        npcs: Names of the NPCs involved.
+        loot: Loot or rewards distributed.
+        extra: Every other field.
+        key_order: The dictionary's key order, as read by from_dict (None: the fields
+            above, then extra).
+    """
+    session: int
+    summary: str
+    npcs: List[str] = field(default_factory=list)
+    loot: Dict[str, Any] = field(default_factory=dict)
+    extra: Dict[str, Any] = field(default_factory=dict)
+    key_order: Optional[Tuple[str, ...]] = field(default=None, repr=False, compare=False)
+
+    _KEYS = ("session", "summary", "npcs", "loot")
+
+    def __post_init__(self) -> None:
+        _check_type("session", self.session, int)
+        _check_type("summary", self.summary, str)
+        _check_type("npcs", self.npcs, list)
+        _check_list_of("npcs", self.npcs, str)
+        _check_type("loot", self.loot, dict)
+        _check_type("extra", self.extra, dict)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Session":
+        """
+        Builds a Session from a session log dictionary.
+        """
+        _check_type("session", data, dict)
+        return cls(
+            data.get("session"), data.get("summary"), list(data.get("npcs", [])), dict(data.get("loot", {})),
+            _split(data, cls._KEYS), tuple(data),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns the session as a new dictionary in the JSON format.
+        """
+        head = {"session": self.session, "summary": self.summary, "npcs": list(self.npcs), "loot": dict(self.loot)}
+        return _join(head, self.extra, {}, self.key_order)
+
+
+@dataclass(slots=True)
+class NPC:
+    """
+    A non-player character.
+    Attributes:
+        name: The NPC's name (None if the NPC has none).
+        tags: Tags used to pick NPCs (e.g., 'fixer', 'enemy').
+        extra: Every other field.
+        key_order: The dictionary's key order, as read by from_dict (None: name first,
+            then extra, then tags).
+    """
+    name: Optional[str] = None
+    tags: List[str] = field(default_factory=list)
+    extra: Dict[str, Any] = field(default_factory=dict)
+    key_order: Optional[Tuple[str, ...]] = field(default=None, repr=False, compare=False)
+
+    _KEYS = ("name", "tags")
+
+    def __post_init__(self) -> None:
+        if self.name is not None:
+            _check_type("name", self.name, str)
+        _check_type("tags", self.tags, list)
+        _check_list_of("tags", self.tags, str)
+        _check_type("extra", self.extra, dict)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "NPC":
+        """
+        Builds an NPC from an NPC dictionary.
+        """
+        _check_type("npc", data, dict)
+        return cls(data.get("name"), list(data.get("tags", [])), _split(data, cls._KEYS), tuple(data))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns the NPC as a new dictionary in the JSON format.
+        """
+        head = {} if self.name is None else {"name": self.name}
+        return _join(head, self.extra, {"tags": list(self.tags)}, self.key_order)
+
+
+@dataclass(slots=True)
+class ContractBrief:
+    """
+    A contract (job) brief.
+    Attributes:
+        name: The contract's name, used by get_contract_brief.
+        extra: Every other field (employer, pay, details, ...).
+        key_order: The dictionary's key order, as read by from_dict (None: name first).
+    """
+    name: str
+    extra: Dict[str, Any] = field(default_factory=dict)
+    key_order: Optional[Tuple[str, ...]] = field(default=None, repr=False, compare=False)
+
+    _KEYS = ("name",)
+
+    def __post_init__(self) -> None:
+        _check_type("name", self.name, str)
+        _check_type("extra", self.extra, dict)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ContractBrief":
+        """
+        Builds a ContractBrief from a contract brief dictionary.
+        """
+        _check_type("brief", data, dict)
+        return cls(data.get("name"), _split(data, cls._KEYS), tuple(data))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns the brief as a new dictionary in the JSON format.
+        """
+        return _join({"name": self.name}, self.extra, {}, self.key_order)
+
+
+@dataclass(slots=True)
+class Campaign:
+    """
+    A whole campaign, as created by campaign_create.
+    Attributes:
+        sessions: Session logs, in order.
+        characters: The campaign's characters.
+        npcs: The campaign's NPCs.
+        briefs: Contract briefs (None if the campaign has no 'briefs' field).
+        extra: Campaign settings and every other field.
+        key_order: The dictionary's key order, as read by from_dict (None: extra, then
+            the lists above).
+    """
+    sessions: List[Session] = field(default_factory=list)
+    characters: List[Character] = field(default_factory=list)
+    npcs: List[NPC] = field(default_factory=list)
+    briefs: Optional[List[ContractBrief]] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+    key_order: Optional[Tuple[str, ...]] = field(default=None, repr=False, compare=False)
+
+    _KEYS = ("sessions", "characters", "npcs", "briefs")
+
+    def __post_init__(self) -> None:
+        _check_list_of("sessions", self.sessions, Session)
+        _check_list_of("characters", self.characters, Character)
+        _check_list_of("npcs", self.npcs, NPC)
+        if self.briefs is not None:
+            _check_list_of("briefs", self.briefs, ContractBrief)
+        _check_type("extra", self.extra, dict)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Campaign":
+        """
+        Builds a Campaign (and all nested models) from a campaign dictionary.
+        """
+        _check_type("campaign", data, dict)
+        briefs = data.get("briefs")
+        return cls(
+            [Session.from_dict(s) for s in data.get("sessions", [])],
+            [Character.from_dict(c) for c in data.get("characters", [])],
+            [NPC.from_dict(n) for n in data.get("npcs", [])],
+            None if briefs is None else [ContractBrief.from_dict(b) for b in briefs],
+            _split(data, cls._KEYS), tuple(data),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns the campaign as a new dictionary in the JSON format.
+        """
+        tail = {
+            "sessions": [s.to_dict() for s in self.sessions],
+            "characters": [c.to_dict() for c in self.characters],
+            "npcs": [n.to_dict() for n in self.npcs],
+        }
+        if self.briefs is not None:
+            tail["briefs"] = [b.to_dict() for b in self.briefs]
+        return _join({}, self.extra, tail, self.key_order)
@@ -0,0 +1,237 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from anarchy.dice import _resolve_rng
+from rng import AliasSampler, RNGProvider
+from validation import _check_list_of, _check_type
+
+# ---------- Indexed NPC Registry ----------
+
+
+class _IndexedSet:
+    """
+    Set of NPC ids with O(1) add, remove, membership, and uniform random pick.
+    Ids live in a dense list; removal swaps the last id into the freed slot.
+    """
+
+    __slots__ = ("items", "positions")
+
+    def __init__(self) -> None:
+        self.items: List[int] = []
+        self.positions: Dict[int, int] = {}
+
+    def add(self, item: int) -> None:
+        if item not in self.positions:
+            self.positions[item] = len(self.items)
+            self.items.append(item)
+
+    def discard(self, item: int) -> None:
+        index = self.positions.pop(item, None)
+        if index is None:
+            return
+        last = self.items.pop()
+        if index < len(self.items):
+            self.items[index] = last
+            self.positions[last] = index
+
+    def __contains__(self, item: int) -> bool:
+        return item in self.positions
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+
+class NPCRegistry:
+    """
+    Campaign NPC store with a tag -> id inverted index for fast filtered random picks.
+    Use this instead of passing the raw 'npcs' list when a campaign has many NPCs.
+    Args:
+        npcs: Optional initial list of NPC dictionaries (e.g., campaign['npcs']).
+    Notes:
+        The registry stores the NPC dictionaries themselves, not copies, so picks return
+        the same objects as the campaign list. If an NPC's tags are edited in place, call
+        update() with its id to reindex it.
+        Ids are assigned by the registry in insertion order and are never reused.
+    """
+
+    def __init__(self, npcs: Optional[List[Dict[str, Any]]] = None) -> None:
+        self._npcs: Dict[int, Dict[str, Any]] = {}
+        self._tags: Dict[int, Tuple[str, ...]] = {}
+        self._all = _IndexedSet()
+        self._by_tag: Dict[str, _IndexedSet] = {}
+        self._next_id = 0
+        self._samplers: Dict[Tuple[Any, ...], Tuple[List[int], AliasSampler]] = {}
+        if npcs is not None:
+            self.add_many(npcs)
+
+    @classmethod
+    def from_campaign(cls, campaign: Dict[str, Any]) -> "NPCRegistry":
+        """
+        Builds a registry from a campaign dictionary's 'npcs' list.
+        """
+        _check_type("campaign", campaign, dict)
+        return cls(campaign.get("npcs", []))
+
+    def __len__(self) -> int:
+        return len(self._npcs)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self._npcs.values())
+
+    def get(self, npc_id: int) -> Dict[str, Any]:
+        """
+        Returns the NPC with the given id, or an empty dict if there is none.
+        """
+        return self._npcs.get(npc_id, {})
+
+    def tags(self) -> List[str]:
+        """
+        Returns every tag currently carried by at least one NPC.
+        """
+        return list(self._by_tag)
+
+    def _index(self, npc_id: int, npc: Dict[str, Any]) -> None:
+        tags = tuple(dict.fromkeys(npc.get("tags", [])))
+        self._npcs[npc_id] = npc
+        self._tags[npc_id] = tags
+        self._all.add(npc_id)
+        for tag in tags:
+            self._by_tag.setdefault(tag, _IndexedSet()).add(npc_id)
+        self._samplers.clear()
+
+    def _unindex(self, npc_id: int) -> None:
+        for tag in self._tags.pop(npc_id, ()):
+            bucket = self._by_tag.get(tag)
+            if bucket is not None:
+                bucket.discard(npc_id)
+                if not bucket:
+                    del self._by_tag[tag]
+        self._all.discard(npc_id)
+        del self._npcs[npc_id]
+        self._samplers.clear()
+
+    def add(self, npc: Dict[str, Any]) -> int:
+        """
+        Adds an NPC and returns its registry id.
+        """
+        _check_type("npc", npc, dict)
+        npc_id = self._next_id
+        self._next_id += 1
+        self._index(npc_id, npc)
+        return npc_id
+
+    def add_many(self, npcs: Iterable[Dict[str, Any]]) -> List[int]:
+        """
+        Adds several NPCs (validated once up front) and returns their ids in order.
+        """
+        npcs = list(npcs)
+        _check_list_of("npcs", npcs, dict)
+        ids = []
+        for npc in npcs:
+            ids.append(self._next_id)
+            self._index(self._next_id, npc)
+            self._next_id += 1
+        return ids
+
+    def remove(self, npc_id: int) -> Dict[str, Any]:
+        """
+        Removes an NPC by id and returns it, or returns an empty dict if there was none.
+        """
+        npc = self._npcs.get(npc_id)
+        if npc is None:
+            return {}
+        self._unindex(npc_id)
+        return npc
+
+    def update(self, npc_id: int, npc: Dict[str, Any]) -> None:
+        """
+        Replaces (or reindexes, if npc is the same object) the NPC stored under npc_id.
+        Raises:
+            KeyError: If npc_id is not in the registry.
+        """
+        _check_type("npc", npc, dict)
+        if npc_id not in self._npcs:
+            raise KeyError(npc_id)
+        self._unindex(npc_id)
+        self._index(npc_id, npc)
+
+    def _candidate_ids(
+        self, all_tags: Optional[List[str]], any_tags: Optional[List[str]]
+    ) -> List[int]:
+        """
+        Resolves an AND/OR tag query to NPC ids, intersecting from the smallest bucket.
+        """
+        if any_tags:
+            matched: Dict[int, None] = {}
+            for tag in any_tags:
+                bucket = self._by_tag.get(tag)
+                if bucket is not None:
+                    matched.update(dict.fromkeys(bucket.items))
+            ids = list(matched)
+        else:
+            ids = list(self._all.items)
+        if all_tags:
+            buckets = [self._by_tag.get(tag) for tag in all_tags]
+            if any(bucket is None for bucket in buckets):
+                return []
+            buckets.sort(key=len)
+            if not any_tags:
+                ids = list(buckets[0].items)
+            ids = [i for i in ids if all(i in bucket for bucket in buckets)]
+        return ids
+
+    def query(
+        self, all_tags: Optional[List[str]] = None, any_tags: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Returns NPCs matching a tag query.
+        Args:
+            all_tags: NPCs must carry every one of these tags (AND).
+            any_tags: NPCs must carry at least one of these tags (OR).
+        Returns:
+            Matching NPC dictionaries; all NPCs if neither argument is given.
+        """
+        return [self._npcs[i] for i in self._candidate_ids(all_tags, any_tags)]
+
+    def pick(
+        self,
+        tag: Optional[str] = None,
+        all_tags: Optional[List[str]] = None,
+        any_tags: Optional[List[str]] = None,
+        weight_key: Optional[str] = None,
+        rng: Optional[RNGProvider] = None,
+    ) -> Dict[str, Any]:
+        """
+        Picks a random NPC, optionally filtered by tags and weighted by a numeric field.
+        Args:
+            tag: Single required tag (same as all_tags=[tag]).
+            all_tags: NPCs must carry every one of these tags.
+            any_tags: NPCs must carry at least one of these tags.
+            weight_key: Optional NPC field holding a non-negative weight (missing counts as 1).
+            rng: Optional RNG provider; defaults to the module provider.
+        Returns:
+            The selected NPC dictionary, or an empty dict if nothing matches.
+        Notes:
+            Unweighted single-tag (or untagged) picks are O(1). Other queries are resolved once,
+            then cached with an alias table until the registry changes, so repeat picks are O(1).
+        """
+        rng = _resolve_rng(rng)
+        if tag is not None:
+            _check_type("tag", tag, str)
+            all_tags = [tag] + list(all_tags or [])
+        if weight_key is None and not any_tags and (not all_tags or len(all_tags) == 1):
+            bucket = self._by_tag.get(all_tags[0]) if all_tags else self._all
+            if not bucket:
+                return {}
+            return self._npcs[rng.choice(bucket.items)]
+
+        key = (tuple(all_tags or ()), tuple(any_tags or ()), weight_key)
+        cached = self._samplers.get(key)
+        if cached is None:
+            ids = self._candidate_ids(all_tags, any_tags)
+            weights = [self._npcs[i].get(weight_key, 1) for i in ids] if weight_key else [1] * len(ids)
+            if not ids or sum(weights) <= 0:
+                return {}
+            cached = (ids, AliasSampler(weights))
+            self._samplers[key] = cached
+        ids, sampler = cached
+        return self._npcs[ids[sampler.draw(rng)]]
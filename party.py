@@ -0,0 +1,238 @@
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from eventlog import log_event
+from validation import _check_list_of, _check_type
+
+logger = logging.getLogger(__name__)
+
+# ---------- Bulk Party Operations ----------
+
+ALL = "*"  # 'character' value that targets every character in the party
+
+# Operation name -> (required keys besides 'op'/'character', optional keys with defaults)
+_OPERATIONS: Dict[str, Tuple[Tuple[str, ...], Dict[str, Any]]] = {
+    "spend_karma": (("category", "amount"), {}),
+    "advance": (("field", "amount", "cost"), {"karma_available": None}),
+    "award_plot_point": ((), {"count": 1}),
+    "spend_plot_point": ((), {"count": 1}),
+    "damage": (("amount",), {}),
+    "heal": (("amount",), {"max_monitor": None}),
+}
+_STRING_KEYS = ("category", "field")
+
+
+def _validate(operations: List[Dict[str, Any]], names: Dict[str, int]) -> List[Tuple[Dict[str, Any], List[int]]]:
+    """
+    Checks every operation and resolves its targets to character positions.
+    """
+    plan = []
+    for index, operation in enumerate(operations):
+        kind = operation.get("op")
+        if kind not in _OPERATIONS:
+            raise ValueError(f"Operation {index} has unknown op {kind!r}; expected one of {sorted(_OPERATIONS)}")
+        required, optional = _OPERATIONS[kind]
+        missing = [key for key in ("character",) + required if key not in operation]
+        if missing:
+            raise ValueError(f"Operation {index} ({kind}) is missing {', '.join(repr(k) for k in missing)}")
+        merged = {**optional, **operation}
+        for key in required + tuple(optional):
+            if merged[key] is not None:
+                _check_type(f"operations[{index}].{key}", merged[key], str if key in _STRING_KEYS else int)
+        target = merged["character"]
+        _check_type(f"operations[{index}].character", target, str)
+        if target == ALL:
+            targets = list(names.values())
+        elif target in names:
+            targets = [names[target]]
+        else:
+            raise KeyError(f"Operation {index} names unknown character '{target}'")
+        plan.append((merged, targets))
+    return plan
+
+
+def _record(changes: Dict[str, Dict[str, Any]], name: str, field: str, before: Any, after: Any, key: Optional[str] = None) -> None:
+    # Keeps the first 'before' and the latest 'after' of each field.
+    entry = changes.setdefault(name, {})
+    if key is not None:
+        entry = entry.setdefault(field, {})
+        field = key
+    if field in entry:
+        entry[field][1] = after
+    else:
+        entry[field] = [before, after]
+
+
+def apply_party_operations(
+    characters: List[Dict[str, Any]], operations: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Applies a batch of karma, plot point and condition monitor operations to a party.
+    Use this for end-of-session bookkeeping or NPC squads instead of one
+    character_spend_karma/award_plot_point/apply_damage_to_condition_monitor call per change.
+    Args:
+        characters: The party's character dictionaries (e.g., campaign['characters']),
+            matched by 'name'.
+        operations: Dicts with 'op', 'character' (a name, or '*' for everyone) and:
+            - 'spend_karma': 'category', 'amount' (as character_spend_karma).
+            - 'advance': 'field', 'amount', 'cost', optional 'karma_available'
+              (as apply_karma_advancement).
+            - 'award_plot_point' / 'spend_plot_point': optional 'count' (1).
+            - 'damage': 'amount' (as apply_damage_to_condition_monitor).
+            - 'heal': 'amount', optional 'max_monitor' (as heal_condition_monitor).
+    Returns:
+        Dict with:
+        - 'characters': the updated list; characters no operation touched are the same objects.
+        - 'changes': name -> field -> [before, after] ('karma_spent' nests a category level),
+          compact enough to journal (see CampaignJournal.apply_party_operations).
+    Raises:
+        KeyError: If an operation names an unknown character.
+        TypeError / ValueError: If an operation is malformed.
+        ValueError: If any character's karma runs short; nothing is applied.
+    Notes:
+        Every operation is validated before any is applied, and the given characters are
+        never mutated. Operations apply in order.
+        Karma: each character has one budget for the whole batch, taken from the first
+        'karma_available' given for it or else its 'karma' field, and every spend in the
+        batch comes out of it. A 'karma' field is always reduced by what the batch spends.
+        'advance' needs a budget; 'spend_karma' is only checked against one when there is
+        one. Plot points stop at 0 and the condition monitor stays between 0 and
+        'max_monitor' (or the character's 'max_condition_monitor'), as in the single calls.
+    """
+    _check_list_of("characters", characters, dict)
+    _check_list_of("operations", operations, dict)
+    names = {}
+    for position, character in enumerate(characters):
+        name = character.get("name")
+        if isinstance(name, str):
+            names.setdefault(name, position)
+    plan = _validate(operations, names)
+
+    # One running karma budget per character for the whole batch: the first explicit
+    # 'karma_available' aimed at it, else its 'karma' field. Every spend is taken from it.
+    budgets: Dict[int, int] = {}
+    for operation, targets in plan:
+        if operation["op"] not in ("spend_karma", "advance"):
+            continue
+        for position in targets:
+            if position in budgets:
+                continue
+            if operation.get("karma_available") is not None:
+                budgets[position] = operation["karma_available"]
+            elif isinstance(characters[position].get("karma"), int):
+                budgets[position] = characters[position]["karma"]
+
+    updated = list(characters)
+    copied = set()
+    spent_copied = set()
+    changes: Dict[str, Dict[str, Any]] = {}
+    shortfalls = []
+
+    def editable(position: int) -> Dict[str, Any]:
+        # Each touched character (and its karma_spent) is copied once per batch.
+        if position not in copied:
+            updated[position] = dict(updated[position])
+            copied.add(position)
+        return updated[position]
+
+    for operation, targets in plan:
+        kind = operation["op"]
+        for position in targets:
+            character = editable(position)
+            name = character["name"]
+            if kind in ("spend_karma", "advance"):
+                key = operation["category"] if kind == "spend_karma" else operation["field"]
+                cost = operation["amount"] if kind == "spend_karma" else operation["cost"]
+                budget = budgets.get(position)
+                if budget is None and kind == "advance":
+                    raise ValueError(f"Cannot advance {name}'s {key}: no 'karma_available' and no 'karma' field")
+                if budget is not None:
+                    if cost > budget:
+                        shortfalls.append(f"{name} needs {cost} karma for {key}, has {budget}")
+                        continue
+                    budgets[position] = budget - cost
+                    karma = character.get("karma")
+                    if isinstance(karma, int):
+                        character["karma"] = karma - cost
+                        _record(changes, name, "karma", karma, character["karma"])
+                if position not in spent_copied:
+                    character["karma_spent"] = dict(character.get("karma_spent", {}))
+                    spent_copied.add(position)
+                spent = character["karma_spent"]
+                before = spent.get(key, 0)
+                spent[key] = before + cost
+                _record(changes, name, "karma_spent", before, spent[key], key)
+                if kind == "advance":
+                    value = character.get(key, 0)
+                    character[key] = value + operation["amount"]
+                    _record(changes, name, key, value, character[key])
+            elif kind in ("award_plot_point", "spend_plot_point"):
+                points = character.get("plot_points", 0)
+                delta = operation["count"] if kind == "award_plot_point" else -operation["count"]
+                character["plot_points"] = max(0, points + delta)
+                _record(changes, name, "plot_points", points, character["plot_points"])
+            else:
+                monitor = character.get("condition_monitor", 0)
+                if kind == "damage":
+                    character["condition_monitor"] = max(0, monitor - operation["amount"])
+                else:
+                    maximum = operation["max_monitor"]
+                    if maximum is None:
+                        maximum = character.get("max_condition_monitor")
+                    if not isinstance(maximum, int):
+                        raise ValueError(f"Cannot heal {name}: no 'max_monitor' and no 'max_condition_monitor' field")
+                    character["condition_monitor"] = min(monitor + operation["amount"], maximum)
+                _record(changes, name, "condition_monitor", monitor, character["condition_monitor"])
+
+    if shortfalls:
+        log_event(
+            logger, logging.WARNING, "party.karma_insufficient", "Party batch rejected: %(shortfalls)s",
+            shortfalls="; ".join(shortfalls),
+        )
+        raise ValueError(f"Not enough karma; no operations applied: {'; '.join(shortfalls)}")
+    # Drop fields that ended where they started.
+    for name in list(changes):
+        for field, value in list(changes[name].items()):
+            if isinstance(value, dict):
+                for key, (before, after) in list(value.items()):
+                    if before == after:
+                        del value[key]
+                if not value:
+                    del changes[name][field]
+            elif value[0] == value[1]:
+                del changes[name][field]
+        if not changes[name]:
+            del changes[name]
+    log_event(
+        logger, logging.INFO, "party.updated", "Applied %(operations)s party operations to %(characters)s characters",
+        operations=len(operations), characters=len(changes),
+    )
+    return {"characters": updated, "changes": changes}
+
+
+def apply_changes(characters: List[Dict[str, Any]], changes: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Applies a 'changes' diff from apply_party_operations (the 'after' values), e.g. when
+    replaying a journal. Returns the updated list without mutating the given characters.
+    Raises:
+        KeyError: If the diff names a character that is not in the list.
+    """
+    _check_list_of("characters", characters, dict)
+    _check_type("changes", changes, dict)
+    updated = list(characters)
+    positions = {}
+    for position, character in enumerate(characters):
+        positions.setdefault(character.get("name"), position)
+    for name, fields in changes.items():
+        if name not in positions:
+            raise KeyError(f"No character named '{name}' in party")
+        character = dict(updated[positions[name]])
+        for field, value in fields.items():
+            if isinstance(value, dict):
+                nested = dict(character.get(field, {}))
+                nested.update({key: after for key, (_, after) in value.items()})
+                character[field] = nested
+            else:
+                character[field] = value[1]
+        updated[positions[name]] = character
+    return updated
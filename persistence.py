@@ -0,0 +1,315 @@
+import gzip
+import io
+import json
+import os
+from typing import IO, Any, Iterator, Optional, Tuple
+
+# ---------- Campaign Persistence Backend ----------
+
+GZIP = "gzip"
+ZSTD = "zstd"
+AUTO = "auto"
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_SUFFIXES = {".gz": GZIP, ".gzip": GZIP, ".zst": ZSTD, ".zstd": ZSTD}
+_READ_CHUNK = 64 * 1024
+
+# Optional codecs are imported on first use so `import persistence` stays cheap.
+_orjson: Any = None
+_orjson_checked = False
+
+
+def _load_orjson() -> Any:
+    global _orjson, _orjson_checked
+    try:
+        import orjson
+    except ImportError:  # orjson is optional; the stdlib json module is used instead.
+        orjson = None
+    _orjson, _orjson_checked = orjson, True
+    return orjson
+
+
+def encode_json(data: Any, pretty: bool = True) -> bytes:
+    """
+    Encodes data as UTF-8 JSON, using orjson when it is installed.
+    Args:
+        data: The data to encode.
+        pretty: If True, indents with two spaces; otherwise writes compact JSON.
+    Returns:
+        The encoded bytes.
+    Notes:
+        Falls back to the stdlib encoder for values orjson rejects (e.g., integers over 64 bits).
+    """
+    orjson = _orjson if _orjson_checked else _load_orjson()
+    if orjson is not None:
+        options = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        try:
+            return orjson.dumps(data, option=options)
+        except TypeError:
+            pass
+    if pretty:
+        text = json.dumps(data, ensure_ascii=False, indent=2)
+    else:
+        text = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    return text.encode("utf-8")
+
+
+def decode_json(raw: bytes) -> Any:
+    """
+    Decodes UTF-8 JSON bytes, using orjson when it is installed.
+    Notes:
+        orjson reads integers wider than 64 bits as floats; campaign data never needs them.
+    """
+    orjson = _orjson if _orjson_checked else _load_orjson()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
+
+
+def _resolve_compression(filepath: str, compression: Optional[str]) -> Optional[str]:
+    """
+    Maps compression='auto' to the codec implied by the file suffix (or none).
+    """
+    if compression == AUTO:
+        return _SUFFIXES.get(os.path.splitext(filepath)[1].lower())
+    if compression not in (None, GZIP, ZSTD):
+        raise ValueError(f"Unknown compression '{compression}' (use None, 'gzip', 'zstd', or 'auto')")
+    return compression
+
+
+def _require_zstd() -> Any:
+    try:
+        import zstandard
+    except ImportError:  # zstandard is optional; only needed for .zst files.
+        raise ImportError("zstd compression requires the 'zstandard' package") from None
+    return zstandard
+
+
+def _compress(payload: bytes, compression: Optional[str]) -> bytes:
+    if compression == GZIP:
+        return gzip.compress(payload, compresslevel=6, mtime=0)
+    if compression == ZSTD:
+        return _require_zstd().ZstdCompressor().compress(payload)
+    return payload
+
+
+def _fsync_directory(directory: str) -> None:
+    """
+    Flushes a directory entry so a completed rename survives a crash (POSIX only).
+    """
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _create_temp(filepath: str) -> Tuple[int, str]:
+    """
+    Creates a new, empty temporary file next to filepath and returns (fd, path).
+    Notes:
+        Unlike tempfile.mkstemp (always 0600), the file is created with mode 0o666 so the
+        kernel applies the process umask, as open() would for a new target.
+    """
+    directory = os.path.dirname(os.path.abspath(filepath))
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0) | getattr(os, "O_CLOEXEC", 0)
+    while True:
+        temp_path = os.path.join(directory, f".{os.path.basename(filepath)}.{os.urandom(6).hex()}.tmp")
+        try:
+            return os.open(temp_path, flags, 0o666), temp_path
+        except FileExistsError:
+            continue
+
+
+def atomic_write_bytes(payload: bytes, filepath: str) -> None:
+    """
+    Writes bytes so the target is either fully replaced or left untouched.
+    The payload goes to a temporary file in the same directory, is fsynced, and is then
+    renamed over the target with os.replace. An existing target keeps its permissions; a
+    new one gets the umask-based ones open() would give it.
+    """
+    directory = os.path.dirname(os.path.abspath(filepath))
+    try:
+        mode: Optional[int] = os.stat(filepath).st_mode & 0o7777
+    except FileNotFoundError:
+        mode = None
+    fd, temp_path = _create_temp(filepath)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            if mode is not None and hasattr(os, "fchmod"):  # POSIX only
+                os.fchmod(f.fileno(), mode)
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, filepath)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    _fsync_directory(directory)
+
+
+def write_json(data: Any, filepath: str, pretty: bool = True, compression: Optional[str] = AUTO) -> None:
+    """
+    Atomically saves data as JSON, optionally compact and/or compressed.
+    Args:
+        data: The data to save.
+        filepath: Target file path.
+        pretty: If True, indents with two spaces; otherwise writes compact JSON.
+        compression: None, 'gzip', 'zstd', or 'auto' (infer from .gz/.zst suffix).
+    Returns:
+        None
+    """
+    write_encoded(encode_json(data, pretty), filepath, compression)
+
+
+def write_encoded(payload: bytes, filepath: str, compression: Optional[str] = AUTO) -> None:
+    """
+    Atomically saves JSON that is already encoded (e.g., by encode_json under a lock),
+    compressing it like write_json.
+    """
+    atomic_write_bytes(_compress(payload, _resolve_compression(filepath, compression)), filepath)
+
+
+def _open_binary(filepath: str) -> IO[bytes]:
+    """
+    Opens a file for reading, transparently decompressing gzip or zstd by magic bytes.
+    """
+    raw = open(filepath, "rb")
+    magic = raw.read(4)
+    raw.seek(0)
+    if magic.startswith(_GZIP_MAGIC):
+        return gzip.GzipFile(fileobj=raw, mode="rb")
+    if magic.startswith(_ZSTD_MAGIC):
+        return _require_zstd().ZstdDecompressor().stream_reader(raw, closefd=True)
+    return raw
+
+
+def read_json(filepath: str) -> Any:
+    """
+    Loads JSON saved by write_json (plain, gzip, or zstd; detected automatically).
+    Raises:
+        FileNotFoundError: If the file does not exist.
+    """
+    return decode_json(read_bytes(filepath))
+
+
+def read_bytes(filepath: str) -> bytes:
+    """
+    Returns a file's contents, decompressed if it is gzip or zstd.
+    """
+    with _open_binary(filepath) as f:
+        return f.read()
+
+
+class _JsonStream:
+    """
+    Incremental reader over a JSON text stream that decodes one value at a time,
+    so only the value being decoded (plus one read chunk) is held in memory.
+    """
+
+    def __init__(self, text: IO[str]) -> None:
+        self._text = text
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, size: int = _READ_CHUNK) -> bool:
+        if self._eof:
+            return False
+        chunk = self._text.read(size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def next_char(self) -> str:
+        """
+        Skips whitespace and returns (without consuming) the next character, or '' at EOF.
+        """
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in " \t\r\n":
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.next_char()
+        if found != char:
+            raise ValueError(f"Malformed JSON stream: expected '{char}', found '{found or 'EOF'}'")
+        self._pos += 1
+
+    def value(self) -> Any:
+        """
+        Decodes and consumes the next JSON value, reading more input until it is complete.
+        """
+        self.next_char()
+        size = _READ_CHUNK
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+                # A number at the very end of the buffer may continue in the next chunk.
+                if end < len(self._buffer) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            if not self._fill(size):
+                continue
+            size *= 2
+
+
+def iter_json_array(filepath: str, key: str) -> Iterator[Any]:
+    """
+    Streams the elements of a top-level array field without loading the whole file.
+    Args:
+        filepath: Path to a JSON object file (plain, gzip, or zstd).
+        key: Name of the top-level field holding the array (e.g., 'sessions').
+    Yields:
+        Each element of the array, in order. Yields nothing if the field is missing.
+    Raises:
+        ValueError: If the file is not a JSON object or the field is not an array.
+    Notes:
+        Other top-level fields are decoded one at a time and discarded.
+    """
+    with _open_binary(filepath) as binary, io.TextIOWrapper(binary, encoding="utf-8") as text:
+        stream = _JsonStream(text)
+        stream.expect("{")
+        if stream.next_char() == "}":
+            return
+        while True:
+            field = stream.value()
+            stream.expect(":")
+            if field != key:
+                stream.value()
+            else:
+                stream.expect("[")
+                if stream.next_char() == "]":
+                    return
+                while True:
+                    yield stream.value()
+                    if stream.next_char() == "]":
+                        return
+                    stream.expect(",")
+            if stream.next_char() == "}":
+                return
+            stream.expect(",")
+
+
+def iter_sessions(filepath: str) -> Iterator[Any]:
+    """
+    Streams the session logs of a saved campaign one at a time.
+    Use this for recaps and reports on large campaigns instead of load_campaign.
+    """
+    return iter_json_array(filepath, "sessions")
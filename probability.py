@@ -0,0 +1,334 @@
+import logging
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from eventlog import log_event
+from validation import _check_list_of, _check_type
+
+logger = logging.getLogger(__name__)
+
+# ---------- Exact Dice Odds ----------
+
+_SIDES = 6
+_ODDS_CACHE_SIZE = 1024
+
+
+class OddsTable(NamedTuple):
+    """
+    Exact outcome distribution for one (dice pool, hit threshold) pair.
+    Attributes:
+        dice_pool: Number of d6 dice in the pool.
+        hit_threshold: Minimum die value that counts as a hit (5 normally, 4 with Edge).
+        hits: hits[k] is the probability of rolling exactly k hits.
+        at_least: at_least[k] is the probability of rolling k or more hits.
+        expected_hits: Mean number of hits.
+        glitch: Probability of a glitch, as defined by detect_glitch.
+        critical_glitch: Probability of a critical glitch, as defined by detect_glitch.
+    """
+    dice_pool: int
+    hit_threshold: int
+    hits: Tuple[float, ...]
+    at_least: Tuple[float, ...]
+    expected_hits: float
+    glitch: float
+    critical_glitch: float
+
+    def chance_of(self, target_hits: int) -> float:
+        """
+        Returns the probability of rolling at least target_hits hits.
+        """
+        if target_hits <= 0:
+            return 1.0
+        if target_hits >= len(self.at_least):
+            return 0.0
+        return self.at_least[target_hits]
+
+
+def _binomial_counts(n: int, success_faces: int, fail_faces: int) -> Tuple[int, ...]:
+    """
+    Returns C(n, k) * success_faces**k * fail_faces**(n - k) for k = 0..n.
+    With success_faces + fail_faces == 6 this is the number of the 6**n outcomes
+    with exactly k successes; exact integers keep large pools precise until the final division.
+    """
+    if fail_faces == 0:
+        return tuple(0 for _ in range(n)) + (success_faces ** n,)
+    counts = [fail_faces ** n]
+    for k in range(n):
+        counts.append(counts[-1] * (n - k) * success_faces // ((k + 1) * fail_faces))
+    return tuple(counts)
+
+
+@lru_cache(maxsize=_ODDS_CACHE_SIZE)
+def _build_odds_table(dice_pool: int, hit_threshold: int) -> OddsTable:
+    """
+    Builds the exact OddsTable for a pool; memoized so repeat queries are a cache hit.
+    """
+    total = _SIDES ** dice_pool
+    hit_faces = _SIDES + 1 - hit_threshold
+    other_faces = _SIDES - 1 - hit_faces  # neither a 1 nor a hit
+    hit_counts = _binomial_counts(dice_pool, hit_faces, _SIDES - hit_faces)
+    hits = tuple(c / total for c in hit_counts)
+    at_least = []
+    running = 0
+    for c in reversed(hit_counts):
+        running += c
+        at_least.append(running / total)
+    at_least.reverse()
+    expected_hits = dice_pool * hit_faces / _SIDES
+    if dice_pool == 0:
+        glitch = critical = 0.0
+    else:
+        # Mirrors detect_glitch: half or more dice (rounded down) show 1s.
+        glitch_floor = dice_pool // 2
+        glitch = sum(_binomial_counts(dice_pool, 1, _SIDES - 1)[glitch_floor:]) / total
+        # A critical glitch also needs zero hits, so every die that is not a 1 shows an "other" face.
+        critical_count = sum(_binomial_counts(dice_pool, 1, other_faces)[glitch_floor:])
+        critical = critical_count / total
+    return OddsTable(
+        dice_pool=dice_pool,
+        hit_threshold=hit_threshold,
+        hits=hits,
+        at_least=tuple(at_least),
+        expected_hits=expected_hits,
+        glitch=glitch,
+        critical_glitch=critical,
+    )
+
+
+def odds_table(dice_pool: int, hit_threshold: int = 5) -> OddsTable:
+    """
+    Returns the exact hit, glitch, and critical glitch distribution for a dice pool.
+    Use this to answer "what are my odds?" without rolling any dice.
+    Args:
+        dice_pool: Number of d6 dice in the pool.
+        hit_threshold: Minimum die value that counts as a hit (default 5; use 4 for Edge).
+    Returns:
+        OddsTable with per-hit probabilities, cumulative odds, and glitch chances.
+    Raises:
+        ValueError: If hit_threshold is not between 2 and 6.
+    Notes:
+        Tables are computed with exact binomial counts and kept in an LRU cache,
+        so repeated queries for the same pool are a dictionary lookup.
+        Negative pools are treated as zero dice, like roll_cue.
+    """
+    _check_type("dice_pool", dice_pool, int)
+    _check_type("hit_threshold", hit_threshold, int)
+    if not 2 <= hit_threshold <= _SIDES:
+        raise ValueError(f"'hit_threshold' must be between 2 and {_SIDES}, got {hit_threshold}")
+    return _build_odds_table(max(0, dice_pool), hit_threshold)
+
+
+def roll_odds(dice_pool: int, edge: bool = False, target_hits: int = 1) -> Dict[str, float]:
+    """
+    Summarizes the odds of a roll_cue roll for the GM or player before rolling.
+    Use this when a player asks how likely an action is to succeed.
+    Args:
+        dice_pool: Number of d6 dice to roll.
+        edge: If True, uses the 4+ Edge hit threshold. Otherwise, hits are 5+.
+        target_hits: Number of hits needed to succeed (default 1).
+    Returns:
+        Dict with keys 'success' (chance of at least target_hits), 'expected_hits',
+        'glitch', and 'critical_glitch'.
+    Notes:
+        Matches the thresholds in roll_cue and the glitch rules in detect_glitch.
+    """
+    _check_type("edge", edge, bool)
+    _check_type("target_hits", target_hits, int)
+    table = odds_table(dice_pool, 4 if edge else 5)
+    odds = {
+        "success": table.chance_of(target_hits),
+        "expected_hits": table.expected_hits,
+        "glitch": table.glitch,
+        "critical_glitch": table.critical_glitch,
+    }
+    log_event(
+        logger, logging.INFO, "dice.odds", "Odds for %(dice_pool)s dice (edge=%(edge)s, target=%(target)s): %(odds)s",
+        dice_pool=dice_pool, edge=edge, target=target_hits, odds=odds,
+    )
+    return odds
+
+
+def clear_odds_cache() -> None:
+    """
+    Drops all memoized odds tables.
+    """
+    _build_odds_table.cache_clear()
+
+
+# ---------- Edge Advisor ----------
+
+NO_EDGE = "none"
+REROLL_FAILURES = "reroll_failures"
+EDGE_THRESHOLD = "threshold_4"
+_EDGE_CACHE_SIZE = 4096
+
+
+class EdgeOutcome(NamedTuple):
+    """
+    Exact distribution of final hits for one Edge option after a roll.
+    Attributes:
+        hits: hits[k] is the probability of ending with exactly k hits.
+        at_least: at_least[k] is the probability of ending with k or more hits.
+        expected_hits: Mean number of final hits.
+    """
+    hits: Tuple[float, ...]
+    at_least: Tuple[float, ...]
+    expected_hits: float
+
+    def chance_of(self, target_hits: int) -> float:
+        """
+        Returns the probability of ending with at least target_hits hits.
+        """
+        if target_hits <= 0:
+            return 1.0
+        if target_hits >= len(self.at_least):
+            return 0.0
+        return self.at_least[target_hits]
+
+
+def _outcome(dice_pool: int, current_hits: int, success_faces: int, faces: int) -> EdgeOutcome:
+    """
+    Distribution of current_hits + Binomial(failures, success_faces / faces), exactly.
+    """
+    failures = dice_pool - current_hits
+    counts = _binomial_counts(failures, success_faces, faces - success_faces)
+    total = faces ** failures
+    hits = (0.0,) * current_hits + tuple(c / total for c in counts)
+    at_least = []
+    running = 0
+    for c in reversed(counts):
+        running += c
+        at_least.append(running / total)
+    at_least = [1.0] * current_hits + at_least[::-1]
+    return EdgeOutcome(hits, tuple(at_least), current_hits + failures * success_faces / faces)
+
+
+@lru_cache(maxsize=_EDGE_CACHE_SIZE)
+def _build_edge_options(dice_pool: int, current_hits: int, hit_threshold: int) -> Dict[str, EdgeOutcome]:
+    """
+    Builds the outcomes of every Edge option for one (pool, hits) state; memoized.
+    """
+    options = {
+        NO_EDGE: _outcome(dice_pool, current_hits, 0, 1),
+        REROLL_FAILURES: _outcome(dice_pool, current_hits, _SIDES + 1 - hit_threshold, _SIDES),
+    }
+    if hit_threshold > 4:
+        # A failed die is uniform over 1..threshold-1; the 4+ threshold turns 4..threshold-1 into hits.
+        options[EDGE_THRESHOLD] = _outcome(dice_pool, current_hits, hit_threshold - 4, hit_threshold - 1)
+    return options
+
+
+def edge_options(dice_pool: int, current_hits: int, hit_threshold: int = 5) -> Dict[str, EdgeOutcome]:
+    """
+    Returns the exact final-hit distribution of each Edge option after a roll.
+    Use this (or advise_edge) when a player asks whether spending Edge is worth it.
+    Args:
+        dice_pool: Number of dice rolled.
+        current_hits: Hits the roll scored.
+        hit_threshold: Threshold the roll used (default 5).
+    Returns:
+        Dict with 'none' (keep the roll), 'reroll_failures' (as reroll_failures) and, for
+        thresholds above 4, 'threshold_4' (count 4s as hits, as roll_cue with edge=True),
+        each an EdgeOutcome.
+    Raises:
+        ValueError: If current_hits is outside 0..dice_pool or hit_threshold is not 2-6.
+    Notes:
+        Only the hit count is known here, so each failed die is taken as equally likely to
+        show any non-hit face. Tables are exact and memoized per (pool, hits, threshold),
+        so repeat questions are a cache hit.
+    """
+    _check_type("dice_pool", dice_pool, int)
+    _check_type("current_hits", current_hits, int)
+    _check_type("hit_threshold", hit_threshold, int)
+    if not 2 <= hit_threshold <= _SIDES:
+        raise ValueError(f"'hit_threshold' must be between 2 and {_SIDES}, got {hit_threshold}")
+    dice_pool = max(0, dice_pool)
+    if not 0 <= current_hits <= dice_pool:
+        raise ValueError(f"'current_hits' must be between 0 and {dice_pool}, got {current_hits}")
+    return dict(_build_edge_options(dice_pool, current_hits, hit_threshold))
+
+
+def edge_table(dice_pool: int, hit_threshold: int = 5) -> Tuple[Dict[str, EdgeOutcome], ...]:
+    """
+    Returns edge_options for every possible hit count of a pool (index = current hits),
+    filling the cache; use it to precompute the pool sizes a table plays with.
+    """
+    return tuple(edge_options(dice_pool, hits, hit_threshold) for hits in range(max(0, dice_pool) + 1))
+
+
+def advise_edge(
+    rolls: Optional[List[int]] = None,
+    target_hits: Optional[int] = None,
+    hit_threshold: int = 5,
+    dice_pool: Optional[int] = None,
+    current_hits: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Recommends whether and how to spend Edge after a roll.
+    Use this when a player asks "should I use Edge?" after roll_cue.
+    Args:
+        rolls: The dice as rolled (e.g., from roll_cue). Alternatively give dice_pool and
+            current_hits.
+        target_hits: Hits needed to succeed; without it, options are compared by expected hits.
+        hit_threshold: Threshold the roll used (default 5).
+        dice_pool, current_hits: The roll's size and hits when rolls are not given.
+    Returns:
+        Dict with 'options' (name -> {'expected_hits', 'success'}, success being the chance
+        of reaching target_hits or None), 'recommendation' ('none', 'reroll_failures' or
+        'threshold_4') and 'gain' (how much the recommendation improves on 'none', in success
+        probability with a target, else in expected hits).
+    Raises:
+        ValueError: If neither rolls nor dice_pool and current_hits are given.
+    Notes:
+        With rolls given, 'threshold_4' is exact: the 4s already on the table count.
+        Spending Edge is only recommended when it helps; with a target, ties in success
+        are broken by expected hits.
+    """
+    if target_hits is not None:
+        _check_type("target_hits", target_hits, int)
+    known_threshold_hits = None
+    if rolls is not None:
+        _check_list_of("rolls", rolls, int)
+        dice_pool = len(rolls)
+        current_hits = sum(1 for r in rolls if r >= hit_threshold)
+        known_threshold_hits = sum(1 for r in rolls if r >= 4)
+    elif dice_pool is None or current_hits is None:
+        raise ValueError("advise_edge needs rolls, or dice_pool and current_hits")
+    outcomes = edge_options(dice_pool, current_hits, hit_threshold)
+    if known_threshold_hits is not None and EDGE_THRESHOLD in outcomes:
+        outcomes[EDGE_THRESHOLD] = _outcome(known_threshold_hits, known_threshold_hits, 0, 1)
+
+    def rank(name: str) -> Tuple[float, float]:
+        outcome = outcomes[name]
+        if target_hits is None:
+            return outcome.expected_hits, 0.0
+        return outcome.chance_of(target_hits), outcome.expected_hits
+
+    best = max(outcomes, key=rank)
+    if rank(best) <= rank(NO_EDGE):
+        best = NO_EDGE
+    gain = rank(best)[0] - rank(NO_EDGE)[0]
+    advice = {
+        "options": {
+            name: {
+                "expected_hits": outcome.expected_hits,
+                "success": outcome.chance_of(target_hits) if target_hits is not None else None,
+            }
+            for name, outcome in outcomes.items()
+        },
+        "recommendation": best,
+        "gain": gain,
+    }
+    log_event(
+        logger, logging.INFO, "dice.edge_advice",
+        "Edge advice for %(hits)s/%(dice_pool)s hits (target=%(target)s): %(recommendation)s (+%(gain).3f)",
+        hits=current_hits, dice_pool=dice_pool, target=target_hits, recommendation=best, gain=gain,
+    )
+    return advice
+
+
+def clear_edge_cache() -> None:
+    """
+    Drops all memoized Edge option tables.
+    """
+    _build_edge_options.cache_clear()
@@ -0,0 +1,334 @@
+import logging
+import os
+import random
+from typing import Any, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# ---------- RNG Providers ----------
+
+_DIE_FACES = (1, 2, 3, 4, 5, 6)
+# Below this many dice, NumPy's per-call overhead costs more than it saves.
+_NUMPY_MIN_DICE = 64
+# Largest byte value that maps evenly onto a d6 (252 = 42 * 6); higher bytes are rejected.
+_BYTE_LIMIT = 252
+
+_numpy: Any = None
+_numpy_checked = False
+
+
+def _load_numpy() -> Any:
+    """
+    Imports NumPy on the first large draw and returns it, or None when it is not installed.
+    Keeps `import rng` (and every mechanic) free of NumPy's import cost until it pays off.
+    """
+    global _numpy, _numpy_checked
+    if not _numpy_checked:
+        try:
+            import numpy
+        except ImportError:  # NumPy is optional; providers fall back to the stdlib.
+            numpy = None
+        _numpy, _numpy_checked = numpy, True
+    return _numpy
+
+
+def _numpy_generator(seed: Optional[int]) -> Any:
+    """
+    Returns a numpy.random.Generator for seed, or None when NumPy is not installed.
+    """
+    numpy = _load_numpy()
+    return numpy.random.default_rng(seed) if numpy is not None else None
+
+
+class RNGProvider:
+    """
+    Base class for the random number sources used by every mechanic.
+    Give each session (or simulation trial) its own provider instance so sessions never
+    share generator state and any session can be seeded or replayed on its own.
+    Subclasses implement d6, randint, choice, and random.
+    """
+
+    def d6(self, count: int) -> Sequence[int]:
+        """
+        Rolls count d6 in one call.
+        Returns a list, or a NumPy int array for large draws when NumPy is available.
+        """
+        raise NotImplementedError
+
+    def randint(self, low: int, high: int) -> int:
+        """
+        Returns a random integer N such that low <= N <= high.
+        """
+        raise NotImplementedError
+
+    def choice(self, seq: Sequence[Any]) -> Any:
+        """
+        Returns a random element from a non-empty sequence.
+        """
+        return seq[self.randint(0, len(seq) - 1)]
+
+    def random(self) -> float:
+        """
+        Returns a random float in [0.0, 1.0).
+        """
+        raise NotImplementedError
+
+
+class SeededRNG(RNGProvider):
+    """
+    Per-session generator backed by random.Random, plus NumPy for large dice draws.
+    Args:
+        seed: Seed value; None seeds from system entropy.
+    Notes:
+        The same seed always produces the same stream of results. NumPy is imported on the
+        first draw of _NUMPY_MIN_DICE or more dice, not when the provider is created.
+    """
+
+    def __init__(self, seed: Optional[int] = None) -> None:
+        self.seed = seed
+        self._random = random.Random(seed)
+        self._np_rng: Any = None  # created on the first large draw
+        self._np_loaded = False
+
+    def _numpy_rng(self) -> Any:
+        if not self._np_loaded:
+            self._np_rng = _numpy_generator(self.seed)
+            self._np_loaded = True
+        return self._np_rng
+
+    def d6(self, count: int) -> Sequence[int]:
+        if count >= _NUMPY_MIN_DICE:
+            np_rng = self._numpy_rng()
+            if np_rng is not None:
+                return np_rng.integers(1, 7, size=count, dtype="int8")
+        return self._random.choices(_DIE_FACES, k=count)
+
+    def randint(self, low: int, high: int) -> int:
+        return self._random.randint(low, high)
+
+    def choice(self, seq: Sequence[Any]) -> Any:
+        return self._random.choice(seq)
+
+    def random(self) -> float:
+        return self._random.random()
+
+
+class BufferedRNG(RNGProvider):
+    """
+    Generator that pre-draws d6 results in bulk chunks and hands them out from a buffer.
+    Use this for hot paths that roll many small pools; each d6 call becomes a list slice.
+    Args:
+        seed: Seed value for the NumPy/stdlib backends; must be None with use_urandom.
+        chunk_size: Number of dice drawn per refill.
+        use_urandom: If True, dice come from os.urandom bytes (not seedable).
+    Raises:
+        ValueError: If a seed is given together with use_urandom.
+    Notes:
+        Refills come from numpy.random.Generator when NumPy is installed, otherwise
+        from random.Random. Non-dice draws (randint, choice, random) are not buffered.
+    """
+
+    def __init__(self, seed: Optional[int] = None, chunk_size: int = 4096, use_urandom: bool = False) -> None:
+        if use_urandom and seed is not None:
+            raise ValueError("'seed' cannot be used with use_urandom=True")
+        self.seed = seed
+        self.chunk_size = max(1, chunk_size)
+        self.use_urandom = use_urandom
+        self._random = random.SystemRandom() if use_urandom else random.Random(seed)
+        self._np_rng: Any = None  # created on the first refill
+        self._np_loaded = use_urandom
+        self._buffer: List[int] = []
+        self._pos = 0
+
+    def _draw(self, count: int) -> Sequence[int]:
+        """
+        Draws count dice straight from the backend, bypassing the buffer.
+        """
+        if self.use_urandom:
+            faces: List[int] = []
+            while len(faces) < count:
+                needed = count - len(faces)
+                # ~2% of bytes are rejected, so over-draw slightly to usually finish in one pass.
+                faces.extend(b % 6 + 1 for b in os.urandom(needed + needed // 32 + 8) if b < _BYTE_LIMIT)
+            del faces[count:]
+            return faces
+        if not self._np_loaded:
+            self._np_rng = _numpy_generator(self.seed)
+            self._np_loaded = True
+        if self._np_rng is not None:
+            return self._np_rng.integers(1, 7, size=count, dtype="int8")
+        return self._random.choices(_DIE_FACES, k=count)
+
+    def d6(self, count: int) -> Sequence[int]:
+        if count >= self.chunk_size:
+            return self._draw(count)
+        end = self._pos + count
+        if end > len(self._buffer):
+            fresh = self._draw(self.chunk_size)
+            fresh = fresh.tolist() if not isinstance(fresh, list) else fresh
+            self._buffer = self._buffer[self._pos:] + fresh
+            self._pos = 0
+            end = count
+        faces = self._buffer[self._pos:end]
+        self._pos = end
+        return faces
+
+    def randint(self, low: int, high: int) -> int:
+        return self._random.randint(low, high)
+
+    def choice(self, seq: Sequence[Any]) -> Any:
+        return self._random.choice(seq)
+
+    def random(self) -> float:
+        return self._random.random()
+
+
+class RecordingRNG(RNGProvider):
+    """
+    Wraps another provider and records every draw for audits and replays.
+    Args:
+        inner: The provider that actually generates the values.
+    Notes:
+        events is a JSON-serializable list of [method, value] pairs; save it with
+        serialize_data and feed it to ReplayRNG to reproduce the session exactly.
+        choice is recorded as the chosen index so replays work with any element type.
+    """
+
+    def __init__(self, inner: RNGProvider) -> None:
+        self.inner = inner
+        self.events: List[List[Any]] = []
+
+    def d6(self, count: int) -> Sequence[int]:
+        faces = self.inner.d6(count)
+        self.events.append(["d6", faces.tolist() if not isinstance(faces, list) else list(faces)])
+        return faces
+
+    def randint(self, low: int, high: int) -> int:
+        value = self.inner.randint(low, high)
+        self.events.append(["randint", value])
+        return value
+
+    def choice(self, seq: Sequence[Any]) -> Any:
+        index = self.inner.choice(range(len(seq)))  # same draw as choosing from seq itself
+        self.events.append(["choice", index])
+        return seq[index]
+
+    def random(self) -> float:
+        value = self.inner.random()
+        self.events.append(["random", value])
+        return value
+
+
+class ReplayRNG(RNGProvider):
+    """
+    Replays a stream recorded by RecordingRNG, in order.
+    Args:
+        events: The recorded [method, value] pairs.
+    Raises:
+        ValueError: (on draw) If the mechanics request something other than what was recorded,
+            or the recording is exhausted.
+    """
+
+    def __init__(self, events: List[List[Any]]) -> None:
+        self.events = events
+        self._pos = 0
+
+    def _next(self, method: str) -> Any:
+        if self._pos >= len(self.events):
+            raise ValueError(f"Replay exhausted after {self._pos} events (wanted '{method}')")
+        recorded, value = self.events[self._pos]
+        if recorded != method:
+            raise ValueError(f"Replay mismatch at event {self._pos}: recorded '{recorded}', wanted '{method}'")
+        self._pos += 1
+        return value
+
+    def d6(self, count: int) -> Sequence[int]:
+        faces = self._next("d6")
+        if len(faces) != count:
+            raise ValueError(f"Replay mismatch at event {self._pos - 1}: recorded {len(faces)} dice, wanted {count}")
+        return list(faces)
+
+    def randint(self, low: int, high: int) -> int:
+        return self._next("randint")
+
+    def choice(self, seq: Sequence[Any]) -> Any:
+        return seq[self._next("choice")]
+
+    def random(self) -> float:
+        return self._next("random")
+
+
+class AliasSampler:
+    """
+    Walker/Vose alias table for O(1) weighted draws of an index.
+    Args:
+        weights: Non-negative weights, one per outcome; at least one must be positive.
+    Raises:
+        ValueError: If weights is empty, has a negative entry, or sums to zero.
+    Notes:
+        Building the table is O(n); every draw afterwards costs one randint and one random.
+    """
+
+    def __init__(self, weights: Sequence[float]) -> None:
+        count = len(weights)
+        if count == 0:
+            raise ValueError("'weights' must not be empty")
+        if any(w < 0 for w in weights):
+            raise ValueError("'weights' must not contain negative values")
+        total = float(sum(weights))
+        if total <= 0:
+            raise ValueError("'weights' must have a positive sum")
+        scaled = [w * count / total for w in weights]
+        self.prob = [1.0] * count
+        self.alias = list(range(count))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.prob[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Anything left over is 1.0 up to rounding error and keeps prob 1.0.
+
+    def __len__(self) -> int:
+        return len(self.prob)
+
+    def draw(self, rng: RNGProvider) -> int:
+        """
+        Returns one index, drawn with probability proportional to its weight.
+        """
+        column = rng.randint(0, len(self.prob) - 1)
+        return column if rng.random() < self.prob[column] else self.alias[column]
+
+    def draw_many(self, count: int, rng: RNGProvider) -> List[int]:
+        """
+        Returns count independent weighted draws.
+        """
+        last = len(self.prob) - 1
+        prob, alias = self.prob, self.alias
+        draws = []
+        for _ in range(count):
+            column = rng.randint(0, last)
+            draws.append(column if rng.random() < prob[column] else alias[column])
+        return draws
+
+
+_default_rng: RNGProvider = SeededRNG()
+
+
+def get_default_rng() -> RNGProvider:
+    """
+    Returns the provider used by mechanics that are not given an explicit rng.
+    """
+    return _default_rng
+
+
+def set_default_rng(provider: RNGProvider) -> None:
+    """
+    Replaces the provider used by mechanics that are not given an explicit rng.
+    """
+    global _default_rng
+    if not isinstance(provider, RNGProvider):
+        raise TypeError(f"'provider' must be RNGProvider, got {type(provider).__name__}")
+    _default_rng = provider
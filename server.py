@@ -0,0 +1,686 @@
+import argparse
+import asyncio
+import dataclasses
+import hmac
+import inspect
+import logging
+import os
+import secrets
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import anarchy
+import metrics
+import persistence
+from eventlog import configure_logging, log_event
+from validation import _check_type
+
+logger = logging.getLogger(__name__)
+
+# ---------- Async Tool-Call Server ----------
+#
+# JSON-RPC 2.0 over HTTP/1.1 (stdlib asyncio only). Every public function of the anarchy
+# package is a method of the same name; params are a list (positional) or an object (keyword).
+# Concurrent roll_cue calls are micro-batched into one roll_cue_many draw, file I/O runs in
+# the loop's executor, and campaigns stay in memory between calls (campaign.* methods).
+#
+# Every filepath argument is resolved under the server's data root; paths that leave it are
+# rejected. Over HTTP, requests must carry 'Authorization: Bearer <token>' and
+# 'Content-Type: application/json', and requests with an Origin header (i.e. from a web
+# page) are refused, so a browser cannot reach the server on the user's behalf.
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+
+# anarchy functions that touch the filesystem; they always run in the executor.
+_IO_FUNCTIONS = {
+    "serialize_data", "deserialize_data", "save_campaign", "load_campaign",
+    "save_character", "load_character", "iter_campaign_sessions",
+}
+_MAX_BODY = 16 * 1024 * 1024
+# Object arguments that cannot come from JSON and would bypass the data root.
+_LOCAL_ONLY_ARGUMENTS = ("rng", "store", "cache", "manager")
+
+
+class RPCError(Exception):
+    """
+    A JSON-RPC error, raised by clients and used internally for error responses.
+    """
+
+    def __init__(self, code: int, message: str, data: Any = None) -> None:
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.data = data
+
+    def to_dict(self) -> Dict[str, Any]:
+        error = {"code": self.code, "message": self.message}
+        if self.data is not None:
+            error["data"] = self.data
+        return error
+
+
+def _jsonable(value: Any) -> Any:
+    """
+    Converts a tool result to JSON-ready data (tuples to lists, models via to_dict).
+    """
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, dict):
+        return {key: _jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    if dataclasses.is_dataclass(value):
+        return _jsonable(dataclasses.asdict(value))
+    raise TypeError(f"Result of type {type(value).__name__} is not JSON serializable")
+
+
+def _public_functions() -> Dict[str, Callable[..., Any]]:
+    # Loads every anarchy submodule; a server needs them all anyway.
+    functions = {name: getattr(anarchy, name) for name in anarchy.__all__}
+    return {name: fn for name, fn in functions.items() if inspect.isfunction(fn)}
+
+
+class _DiceBatcher:
+    """
+    Collects roll_cue requests made in the same window and rolls them with one
+    roll_cue_many call per edge setting.
+    """
+
+    def __init__(self, window: float, max_batch: int) -> None:
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: List[Tuple[int, bool, asyncio.Future]] = []
+        self._timer: Optional[asyncio.Handle] = None
+        self.batches = 0
+
+    async def roll(self, dice_pool: int, edge: bool) -> Tuple[int, List[int]]:
+        _check_type("dice_pool", dice_pool, int)
+        _check_type("edge", edge, bool)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((dice_pool, edge, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            if self.window > 0:
+                self._timer = loop.call_later(self.window, self._flush)
+            else:
+                self._timer = loop.call_soon(self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        self.batches += 1
+        for edge in (False, True):
+            group = [(pool, future) for pool, flag, future in batch if flag is edge]
+            if not group:
+                continue
+            try:
+                results = anarchy.roll_cue_many([pool for pool, _ in group], edge=edge)
+            except Exception as exc:  # reported to every caller in the group
+                for _, future in group:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            for (_, future), result in zip(group, results):
+                if not future.done():
+                    future.set_result((result.hits, result.rolls))
+
+
+class _CampaignState:
+    """
+    One campaign held in memory, with indexes built on first use.
+    """
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self.data = data
+        self.lock = asyncio.Lock()
+        self.dirty = False
+        self._npcs: Any = None
+        self._briefs: Any = None
+        self._sessions: Any = None
+
+    def npcs(self) -> Any:
+        if self._npcs is None:
+            from npc_registry import NPCRegistry
+
+            self._npcs = NPCRegistry.from_campaign(self.data)
+        return self._npcs
+
+    def briefs(self) -> Any:
+        if self._briefs is None:
+            from brief_index import BriefIndex
+
+            self._briefs = BriefIndex.from_campaign(self.data)
+        return self._briefs
+
+    def sessions(self, filepath: str) -> Any:
+        # Loads the index saved next to the campaign; later calls only index new sessions.
+        if self._sessions is None:
+            from session_index import SessionIndex
+
+            self._sessions = SessionIndex.open(filepath, self.data)
+        else:
+            self._sessions.sync(self.data)
+        return self._sessions
+
+    def save_sessions(self, filepath: str) -> None:
+        if self._sessions is not None:
+            from session_index import index_path_for
+
+            self._sessions.save(index_path_for(filepath))
+
+    def replace(self, data: Dict[str, Any]) -> None:
+        self.data = data
+        self._npcs = self._briefs = self._sessions = None
+
+
+class ToolServer:
+    """
+    Asyncio JSON-RPC server exposing the anarchy mechanics as tool calls.
+    Use this to serve the GPT's tool calls from one long-running process.
+    Args:
+        batch_window: Seconds to wait collecting concurrent roll_cue calls (0: same loop tick).
+        max_batch: Roll immediately once this many roll_cue calls are waiting.
+        data_root: Directory every filepath argument is resolved under (default: the current
+            directory). Relative paths are taken from it; paths outside it are refused.
+        token: Bearer token HTTP requests must present (default: a random one, readable
+            from the token attribute).
+    Notes:
+        Methods are the anarchy package's public functions plus campaign.open/get/save/close,
+        campaign.get_random_npc, campaign.get_contract_brief, campaign.log_session,
+        campaign.spend_karma, campaign.search_sessions and campaign.sessions_mentioning,
+        which work on the in-memory copy of a campaign file, and
+        metrics.enable/snapshot/profile/memory for the instrumentation in metrics.py.
+        load_campaign is served from memory once a campaign is open, and save_campaign
+        updates the in-memory copy. Use LocalClient to call it in-process (e.g., in tests)
+        and serve()/start() for HTTP.
+    """
+
+    def __init__(
+        self,
+        batch_window: float = 0.001,
+        max_batch: int = 1024,
+        data_root: Optional[str] = None,
+        token: Optional[str] = None,
+    ) -> None:
+        if token is not None:
+            _check_type("token", token, str)
+            if not token:
+                raise ValueError("'token' must not be empty")
+        self.data_root = os.path.realpath(data_root if data_root is not None else os.getcwd())
+        self.token = token if token is not None else secrets.token_urlsafe(32)
+        self.functions = _public_functions()
+        self.dice = _DiceBatcher(batch_window, max_batch)
+        self.campaigns: Dict[str, _CampaignState] = {}
+        self._loading: Dict[str, asyncio.Future] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self.methods: Dict[str, Callable[..., Any]] = {
+            "campaign.open": self._campaign_open,
+            "campaign.get": self._campaign_get,
+            "campaign.save": self._campaign_save,
+            "campaign.close": self._campaign_close,
+            "campaign.get_random_npc": self._campaign_npc,
+            "campaign.get_contract_brief": self._campaign_brief,
+            "campaign.log_session": self._campaign_log_session,
+            "campaign.spend_karma": self._campaign_spend_karma,
+            "campaign.search_sessions": self._campaign_search_sessions,
+            "campaign.sessions_mentioning": self._campaign_sessions_mentioning,
+            "metrics.enable": self._metrics_enable,
+            "metrics.snapshot": self._metrics_snapshot,
+            "metrics.profile": self._metrics_profile,
+            "metrics.memory": self._metrics_memory,
+        }
+
+    # --- helpers ---
+
+    def resolve_path(self, filepath: Any) -> str:
+        """
+        Returns filepath resolved (symlinks included) under the data root.
+        Raises:
+            RPCError: (INVALID_PARAMS) If filepath is not a string or resolves outside the root.
+        """
+        if not isinstance(filepath, str) or not filepath:
+            raise RPCError(INVALID_PARAMS, "'filepath' must be a non-empty string")
+        resolved = os.path.realpath(os.path.join(self.data_root, filepath))
+        if os.path.commonpath([self.data_root, resolved]) != self.data_root:
+            raise RPCError(INVALID_PARAMS, f"'filepath' must be inside the server's data root: {filepath}")
+        return resolved
+
+    def _bind(self, fn: Callable[..., Any], args: List[Any], kwargs: Dict[str, Any]) -> inspect.BoundArguments:
+        # Binds RPC params, refuses local-only objects and confines filepath to the data root.
+        bound = inspect.signature(fn).bind(*args, **kwargs)
+        for name in _LOCAL_ONLY_ARGUMENTS:
+            if bound.arguments.get(name) is not None:
+                raise TypeError(f"{name} cannot be passed over RPC")
+        if "filepath" in bound.arguments:
+            bound.arguments["filepath"] = self.resolve_path(bound.arguments["filepath"])
+        return bound
+
+    async def _run_io(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, lambda: fn(*args, **kwargs))
+
+    async def _state(self, filepath: str) -> _CampaignState:
+        """
+        Returns the in-memory campaign for a path, loading it (once) in the executor.
+        """
+        _check_type("filepath", filepath, str)
+        key = os.path.abspath(filepath)
+        state = self.campaigns.get(key)
+        if state is not None:
+            return state
+        pending = self._loading.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._run_io(anarchy.load_campaign, filepath))
+            self._loading[key] = pending
+        try:
+            data = await pending
+        finally:
+            self._loading.pop(key, None)
+        return self.campaigns.setdefault(key, _CampaignState(data))
+
+    # --- campaign.* methods ---
+
+    async def _campaign_open(self, filepath: str) -> Dict[str, int]:
+        data = (await self._state(filepath)).data
+        return {key: len(data.get(key, [])) for key in ("characters", "npcs", "sessions", "briefs")}
+
+    async def _campaign_get(self, filepath: str) -> Dict[str, Any]:
+        return (await self._state(filepath)).data
+
+    async def _campaign_save(self, filepath: str, pretty: bool = True) -> bool:
+        state = await self._state(filepath)
+        async with state.lock:
+            await self._run_io(anarchy.save_campaign, state.data, filepath, pretty=pretty)
+            state.dirty = False
+            await self._run_io(state.save_sessions, filepath)
+        return True
+
+    async def _campaign_close(self, filepath: str, save: bool = True) -> bool:
+        key = os.path.abspath(filepath)
+        state = self.campaigns.get(key)
+        if state is None:
+            return False
+        if save and state.dirty:
+            await self._campaign_save(filepath)
+        self.campaigns.pop(key, None)
+        return True
+
+    async def _campaign_npc(self, filepath: str, tag: Optional[str] = None) -> Dict[str, Any]:
+        return anarchy.get_random_npc((await self._state(filepath)).npcs(), tag)
+
+    async def _campaign_brief(self, filepath: str, name: str) -> Dict[str, Any]:
+        return anarchy.get_contract_brief((await self._state(filepath)).briefs(), name)
+
+    async def _campaign_log_session(self, filepath: str, session: Dict[str, Any]) -> int:
+        _check_type("session", session, dict)
+        state = await self._state(filepath)
+        async with state.lock:
+            state.data.setdefault("sessions", []).append(session)
+            state.dirty = True
+        return len(state.data["sessions"])
+
+    async def _campaign_spend_karma(self, filepath: str, character: str, category: str, amount: int) -> Dict[str, Any]:
+        _check_type("character", character, str)
+        state = await self._state(filepath)
+        async with state.lock:
+            characters = state.data.get("characters", [])
+            for index, entry in enumerate(characters):
+                if entry.get("name") == character:
+                    characters[index] = anarchy.character_spend_karma(entry, category, amount)
+                    state.dirty = True
+                    return characters[index]
+        raise KeyError(f"No character named '{character}' in campaign")
+
+    async def _campaign_search_sessions(self, filepath: str, query: str, k: int = 5) -> List[Dict[str, Any]]:
+        state = await self._state(filepath)
+        async with state.lock:
+            index = await self._run_io(state.sessions, filepath)
+            return index.search(query, k)
+
+    async def _campaign_sessions_mentioning(
+        self, filepath: str, text: str, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        state = await self._state(filepath)
+        async with state.lock:
+            index = await self._run_io(state.sessions, filepath)
+            return index.mentioning(text, limit)
+
+    # --- metrics.* methods ---
+
+    async def _metrics_enable(self, enabled: bool = True) -> bool:
+        metrics.enable(enabled)
+        return metrics.is_enabled()
+
+    async def _metrics_snapshot(self) -> Dict[str, Any]:
+        return metrics.snapshot()
+
+    async def _metrics_profile(self, capture: bool) -> Optional[str]:
+        # Profiles the event loop thread between a start (True) and a stop (False) call.
+        if capture:
+            metrics.start_profile()
+            return None
+        return metrics.stop_profile()
+
+    async def _metrics_memory(self, capture: bool) -> Optional[str]:
+        if capture:
+            metrics.start_memory_trace()
+            return None
+        return metrics.stop_memory_trace()
+
+    # --- dispatch ---
+
+    async def call(self, method: str, params: Any = None) -> Any:
+        """
+        Runs one method and returns its JSON-ready result.
+        Raises:
+            RPCError: For unknown methods, bad params, or failures inside the method.
+        """
+        args: List[Any] = params if isinstance(params, list) else []
+        kwargs: Dict[str, Any] = params if isinstance(params, dict) else {}
+        if params is not None and not isinstance(params, (list, dict)):
+            raise RPCError(INVALID_REQUEST, "params must be an array or an object")
+        try:
+            if method in self.methods:
+                bound = self._bind(self.methods[method], args, kwargs)
+                result = await self.methods[method](*bound.args, **bound.kwargs)
+            elif method == "roll_cue":
+                bound = self._bind(anarchy.roll_cue, args, kwargs)
+                bound.apply_defaults()
+                result = await self.dice.roll(bound.arguments["dice_pool"], bound.arguments["edge"])
+            elif method in self.functions:
+                bound = self._bind(self.functions[method], args, kwargs)
+                result = await self._call_function(method, list(bound.args), bound.kwargs)
+            else:
+                raise RPCError(METHOD_NOT_FOUND, f"Method '{method}' not found")
+            return _jsonable(result)
+        except RPCError:
+            raise
+        except TypeError as exc:
+            raise RPCError(INVALID_PARAMS, str(exc)) from exc
+        except (KeyError, ValueError, OSError, RuntimeError) as exc:
+            raise RPCError(SERVER_ERROR, f"{type(exc).__name__}: {exc}") from exc
+
+    async def _call_function(self, name: str, args: List[Any], kwargs: Dict[str, Any]) -> Any:
+        fn = self.functions[name]
+        # Called with params already bound by _bind: no store/cache/manager, filepath resolved.
+        if name == "load_campaign":
+            bound = inspect.signature(fn).bind(*args, **kwargs)
+            return (await self._state(bound.arguments["filepath"])).data
+        if name == "save_campaign":
+            bound = inspect.signature(fn).bind(*args, **kwargs)
+            campaign, filepath = bound.arguments["campaign"], bound.arguments["filepath"]
+            if not isinstance(campaign, dict):
+                await self._run_io(fn, *args, **kwargs)
+                return None
+            # Write and swap under the state's lock, as campaign.save does, so no in-memory
+            # change or concurrent save can land between the write and the swap.
+            key = os.path.abspath(filepath)
+            state = self.campaigns.setdefault(key, _CampaignState(campaign))
+            async with state.lock:
+                await self._run_io(fn, *args, **kwargs)
+                if state.data is not campaign:
+                    state.replace(campaign)
+                state.dirty = False
+            return None
+        if name == "iter_campaign_sessions":
+            return await self._run_io(lambda: list(fn(*args, **kwargs)))
+        if name in _IO_FUNCTIONS:
+            return await self._run_io(fn, *args, **kwargs)
+        return fn(*args, **kwargs)
+
+    async def handle_request(self, request: Any) -> Optional[Dict[str, Any]]:
+        """
+        Handles one decoded JSON-RPC request object; returns None for notifications.
+        """
+        if not isinstance(request, dict) or request.get("jsonrpc") != "2.0" or not isinstance(request.get("method"), str):
+            return {"jsonrpc": "2.0", "id": None, "error": RPCError(INVALID_REQUEST, "Invalid Request").to_dict()}
+        request_id = request.get("id")
+        try:
+            result = await self.call(request["method"], request.get("params"))
+            response = {"jsonrpc": "2.0", "id": request_id, "result": result}
+        except RPCError as exc:
+            response = {"jsonrpc": "2.0", "id": request_id, "error": exc.to_dict()}
+        except Exception as exc:
+            log_event(
+                logger, logging.ERROR, "server.method_failed", "Method %(method)s failed: %(error)s",
+                method=request["method"], error=repr(exc),
+            )
+            response = {"jsonrpc": "2.0", "id": request_id, "error": RPCError(SERVER_ERROR, "Internal error").to_dict()}
+        return response if "id" in request else None
+
+    async def handle_payload(self, payload: bytes) -> Optional[bytes]:
+        """
+        Handles a raw JSON-RPC payload (single request or batch) and returns the encoded
+        response, or None when there is nothing to send back.
+        Notes:
+            Requests in a batch run concurrently, so their roll_cue calls share one draw.
+        """
+        try:
+            message = persistence.decode_json(payload)
+        except ValueError:
+            error = RPCError(PARSE_ERROR, "Parse error").to_dict()
+            return persistence.encode_json({"jsonrpc": "2.0", "id": None, "error": error}, pretty=False)
+        if isinstance(message, list):
+            if not message:
+                error = RPCError(INVALID_REQUEST, "Invalid Request").to_dict()
+                return persistence.encode_json({"jsonrpc": "2.0", "id": None, "error": error}, pretty=False)
+            responses = [r for r in await asyncio.gather(*map(self.handle_request, message)) if r is not None]
+            return persistence.encode_json(responses, pretty=False) if responses else None
+        response = await self.handle_request(message)
+        return persistence.encode_json(response, pretty=False) if response is not None else None
+
+    # --- HTTP ---
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                parts = request_line.decode("latin-1").split()
+                headers: Dict[str, str] = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = len(parts) == 3 and parts[2] == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                length = int(headers.get("content-length", "0") or 0)
+                if len(parts) != 3 or parts[0] not in ("GET", "POST"):
+                    await self._respond(writer, 405, b"", keep_alive=False)
+                    break
+                status = self._check_headers(headers)
+                if status is not None:
+                    await self._respond(writer, status, b"", keep_alive=False)
+                    break
+                if parts[0] == "GET" and parts[1].split("?")[0] == "/metrics":
+                    body = metrics.export_prometheus().encode("utf-8")
+                    await self._respond(writer, 200, body, keep_alive, "text/plain; version=0.0.4; charset=utf-8")
+                    if not keep_alive:
+                        break
+                    continue
+                if parts[0] != "POST":
+                    await self._respond(writer, 405, b"", keep_alive=False)
+                    break
+                if headers.get("content-type", "").split(";")[0].strip().lower() != "application/json":
+                    await self._respond(writer, 415, b"", keep_alive=False)
+                    break
+                if length > _MAX_BODY:
+                    await self._respond(writer, 413, b"", keep_alive=False)
+                    break
+                body = await reader.readexactly(length)
+                response = await self.handle_payload(body)
+                await self._respond(writer, 200 if response is not None else 204, response or b"", keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    def _check_headers(self, headers: Dict[str, str]) -> Optional[int]:
+        """
+        Returns an error status for a request that may not be served, or None.
+        """
+        if "origin" in headers:
+            return 403  # sent by browsers: a web page must never drive the server
+        scheme, _, presented = headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not hmac.compare_digest(presented.strip().encode(), self.token.encode()):
+            return 401
+        return None
+
+    async def _respond(
+        self, writer: asyncio.StreamWriter, status: int, body: bytes, keep_alive: bool,
+        content_type: str = "application/json",
+    ) -> None:
+        reasons = {
+            200: "OK", 204: "No Content", 401: "Unauthorized", 403: "Forbidden", 405: "Method Not Allowed",
+            413: "Payload Too Large", 415: "Unsupported Media Type",
+        }
+        head = (
+            f"HTTP/1.1 {status} {reasons[status]}\r\n"
+            f"Content-Type: {content_type}\r\nContent-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765) -> asyncio.AbstractServer:
+        """
+        Starts listening for HTTP JSON-RPC requests (POST, any path) and returns the server.
+        GET /metrics returns the instrumentation metrics in Prometheus text format.
+        Every request needs 'Authorization: Bearer <token>'; POSTs also need
+        'Content-Type: application/json'. Requests with an Origin header are refused.
+        Pass port=0 to pick a free port; read it from server.sockets[0].getsockname().
+        """
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        log_event(
+            logger, logging.INFO, "server.started", "Tool server listening on %(address)s",
+            address=self._server.sockets[0].getsockname(),
+        )
+        return self._server
+
+    async def close(self) -> None:
+        """
+        Stops listening and saves every campaign changed through campaign.* methods.
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for filepath, state in list(self.campaigns.items()):
+            if state.dirty:
+                await self._campaign_save(filepath)
+
+
+class LocalClient:
+    """
+    In-process client that sends JSON-RPC payloads straight to a ToolServer (no sockets).
+    Use this in tests and scripts; it exercises the same encode/dispatch/decode path as HTTP.
+    """
+
+    def __init__(self, server: ToolServer) -> None:
+        self.server = server
+        self._next_id = 0
+
+    def _request(self, method: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        if args and kwargs:
+            raise ValueError("Use positional or keyword params, not both")
+        self._next_id += 1
+        request = {"jsonrpc": "2.0", "id": self._next_id, "method": method}
+        if args or kwargs:
+            request["params"] = list(args) if args else kwargs
+        return request
+
+    @staticmethod
+    def _result(response: Dict[str, Any]) -> Any:
+        if "error" in response:
+            error = response["error"]
+            raise RPCError(error["code"], error["message"], error.get("data"))
+        return response["result"]
+
+    async def call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        """
+        Calls one method and returns its result.
+        Raises:
+            RPCError: If the server returns an error.
+        """
+        payload = persistence.encode_json(self._request(method, args, kwargs), pretty=False)
+        return self._result(persistence.decode_json(await self.server.handle_payload(payload)))
+
+    async def batch(self, calls: List[Tuple[str, Any]]) -> List[Any]:
+        """
+        Sends (method, params) pairs as one JSON-RPC batch; returns results (or RPCError
+        instances for failed calls) in the same order.
+        """
+        requests = []
+        for method, params in calls:
+            request = self._request(method, (), {})
+            if params is not None:
+                request["params"] = params
+            requests.append(request)
+        payload = persistence.encode_json(requests, pretty=False)
+        by_id = {r["id"]: r for r in persistence.decode_json(await self.server.handle_payload(payload))}
+        results = []
+        for request in requests:
+            try:
+                results.append(self._result(by_id[request["id"]]))
+            except RPCError as exc:
+                results.append(exc)
+        return results
+
+
+async def serve(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    batch_window: float = 0.001,
+    data_root: Optional[str] = None,
+    token: Optional[str] = None,
+) -> None:
+    """
+    Runs a ToolServer until cancelled (Ctrl+C), saving changed campaigns on the way out.
+    See ToolServer for data_root and token.
+    """
+    tool_server = ToolServer(batch_window=batch_window, data_root=data_root, token=token)
+    server = await tool_server.start(host, port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await tool_server.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the Shadowrun Anarchy mechanics as JSON-RPC tools.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--batch-window", type=float, default=0.001)
+    parser.add_argument("--log-level", default="INFO")
+    parser.add_argument("--json-logs", action="store_true", help="Log JSON lines instead of plain text.")
+    parser.add_argument("--data-root", default=".", help="Directory all file paths are confined to (default: .).")
+    parser.add_argument(
+        "--token", default=os.environ.get("ANARCHY_SERVER_TOKEN"),
+        help="Bearer token clients must send (default: $ANARCHY_SERVER_TOKEN, else a random one printed at start).",
+    )
+    options = parser.parse_args()
+    configure_logging(logging.getLevelName(options.log_level.upper()), json_lines=options.json_logs)
+    if not options.token:
+        options.token = secrets.token_urlsafe(32)
+        print(f"Server token: {options.token}", flush=True)
+    try:
+        asyncio.run(serve(options.host, options.port, options.batch_window, options.data_root, options.token))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,337 @@
+import logging
+import math
+import os
+import re
+import zlib
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import persistence
+from eventlog import log_event
+from validation import _check_type
+
+logger = logging.getLogger(__name__)
+
+# ---------- Session Search Index ----------
+
+INDEX_VERSION = 1
+
+_TOKEN = re.compile(r"\w+")
+_STOPWORDS = frozenset(
+    "a an and are as at be but by for from had has have he her his in into is it its of on or "
+    "she that the their them they this to was were which while who with".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Splits text into case-folded word tokens, dropping common English stopwords.
+    """
+    return [token for token in _TOKEN.findall(text.casefold()) if token not in _STOPWORDS]
+
+
+def _normalize(name: str) -> str:
+    return " ".join(name.casefold().split())
+
+
+def _session_terms(session: Dict[str, Any]) -> Tuple[List[str], List[str], List[str]]:
+    """
+    Returns (text tokens, normalized NPC names, normalized loot keys) for one session log.
+    NPC names and loot keys are tokenized into the text too, so free-text queries find them.
+    """
+    summary = session.get("summary")
+    tokens = tokenize(summary) if isinstance(summary, str) else []
+    npcs = [_normalize(name) for name in session.get("npcs") or [] if isinstance(name, str)]
+    loot = session.get("loot")
+    loot_keys = [_normalize(key) for key in loot if isinstance(key, str)] if isinstance(loot, dict) else []
+    for name in npcs + loot_keys:
+        tokens.extend(tokenize(name))
+    return tokens, npcs, loot_keys
+
+
+def _fingerprint(session: Dict[str, Any]) -> int:
+    return zlib.crc32(persistence.encode_json(session, pretty=False))
+
+
+def index_path_for(campaign_path: str) -> str:
+    """
+    Returns where a campaign's session index is kept: next to the campaign file, with
+    '.index' before the '.json' suffix ('campaign.json.gz' -> 'campaign.index.json.gz').
+    """
+    directory, base = os.path.split(campaign_path)
+    if ".json" in base:
+        stem, _, rest = base.partition(".json")
+        return os.path.join(directory, f"{stem}.index.json{rest}")
+    return f"{campaign_path}.index.json"
+
+
+class SessionIndex:
+    """
+    Incremental inverted index over a campaign's session logs, ranked with BM25.
+    Use this for recaps instead of reading every session: search() returns the top-k
+    sessions for a query and mentioning() returns the sessions that involve an NPC,
+    a loot item or a phrase.
+    Args:
+        sessions: Optional initial session logs (e.g., campaign['sessions']).
+        k1, b: BM25 term-frequency saturation and length normalization.
+        recency_weight: Share of the score that depends on recency (0 disables it).
+        half_life: Sessions after which the recency part of the score halves.
+    Notes:
+        Sessions are indexed in list order by position. The index holds the session
+        dictionaries themselves; sync() indexes sessions appended to the campaign since the
+        last call, and rebuilds when the list was shortened or replaced. Edit a session in
+        place and the index goes stale until rebuild().
+        Summaries, NPC names and loot keys are indexed; save()/open() persist the index
+        next to the campaign file.
+    """
+
+    def __init__(
+        self,
+        sessions: Optional[List[Dict[str, Any]]] = None,
+        k1: float = 1.2,
+        b: float = 0.75,
+        recency_weight: float = 0.3,
+        half_life: float = 10.0,
+    ) -> None:
+        self.k1 = k1
+        self.b = b
+        self.recency_weight = recency_weight
+        self.half_life = half_life
+        self._clear()
+        if sessions is not None:
+            self.add_many(sessions)
+
+    def _clear(self) -> None:
+        self._sessions: List[Dict[str, Any]] = []
+        self._lengths: List[int] = []
+        self._total_length = 0
+        self._postings: Dict[str, Dict[int, int]] = {}  # term -> session position -> frequency
+        self._npcs: Dict[str, Set[int]] = {}
+        self._loot: Dict[str, Set[int]] = {}
+        self._last_fingerprint: Optional[int] = None
+
+    @classmethod
+    def from_campaign(cls, campaign: Dict[str, Any], **options: Any) -> "SessionIndex":
+        """
+        Builds an index from a campaign dictionary's 'sessions' list.
+        """
+        _check_type("campaign", campaign, dict)
+        return cls(campaign.get("sessions", []), **options)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    # --- building ---
+
+    def add(self, session: Dict[str, Any]) -> None:
+        """
+        Indexes one session log (appended after those already indexed).
+        """
+        _check_type("session", session, dict)
+        doc = len(self._sessions)
+        tokens, npcs, loot_keys = _session_terms(session)
+        for term, count in Counter(tokens).items():
+            self._postings.setdefault(term, {})[doc] = count
+        for name in npcs:
+            self._npcs.setdefault(name, set()).add(doc)
+        for key in loot_keys:
+            self._loot.setdefault(key, set()).add(doc)
+        self._sessions.append(session)
+        self._lengths.append(len(tokens))
+        self._total_length += len(tokens)
+        self._last_fingerprint = None
+
+    def add_many(self, sessions: Iterable[Dict[str, Any]]) -> None:
+        """
+        Indexes several session logs in order.
+        """
+        for session in sessions:
+            self.add(session)
+
+    def rebuild(self, sessions: List[Dict[str, Any]]) -> None:
+        """
+        Drops everything and indexes sessions from scratch.
+        """
+        self._clear()
+        self.add_many(sessions)
+
+    def sync(self, campaign: Dict[str, Any]) -> int:
+        """
+        Brings the index up to date with campaign['sessions'] and returns how many sessions
+        were indexed: only the new ones when sessions were appended, all of them when the
+        list was shortened or its last indexed session no longer matches.
+        """
+        _check_type("campaign", campaign, dict)
+        sessions = campaign.get("sessions", [])
+        indexed = len(self._sessions)
+        if len(sessions) < indexed or (indexed and not self._matches(sessions[indexed - 1])):
+            self.rebuild(sessions)
+            return len(sessions)
+        self.add_many(sessions[indexed:])
+        return len(sessions) - indexed
+
+    def _matches(self, session: Dict[str, Any]) -> bool:
+        if session is self._sessions[-1]:
+            return True
+        if self._last_fingerprint is None:
+            self._last_fingerprint = _fingerprint(self._sessions[-1])
+        return _fingerprint(session) == self._last_fingerprint
+
+    # --- queries ---
+
+    def _recency(self, doc: int, recency_weight: float, half_life: float) -> float:
+        if not recency_weight:
+            return 1.0
+        age = len(self._sessions) - 1 - doc
+        return 1.0 - recency_weight + recency_weight * 0.5 ** (age / half_life)
+
+    def scores(
+        self, query: str, recency_weight: Optional[float] = None, half_life: Optional[float] = None
+    ) -> Dict[int, float]:
+        """
+        Returns session position -> relevance for every session matching any query term:
+        the BM25 score times a recency factor between 1 - recency_weight (old sessions)
+        and 1 (the latest session).
+        """
+        _check_type("query", query, str)
+        recency_weight = self.recency_weight if recency_weight is None else recency_weight
+        half_life = self.half_life if half_life is None else half_life
+        count = len(self._sessions)
+        if not count:
+            return {}
+        average = self._total_length / count or 1.0
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1.0 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc, frequency in postings.items():
+                norm = self.k1 * (1.0 - self.b + self.b * self._lengths[doc] / average)
+                scores[doc] = scores.get(doc, 0.0) + idf * frequency * (self.k1 + 1.0) / (frequency + norm)
+        return {doc: score * self._recency(doc, recency_weight, half_life) for doc, score in scores.items()}
+
+    def search(
+        self,
+        query: str,
+        k: int = 5,
+        recency_weight: Optional[float] = None,
+        half_life: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Returns the k most relevant session logs for a query, best first.
+        Args:
+            query: Free text (e.g., 'Renraku extraction ambush').
+            k: Number of sessions to return.
+            recency_weight, half_life: Override the index's recency settings for this query.
+        Returns:
+            Session dictionaries; empty if no session matches any term.
+        """
+        _check_type("k", k, int)
+        ranked = self.scores(query, recency_weight, half_life)
+        top = sorted(ranked, key=lambda doc: (-ranked[doc], -doc))[:k]
+        log_event(
+            logger, logging.DEBUG, "sessions.searched", "Session search '%(query)s': %(matches)s matches",
+            query=query, matches=len(ranked),
+        )
+        return [self._sessions[doc] for doc in top]
+
+    def mentioning(self, text: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Returns the sessions that mention text, most recent first: sessions listing it as an
+        NPC or loot key (case-insensitive), or whose indexed text contains all its words.
+        """
+        _check_type("text", text, str)
+        normalized = _normalize(text)
+        docs = set(self._npcs.get(normalized, ())) | self._loot.get(normalized, set())
+        words = tokenize(text)
+        if words:
+            postings = [self._postings.get(word, {}) for word in words]
+            postings.sort(key=len)
+            docs.update(doc for doc in postings[0] if all(doc in other for other in postings[1:]))
+        ordered = sorted(docs, reverse=True)
+        if limit is not None:
+            ordered = ordered[:limit]
+        return [self._sessions[doc] for doc in ordered]
+
+    def recent(self, k: int = 5) -> List[Dict[str, Any]]:
+        """
+        Returns the last k sessions, most recent first.
+        """
+        return self._sessions[::-1][:k]
+
+    # --- persistence ---
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns the index as JSON-ready data (session dictionaries are not included).
+        """
+        return {
+            "version": INDEX_VERSION,
+            "settings": {"k1": self.k1, "b": self.b, "recency_weight": self.recency_weight, "half_life": self.half_life},
+            "sessions": len(self._sessions),
+            "fingerprint": _fingerprint(self._sessions[-1]) if self._sessions else None,
+            "lengths": self._lengths,
+            "postings": {term: [doc for pair in postings.items() for doc in pair] for term, postings in self._postings.items()},
+            "npcs": {name: sorted(docs) for name, docs in self._npcs.items()},
+            "loot": {key: sorted(docs) for key, docs in self._loot.items()},
+        }
+
+    def save(self, filepath: str) -> None:
+        """
+        Writes the index to a file (see index_path_for), atomically.
+        """
+        persistence.write_json(self.to_dict(), filepath, pretty=False)
+
+    @classmethod
+    def open(cls, campaign_path: str, campaign: Dict[str, Any], save: bool = True) -> "SessionIndex":
+        """
+        Loads a campaign's saved index and syncs it with the campaign, indexing only the
+        sessions added since it was saved.
+        Args:
+            campaign_path: The campaign file path; the index lives at index_path_for(campaign_path).
+            campaign: The loaded campaign dictionary.
+            save: Write the index back if sync() changed it (or it had to be built).
+        Returns:
+            The up-to-date index. A missing, unreadable or mismatched index file is rebuilt.
+        """
+        _check_type("campaign", campaign, dict)
+        filepath = index_path_for(campaign_path)
+        sessions = campaign.get("sessions", [])
+        index = None
+        try:
+            index = cls._from_dict(persistence.read_json(filepath), sessions)
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError, TypeError) as exc:
+            log_event(
+                logger, logging.WARNING, "sessions.index_invalid", "Rebuilding session index %(filepath)s: %(error)s",
+                filepath=filepath, error=repr(exc),
+            )
+        if index is None:
+            index = cls.from_campaign(campaign)
+            changed = True
+        else:
+            changed = index.sync(campaign) > 0
+        if save and changed:
+            index.save(filepath)
+        return index
+
+    @classmethod
+    def _from_dict(cls, data: Dict[str, Any], sessions: List[Dict[str, Any]]) -> Optional["SessionIndex"]:
+        if data.get("version") != INDEX_VERSION:
+            raise ValueError(f"unsupported index version {data.get('version')!r}")
+        count = data["sessions"]
+        if count > len(sessions) or (count and _fingerprint(sessions[count - 1]) != data["fingerprint"]):
+            return None  # the campaign's history changed; rebuild
+        index = cls(**data["settings"])
+        index._sessions = list(sessions[:count])
+        index._lengths = list(data["lengths"])
+        index._total_length = sum(index._lengths)
+        index._postings = {
+            term: dict(zip(flat[::2], flat[1::2])) for term, flat in data["postings"].items()
+        }
+        index._npcs = {name: set(docs) for name, docs in data["npcs"].items()}
+        index._loot = {key: set(docs) for key, docs in data["loot"].items()}
+        index._last_fingerprint = data["fingerprint"]
+        return index
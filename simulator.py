@@ -0,0 +1,229 @@
+import logging
+import os
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import anarchy
+from anarchy.character import (
+    apply_damage_to_condition_monitor,
+    handle_condition_overflow,
+    track_ammo,
+)
+from anarchy.dice import calculate_initiative, reroll_failures, resolve_opposed_test, roll_cue
+from eventlog import log_event
+from rng import RNGProvider, SeededRNG
+from validation import _check_list_of, _check_type, trusted
+
+logger = logging.getLogger(__name__)
+
+# ---------- Encounter Simulation ----------
+
+RUNNERS = "runners"
+OPPOSITION = "opposition"
+DRAW = "draw"
+
+_COMBATANT_DEFAULTS: Dict[str, Any] = {
+    "name": "",
+    "attribute": 3,
+    "skill": 2,
+    "initiative_bonus": 0,
+    "attack_pool": 6,
+    "defense_pool": 6,
+    "damage": 4,
+    "condition_monitor": 10,
+    "magazine_size": 0,
+    "shots": 1,
+    "edge": 0,
+}
+
+# Trial outcome: (winning side, rounds fought, ammo fired by the runners).
+TrialResult = Tuple[str, int, int]
+
+
+def _normalize_combatants(name: str, combatants: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Validates combatant dicts once and fills in defaults, so trials never re-check them.
+    """
+    _check_list_of(name, combatants, dict)
+    normalized = []
+    for combatant in combatants:
+        merged = {**_COMBATANT_DEFAULTS, **combatant}
+        merged.setdefault("ammo", merged["magazine_size"])
+        for key in list(_COMBATANT_DEFAULTS) + ["ammo"]:
+            if key != "name":
+                _check_type(f"{name}.{key}", merged[key], int)
+        normalized.append(merged)
+    return normalized
+
+
+def _run_trial(
+    runners: List[Dict[str, Any]],
+    opposition: List[Dict[str, Any]],
+    max_rounds: int,
+    rng: RNGProvider,
+) -> TrialResult:
+    """
+    Fights one encounter to resolution using the core mechanics.
+    Each round: roll initiative, then every standing combatant attacks a random standing
+    opponent in initiative order. Attacks are opposed tests; Edge (if any is left) rerolls
+    failures on an attack that scored no hits. Firearms reload instead of attacking when empty.
+    """
+    fighters = []
+    for side, roster in ((RUNNERS, runners), (OPPOSITION, opposition)):
+        for spec in roster:
+            fighters.append({
+                "spec": spec,
+                "side": side,
+                "monitor": spec["condition_monitor"],
+                "ammo": spec["ammo"],
+                "edge": spec["edge"],
+                "down": False,
+            })
+    runner_ammo_used = 0
+    for round_number in range(1, max_rounds + 1):
+        order = sorted(
+            fighters,
+            key=lambda f: calculate_initiative(
+                f["spec"]["attribute"], f["spec"]["skill"], f["spec"]["initiative_bonus"], rng
+            ),
+            reverse=True,
+        )
+        for actor in order:
+            if actor["down"]:
+                continue
+            targets = [f for f in fighters if f["side"] != actor["side"] and not f["down"]]
+            if not targets:
+                break
+            spec = actor["spec"]
+            magazine = spec["magazine_size"]
+            if magazine > 0:
+                if actor["ammo"] <= 0:
+                    actor["ammo"] = magazine
+                    continue
+                shots = min(spec["shots"], actor["ammo"])
+                actor["ammo"] = track_ammo(actor["ammo"], shots, magazine)["ammo_left"]
+                if actor["side"] == RUNNERS:
+                    runner_ammo_used += shots
+            target = rng.choice(targets)
+            attack_hits, attack_rolls = roll_cue(spec["attack_pool"], rng=rng)
+            if attack_hits == 0 and actor["edge"] > 0:
+                actor["edge"] -= 1
+                attack_hits, attack_rolls = reroll_failures(attack_rolls, rng=rng)
+            defense_hits, _ = roll_cue(target["spec"]["defense_pool"], rng=rng)
+            if resolve_opposed_test(attack_hits, defense_hits) != "attacker":
+                continue
+            damage = spec["damage"] + attack_hits - defense_hits
+            overflow = max(0, damage - target["monitor"])
+            target["monitor"] = apply_damage_to_condition_monitor(target["monitor"], damage)
+            if handle_condition_overflow(target["monitor"], overflow)["status"] != "ok":
+                target["down"] = True
+        standing = {f["side"] for f in fighters if not f["down"]}
+        if len(standing) < 2:
+            return (standing.pop() if standing else DRAW), round_number, runner_ammo_used
+    return DRAW, max_rounds, runner_ammo_used
+
+
+def _run_trials(
+    runners: List[Dict[str, Any]],
+    opposition: List[Dict[str, Any]],
+    max_rounds: int,
+    trial_seeds: List[int],
+) -> List[TrialResult]:
+    """
+    Worker entry point: runs one trial per seed, each with its own SeededRNG stream.
+    Seeding per trial (not per worker) keeps results identical however trials are chunked.
+    """
+    mechanics_logger = logging.getLogger(anarchy.__name__)
+    previous_level = mechanics_logger.level
+    mechanics_logger.setLevel(logging.WARNING)  # per-roll INFO logs would dominate the run time
+    try:
+        results = []
+        # Combatants were validated by simulate_encounter; skip re-checks inside the loop.
+        with trusted():
+            for trial_seed in trial_seeds:
+                results.append(_run_trial(runners, opposition, max_rounds, SeededRNG(trial_seed)))
+        return results
+    finally:
+        mechanics_logger.setLevel(previous_level)
+
+
+def _histogram(values: List[int]) -> Dict[int, int]:
+    """
+    Returns a count per distinct value, sorted by value.
+    """
+    return dict(sorted(Counter(values).items()))
+
+
+def simulate_encounter(
+    runners: List[Dict[str, Any]],
+    opposition: List[Dict[str, Any]],
+    trials: int = 1000,
+    seed: Optional[int] = None,
+    workers: Optional[int] = None,
+    max_rounds: int = 20,
+) -> Dict[str, Any]:
+    """
+    Simulates a fight many times to estimate how it is likely to go.
+    Use this when balancing an encounter before running it at the table.
+    Args:
+        runners: List of combatant dicts for the player side.
+        opposition: List of combatant dicts for the opposing side.
+        trials: Number of independent fights to simulate.
+        seed: Master seed; the same seed always gives the same result. None picks one at random.
+        workers: Number of worker processes (default: CPU count). 1 runs in-process.
+        max_rounds: Rounds after which an unresolved fight counts as a draw.
+    Returns:
+        Dict with keys 'trials', 'seed', 'win_rate' (per side and draw), 'mean_rounds',
+        'rounds' (histogram of rounds to resolution), and 'ammo_used'
+        (histogram of shots fired by the runners per fight).
+    Notes:
+        Combatant keys (all optional): name, attribute, skill, initiative_bonus, attack_pool,
+        defense_pool, damage, condition_monitor, magazine_size (0 for melee), ammo, shots, edge.
+        Every trial gets its own seed drawn from the master seed, so results do not depend on
+        the number of workers.
+    """
+    _check_type("trials", trials, int)
+    _check_type("max_rounds", max_rounds, int)
+    runners = _normalize_combatants("runners", runners)
+    opposition = _normalize_combatants("opposition", opposition)
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(64)
+    _check_type("seed", seed, int)
+    seed_stream = random.Random(seed)
+    trial_seeds = [seed_stream.getrandbits(64) for _ in range(max(0, trials))]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    _check_type("workers", workers, int)
+    workers = max(1, min(workers, len(trial_seeds) or 1))
+
+    if workers == 1:
+        results = _run_trials(runners, opposition, max_rounds, trial_seeds)
+    else:
+        chunk_size = -(-len(trial_seeds) // workers)
+        chunks = [trial_seeds[i:i + chunk_size] for i in range(0, len(trial_seeds), chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_run_trials, runners, opposition, max_rounds, chunk)
+                for chunk in chunks
+            ]
+            results = [result for future in futures for result in future.result()]
+
+    total = len(results)
+    winners = Counter(winner for winner, _, _ in results)
+    rounds = [r for _, r, _ in results]
+    summary = {
+        "trials": total,
+        "seed": seed,
+        "win_rate": {side: (winners[side] / total if total else 0.0) for side in (RUNNERS, OPPOSITION, DRAW)},
+        "mean_rounds": sum(rounds) / total if total else 0.0,
+        "rounds": _histogram(rounds),
+        "ammo_used": _histogram([ammo for _, _, ammo in results]),
+    }
+    log_event(
+        logger, logging.INFO, "simulation.completed",
+        "Simulated %(trials)s encounters (seed=%(seed)s, workers=%(workers)s): win_rate=%(win_rate)s",
+        trials=total, seed=seed, workers=workers, win_rate=summary["win_rate"],
+    )
+    return summary
@@ -0,0 +1,273 @@
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from validation import _check_type
+
+# ---------- Persistent Character/Campaign State ----------
+
+Path = Sequence[Any]
+
+
+class FrozenDict(Mapping):
+    """
+    Immutable mapping used as a node of persistent state.
+    Use set/set_in/update_in to get a new FrozenDict; the original is never changed.
+    Notes:
+        Updates copy only the nodes along the changed path (path copying); every untouched
+        branch is shared with the previous version, which is safe because no node can change.
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: Any = ()) -> None:
+        self._data = {key: freeze(value) for key, value in dict(data).items()}
+
+    @classmethod
+    def _wrap(cls, data: Dict[Any, Any]) -> "FrozenDict":
+        # Adopts an already-frozen dict without copying it again.
+        node = cls.__new__(cls)
+        node._data = data
+        return node
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"FrozenDict({self._data!r})"
+
+    def set(self, key: Any, value: Any) -> "FrozenDict":
+        """
+        Returns a copy of this node with key set to value (frozen).
+        """
+        data = dict(self._data)
+        data[key] = freeze(value)
+        return FrozenDict._wrap(data)
+
+    def delete(self, key: Any) -> "FrozenDict":
+        """
+        Returns a copy of this node without key (unchanged if key is missing).
+        """
+        if key not in self._data:
+            return self
+        data = dict(self._data)
+        del data[key]
+        return FrozenDict._wrap(data)
+
+    def get_in(self, path: Path, default: Any = None) -> Any:
+        """
+        Returns the value at a key path (e.g., ('karma_spent', 'skill')), or default.
+        """
+        node: Any = self
+        for key in path:
+            try:
+                node = node[key]
+            except (KeyError, IndexError, TypeError):
+                return default
+        return node
+
+    def set_in(self, path: Path, value: Any) -> "FrozenDict":
+        """
+        Returns a new version with the value at a key path replaced, creating missing mappings.
+        """
+        return self.update_in(path, lambda _: value)
+
+    def update_in(self, path: Path, fn: Callable[[Any], Any], default: Any = None) -> "FrozenDict":
+        """
+        Returns a new version with fn applied to the value at a key path.
+        Args:
+            path: Keys from this node down to the value; integer keys index into tuples.
+            fn: Called with the current value (or default when it is missing).
+            default: Value passed to fn when the path does not exist yet.
+        Returns:
+            The new root; only the nodes along path are copied.
+        Raises:
+            ValueError: If path is empty.
+            TypeError: If path runs through a value that is not a mapping or tuple.
+        """
+        if not path:
+            raise ValueError("path must contain at least one key")
+        return _update_node(self, tuple(path), fn, default)
+
+    def thaw(self) -> Dict[Any, Any]:
+        """
+        Returns a plain, fully independent dict/list copy (e.g., for saving).
+        """
+        return thaw(self)
+
+
+EMPTY = FrozenDict()
+
+
+def _assoc(node: Any, key: Any, value: Any) -> Any:
+    if isinstance(node, FrozenDict):
+        return node.set(key, value)
+    if isinstance(node, tuple):
+        return node[:key] + (freeze(value),) + node[key + 1:]
+    raise TypeError(f"Cannot update key {key!r} of {type(node).__name__}")
+
+
+def _update_node(node: Any, path: tuple, fn: Callable[[Any], Any], default: Any) -> Any:
+    key = path[0]
+    try:
+        current = node[key]
+    except (KeyError, IndexError):
+        current = default if len(path) == 1 else EMPTY
+    except TypeError:
+        raise TypeError(f"Cannot look up key {key!r} in {type(node).__name__}") from None
+    if len(path) == 1:
+        return _assoc(node, key, fn(current))
+    return _assoc(node, key, _update_node(current, path[1:], fn, default))
+
+
+def freeze(value: Any) -> Any:
+    """
+    Converts plain JSON-style data to immutable form: dicts to FrozenDict, lists to tuples.
+    Already-frozen mappings are returned as is, so re-freezing shared state costs nothing.
+    """
+    if isinstance(value, FrozenDict):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict._wrap({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """
+    Converts frozen data back to plain dicts and lists (fresh copies, safe to mutate).
+    """
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    if isinstance(value, frozenset):
+        return set(value)
+    return value
+
+
+class PersistentState:
+    """
+    An immutable version of a character (or campaign) plus a link to the version before it.
+    Use this instead of a plain dict when state is updated often or undo is needed:
+    character_spend_karma and apply_karma_advancement accept it and return the next version.
+    Args:
+        data: The initial character or campaign dictionary (frozen on construction).
+        max_history: Minimum number of earlier versions undo() can reach (0 keeps none);
+            older versions are dropped in batches once twice as many have built up.
+    Notes:
+        Each update costs O(changed path) and shares everything else with the previous
+        version, so keeping history is cheap. Use to_dict() to get a plain dict for saving.
+    """
+
+    __slots__ = ("data", "previous", "label", "max_history", "_depth")
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None, max_history: int = 100) -> None:
+        _check_type("max_history", max_history, int)
+        self.data: FrozenDict = freeze(data if data is not None else {})
+        _check_type("data", self.data, FrozenDict)
+        self.previous: Optional["PersistentState"] = None
+        self.label = ""
+        self.max_history = max_history
+        self._depth = 0
+
+    def __getitem__(self, key: str) -> Any:
+        return self.data[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.data
+
+    def __repr__(self) -> str:
+        return f"PersistentState({self.data!r}, version={self._depth})"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.data.get(key, default)
+
+    def get_in(self, path: Path, default: Any = None) -> Any:
+        """
+        Returns the value at a key path, or default (see FrozenDict.get_in).
+        """
+        return self.data.get_in(path, default)
+
+    def commit(self, data: FrozenDict, label: str = "") -> "PersistentState":
+        """
+        Returns the next version holding data, with this version as its undo target.
+        Args:
+            data: The new root, usually built from self.data with set_in/update_in.
+            label: Optional description of the change (shown by history()).
+        """
+        _check_type("data", data, FrozenDict)
+        state = PersistentState.__new__(PersistentState)
+        state.data = data
+        state.label = label
+        state.max_history = self.max_history
+        if self.max_history <= 0:
+            state.previous, state._depth = None, 0
+        else:
+            state.previous, state._depth = self, self._depth + 1
+            # Trim in batches so the amortized cost per update stays O(1).
+            if state._depth >= 2 * self.max_history:
+                state._trim(self.max_history)
+        return state
+
+    def _trim(self, keep: int) -> None:
+        chain: List[PersistentState] = []
+        state: Optional[PersistentState] = self.previous
+        while state is not None and len(chain) < keep:
+            chain.append(state)
+            state = state.previous
+        copies = [PersistentState.__new__(PersistentState) for _ in chain]
+        for depth, (original, copy) in enumerate(zip(reversed(chain), reversed(copies))):
+            copy.data, copy.label, copy.max_history, copy._depth = original.data, original.label, original.max_history, depth
+        for copy, older in zip(copies, copies[1:] + [None]):
+            copy.previous = older
+        self.previous = copies[0] if copies else None
+        self._depth = len(copies)
+
+    def set_in(self, path: Path, value: Any, label: str = "") -> "PersistentState":
+        """
+        Returns the next version with the value at a key path replaced.
+        """
+        return self.commit(self.data.set_in(path, value), label)
+
+    def update_in(self, path: Path, fn: Callable[[Any], Any], default: Any = None, label: str = "") -> "PersistentState":
+        """
+        Returns the next version with fn applied to the value at a key path.
+        """
+        return self.commit(self.data.update_in(path, fn, default), label)
+
+    def undo(self) -> "PersistentState":
+        """
+        Returns the version before this one.
+        Raises:
+            ValueError: If there is no earlier version in the history.
+        """
+        if self.previous is None:
+            raise ValueError("No earlier version to undo to")
+        return self.previous
+
+    def history(self) -> List["PersistentState"]:
+        """
+        Returns the reachable versions, oldest first, ending with this one.
+        """
+        versions = []
+        state: Optional[PersistentState] = self
+        while state is not None:
+            versions.append(state)
+            state = state.previous
+        versions.reverse()
+        return versions
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns the current version as a plain, independent dict (e.g., for save_character).
+        """
+        return thaw(self.data)
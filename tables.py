@@ -0,0 +1,189 @@
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from anarchy.dice import _resolve_rng
+from rng import AliasSampler, RNGProvider
+from validation import _check_type
+
+# ---------- Compiled Random Tables ----------
+
+_DICE_PATTERN = re.compile(r"^(\d*)d(\d+)$")
+# Guards against tables that (directly or indirectly) reference themselves.
+_MAX_NESTING = 16
+
+
+def dice_outcome_counts(dice: str) -> Dict[int, int]:
+    """
+    Returns how many ways each result of a dice expression can come up.
+    Args:
+        dice: 'NdS' (e.g., '2d6', 'd6') for summed dice, or 'd66' for the
+            tens/units roll that gives 11-16, 21-26, ... 61-66.
+    Returns:
+        Dict mapping each possible result to its number of outcomes.
+    Raises:
+        ValueError: If the expression is not recognized.
+    """
+    _check_type("dice", dice, str)
+    spec = dice.strip().lower()
+    if spec == "d66":
+        return {tens * 10 + units: 1 for tens in range(1, 7) for units in range(1, 7)}
+    match = _DICE_PATTERN.match(spec)
+    if match is None or int(match.group(2)) < 2 or (match.group(1) and int(match.group(1)) < 1):
+        raise ValueError(f"Unsupported dice expression '{dice}' (use 'NdS' or 'd66')")
+    count, sides = int(match.group(1) or 1), int(match.group(2))
+    counts = {0: 1}
+    for _ in range(count):
+        rolled: Dict[int, int] = {}
+        for total, ways in counts.items():
+            for face in range(1, sides + 1):
+                rolled[total + face] = rolled.get(total + face, 0) + ways
+        counts = rolled
+    return counts
+
+
+class RandomTable:
+    """
+    A random table compiled once into an alias structure, so every draw is O(1).
+    Use this for weighted encounter, loot, and oracle tables instead of expanded lists.
+    Args:
+        results: The table's results. A result may itself be a RandomTable (rolled in turn)
+            or a {'table': name} reference resolved through tables when rolled.
+        weights: Optional relative weights, one per result (default: all equal).
+        name: Optional table name, used in error messages and references.
+        tables: Optional registry of named tables for {'table': name} references.
+    Raises:
+        ValueError: If weights and results differ in length, or weights are invalid.
+    Notes:
+        Build tables from data with compile_table, which also handles dice-range tables.
+    """
+
+    def __init__(
+        self,
+        results: Sequence[Any],
+        weights: Optional[Sequence[float]] = None,
+        name: str = "",
+        tables: Optional[Dict[str, "RandomTable"]] = None,
+    ) -> None:
+        self.results = list(results)
+        if weights is None:
+            weights = [1] * len(self.results)
+        if len(weights) != len(self.results):
+            raise ValueError(f"Table '{name}' has {len(self.results)} results but {len(weights)} weights")
+        self.weights = list(weights)
+        self.name = name
+        self.tables = tables if tables is not None else {}
+        self._sampler = AliasSampler(self.weights) if self.results else None
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def probabilities(self) -> List[Tuple[Any, float]]:
+        """
+        Returns (result, probability) pairs for the table's direct results.
+        """
+        total = float(sum(self.weights))
+        return [(result, weight / total) for result, weight in zip(self.results, self.weights)]
+
+    def _resolve(self, result: Any, rng: RNGProvider, depth: int) -> Any:
+        """
+        Rolls nested tables and table references until a plain result is reached.
+        """
+        if isinstance(result, dict) and set(result) == {"table"}:
+            reference = result["table"]
+            if reference not in self.tables:
+                raise KeyError(f"Table '{self.name}' references unknown table '{reference}'")
+            result = self.tables[reference]
+        if isinstance(result, RandomTable):
+            if depth >= _MAX_NESTING:
+                raise RecursionError(f"Table '{self.name}' nests deeper than {_MAX_NESTING} levels")
+            return result._roll(rng, depth + 1)
+        return result
+
+    def _roll(self, rng: RNGProvider, depth: int) -> Any:
+        if self._sampler is None:
+            return None
+        return self._resolve(self.results[self._sampler.draw(rng)], rng, depth)
+
+    def roll(self, rng: Optional[RNGProvider] = None) -> Any:
+        """
+        Draws one result, rolling any nested sub-tables. Returns None for an empty table.
+        """
+        return self._roll(_resolve_rng(rng), 0)
+
+    def roll_many(self, count: int, rng: Optional[RNGProvider] = None) -> List[Any]:
+        """
+        Draws count independent results in one call, rolling any nested sub-tables.
+        """
+        _check_type("count", count, int)
+        rng = _resolve_rng(rng)
+        if self._sampler is None:
+            return [None] * max(0, count)
+        return [self._resolve(self.results[i], rng, 0) for i in self._sampler.draw_many(count, rng)]
+
+
+def compile_table(
+    spec: Any, tables: Optional[Dict[str, RandomTable]] = None, name: str = ""
+) -> RandomTable:
+    """
+    Compiles a data-driven table definition into a RandomTable.
+    Use this when loading tables from campaign JSON, once per table.
+    Args:
+        spec: Either a plain list (uniform table), or a dict with 'entries' and optional
+            'name' and 'dice'. Each entry is a plain value (weight 1), or a dict with
+            'result' plus 'weight' or 'range' ([low, high] dice results, inclusive);
+            'result' may be a nested spec (a dict with 'entries') or a {'table': name} reference.
+        tables: Optional registry of named tables; a spec with a 'name' is added to it
+            under that name, and references are resolved through it at roll time.
+        name: Name to use when spec does not carry one.
+    Returns:
+        The compiled RandomTable.
+    Raises:
+        ValueError: If a range table has no 'dice', ranges overlap, or a weight is invalid.
+    Notes:
+        Range entries are weighted by how many dice outcomes fall in the range, so a
+        '2d6' entry with range [6, 8] is 16/36 likely. Uncovered results are re-rolled,
+        which is the same as leaving them out of the weights.
+    """
+    registry = tables if tables is not None else {}
+    if isinstance(spec, list):
+        spec = {"entries": spec}
+    _check_type("spec", spec, dict)
+    name = spec.get("name", name)
+    entries = spec.get("entries", [])
+    _check_type("entries", entries, list)
+    dice = spec.get("dice")
+    outcome_counts = dice_outcome_counts(dice) if dice is not None else None
+    claimed: Dict[int, int] = {}
+
+    results: List[Any] = []
+    weights: List[float] = []
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict) or ("result" not in entry and set(entry) != {"table"}):
+            results.append(entry)
+            weights.append(1)
+            continue
+        result = entry.get("result", entry)
+        if isinstance(result, dict) and "entries" in result:
+            result = compile_table(result, registry, f"{name}[{index}]")
+        if "range" in entry:
+            if outcome_counts is None:
+                raise ValueError(f"Table '{name}' has range entries but no 'dice'")
+            low, high = entry["range"] if isinstance(entry["range"], list) else (entry["range"], entry["range"])
+            weight = 0
+            for outcome, ways in outcome_counts.items():
+                if low <= outcome <= high:
+                    if outcome in claimed:
+                        raise ValueError(f"Table '{name}' ranges overlap at {outcome} (entries {claimed[outcome]} and {index})")
+                    claimed[outcome] = index
+                    weight += ways
+        else:
+            weight = entry.get("weight", 1)
+        if not isinstance(weight, (int, float)) or weight < 0:
+            raise ValueError(f"Table '{name}' entry {index} has invalid weight {weight!r}")
+        results.append(result)
+        weights.append(weight)
+
+    table = RandomTable(results, weights, name=name, tables=registry)
+    if "name" in spec:
+        registry[name] = table
+    return table
@@ -0,0 +1,301 @@
+import functools
+import inspect
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from itertools import repeat
+from typing import Any, Callable, Iterable, Iterator, List, Tuple, Type
+
+from eventlog import log_event
+
+logger = logging.getLogger(__name__)
+
+# ---------- Validation Fast Path ----------
+#
+# Argument checks that cost O(1) when they can. CheckedList values are trusted without a
+# scan because they check each element as it is added, and trusted() turns list scans and
+# @validates checks off entirely for internal loops whose inputs were already checked.
+# Plain lists are still scanned. set_debug(True) restores the strict element-by-element
+# checks everywhere.
+
+_debug = False
+_trusted_global = False
+_trusted_scope: ContextVar[bool] = ContextVar("validation_trusted", default=False)
+
+
+def set_debug(enabled: bool) -> None:
+    """
+    Turns strict mode on or off. In strict mode every check runs in full, ignoring
+    trusted mode and CheckedList markers; use it while debugging bad data.
+    """
+    global _debug
+    _debug = bool(enabled)
+
+
+def is_debug() -> bool:
+    return _debug
+
+
+def set_trusted(enabled: bool) -> None:
+    """
+    Turns trusted mode on or off for the whole process (see trusted()).
+    """
+    global _trusted_global
+    _trusted_global = bool(enabled)
+
+
+def is_trusted() -> bool:
+    """
+    Returns True when checks may be skipped: trusted mode is on and strict mode is off.
+    """
+    return not _debug and (_trusted_global or _trusted_scope.get())
+
+
+@contextmanager
+def trusted() -> Iterator[None]:
+    """
+    Skips list scans and @validates checks inside the block (this thread/task only).
+    Use this around internal batch loops whose inputs were validated on the way in.
+    Notes:
+        Single-value isinstance checks still run; they cost no more than the skip test.
+    """
+    token = _trusted_scope.set(True)
+    try:
+        yield
+    finally:
+        _trusted_scope.reset(token)
+
+
+def list_is_valid(value: List[Any], element_type: type) -> bool:
+    """
+    O(1) check whether a list can skip its element-by-element scan.
+    Returns:
+        True in trusted mode, or for a CheckedList of a matching type. False means
+        "not proven": run the scan (always False in strict mode).
+    """
+    if _debug:
+        return False
+    if _trusted_global or _trusted_scope.get():
+        return True
+    return type(value) is CheckedList and issubclass(value.element_type, element_type)
+
+
+class CheckedList(list):
+    """
+    A list that checks each element's type as it is added, so it never needs a full scan.
+    Use this (via checked_list) for long-lived lists passed to many calls, such as a
+    campaign's NPCs or briefs.
+    Args:
+        element_type: The type every element must have.
+        items: Initial elements (checked once here).
+    Raises:
+        TypeError: If an element (initial or added later) has the wrong type.
+    Notes:
+        Only mutations through the list's own methods are seen; slicing or adding two lists
+        returns a plain list.
+    """
+
+    __slots__ = ("element_type",)
+
+    def __init__(self, element_type: type, items: Iterable[Any] = ()) -> None:
+        self.element_type = element_type
+        items = list(items)
+        self._check(items)
+        super().__init__(items)
+
+    def _check(self, items: List[Any]) -> None:
+        for idx, item in enumerate(items):
+            if not isinstance(item, self.element_type):
+                raise _type_error(
+                    "checked list", f"Item {idx}", self.element_type.__name__, type(item).__name__
+                )
+
+    def append(self, item: Any) -> None:
+        self._check([item])
+        super().append(item)
+
+    def insert(self, index: int, item: Any) -> None:
+        self._check([item])
+        super().insert(index, item)
+
+    def extend(self, items: Iterable[Any]) -> None:
+        items = list(items)
+        self._check(items)
+        super().extend(items)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Default list pickling appends items before restoring element_type.
+        return (CheckedList, (self.element_type, list(self)))
+
+    def __iadd__(self, items: Iterable[Any]) -> "CheckedList":
+        self.extend(items)
+        return self
+
+    def __setitem__(self, index: Any, item: Any) -> None:
+        if isinstance(index, slice):
+            item = list(item)
+            self._check(item)
+        else:
+            self._check([item])
+        super().__setitem__(index, item)
+
+
+def checked_list(items: Iterable[Any], element_type: type) -> CheckedList:
+    """
+    Wraps items in a CheckedList after validating them once.
+    """
+    return CheckedList(element_type, items)
+
+
+# ---------- Compiled Argument Schemas ----------
+
+
+class ListOf:
+    """
+    Schema spec for a list whose elements are all of element_type.
+    """
+
+    __slots__ = ("element_type",)
+
+    def __init__(self, element_type: type) -> None:
+        self.element_type = element_type
+
+
+def _type_name(expected: Any) -> str:
+    if isinstance(expected, tuple):
+        return " or ".join("None" if t is type(None) else t.__name__ for t in expected)
+    return expected.__name__
+
+
+def _type_error(name: str, item: str, expected: str, actual: str) -> TypeError:
+    if item:
+        message = f"{item} in '{name}' must be {expected}, got {actual}"
+    else:
+        message = f"'{name}' must be {expected}, got {actual}"
+    log_event(logger, logging.ERROR, "validation.type_error", "Type error: %(error)s", error=message, name=name)
+    return TypeError(message)
+
+
+@functools.lru_cache(maxsize=None)
+def compile_check(spec: Any) -> Callable[[str, Any], None]:
+    """
+    Compiles a schema spec into a checker called as check(name, value).
+    Args:
+        spec: A type, a tuple of types (None allowed for optional values), or ListOf(type).
+    Returns:
+        A function raising TypeError if value does not match. Compiled once per spec.
+    """
+    if isinstance(spec, ListOf):
+        element_type = spec.element_type
+        expected = element_type.__name__
+
+        def check_list(name: str, value: Any) -> None:
+            if list_is_valid(value, element_type) or all(map(isinstance, value, repeat(element_type))):
+                return
+            for idx, item in enumerate(value):
+                if not isinstance(item, element_type):
+                    raise _type_error(name, f"Item {idx}", expected, type(item).__name__)
+
+        return check_list
+    if isinstance(spec, tuple):
+        spec = tuple(type(None) if t is None else t for t in spec)
+    expected = _type_name(spec)
+
+    def check_value(name: str, value: Any) -> None:
+        if not isinstance(value, spec):
+            raise _type_error(name, "", expected, type(value).__name__)
+
+    return check_value
+
+
+def validates(**spec: Any) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Decorator that checks a function's arguments against a schema compiled once.
+    Use this instead of a run of _check_type/_check_list_of calls at the top of a function.
+    Args:
+        spec: Parameter name -> type, tuple of types, or ListOf(type).
+    Raises:
+        ValueError: At decoration time, if spec names a parameter the function lacks.
+    Notes:
+        The parameter positions and checkers are resolved when the function is decorated,
+        so each call only looks up its arguments. Checks are skipped in trusted mode and
+        parameters left at their default are not checked.
+    """
+
+    def decorate(fn: Callable[..., Any]) -> Callable[..., Any]:
+        parameters = list(inspect.signature(fn).parameters)
+        unknown = set(spec) - set(parameters)
+        if unknown:
+            raise ValueError(f"validates() got unknown parameters for {fn.__name__}: {sorted(unknown)}")
+        plan: List[Tuple[int, str, Callable[[str, Any], None]]] = [
+            (parameters.index(name), name, compile_check(s))
+            for name, s in spec.items()
+        ]
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not (_trusted_global or _trusted_scope.get()) or _debug:
+                for position, name, check in plan:
+                    if position < len(args):
+                        check(name, args[position])
+                    elif name in kwargs:
+                        check(name, kwargs[name])
+            return fn(*args, **kwargs)
+
+        wrapper.__validation_schema__ = dict(spec)  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorate
+
+
+# ---------- Type Validation Helpers ----------
+
+def _check_type(name: str, value: Any, expected: Type[Any]) -> None:
+    """
+    Validates that a value is of the expected type.
+    Use this in all functions to ensure arguments are correct before processing.
+    Args:
+        name: The name of the variable (for error messages).
+        value: The value to check.
+        expected: The expected type (e.g., int, dict).
+    Raises:
+        TypeError: If value is not of the expected type.
+    Notes:
+        Helps catch errors early and provides clear logging for debugging.
+    """
+    if not isinstance(value, expected):
+        log_event(
+            logger, logging.ERROR, "validation.type_error",
+            "Type error: '%(name)s' must be %(expected)s, got %(actual)s",
+            name=name, expected=expected.__name__, actual=type(value).__name__,
+        )
+        raise TypeError(f"'{name}' must be {expected.__name__}, got {type(value).__name__}")
+
+
+def _check_list_of(name: str, value: List[Any], element_type: Type[Any]) -> None:
+    """
+    Validates that a value is a list and all elements are of the specified type.
+    Use this to check lists of items (e.g., NPCs, briefs, strings).
+    Args:
+        name: The name of the variable (for error messages).
+        value: The list to check.
+        element_type: The expected type of each element in the list.
+    Raises:
+        TypeError: If any element is not of the expected type.
+    Notes:
+        Ensures data consistency for list-based arguments.
+        The scan is skipped inside validation.trusted() blocks and for validation.CheckedList
+        values, except in strict mode (validation.set_debug).
+    """
+    if list_is_valid(value, element_type) or all(map(isinstance, value, repeat(element_type))):
+        return
+    for idx, item in enumerate(value):
+        if not isinstance(item, element_type):
+            log_event(
+                logger, logging.ERROR, "validation.type_error",
+                "Type error: Item %(index)s in '%(name)s' must be %(expected)s, got %(actual)s",
+                name=name, index=idx, expected=element_type.__name__, actual=type(item).__name__,
+            )
+            raise TypeError(
+                f"Item {idx} in '{name}' must be {element_type.__name__}, got {type(item).__name__}"
+            )